@@ -0,0 +1,15 @@
+'''Headless benchmarks of better_pygame and the game scenes
+
+Run from the repository root:
+    python -m benchmarks                      # run everything, compare against benchmarks/baseline.json
+    python -m benchmarks --only transitions   # run the benchmarks whose name starts with "transitions"
+    python -m benchmarks --save-baseline      # store the results as the new baseline
+
+Results are printed as JSON (or written to --output), the exit code is 1 if a timing regressed by more than --threshold.
+'''
+import os
+
+#pygame has to see the dummy drivers before it is imported
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
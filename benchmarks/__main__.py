@@ -0,0 +1,66 @@
+import argparse
+import json
+import os
+import sys
+
+#scenes.py and the assets are found relative to the repository root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from . import bench_transitions, bench_animations, bench_scenes, bench_systems
+from .harness import BENCHMARKS, compare, get_environment, get_screen
+
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Headless benchmarks of better_pygame")
+    parser.add_argument("--only", action="append", default=[], help="Run the benchmarks whose name starts with this prefix, can be repeated")
+    parser.add_argument("--list", action="store_true", help="List the benchmarks and exit")
+    parser.add_argument("--output", help="Write the results to this JSON file instead of stdout")
+    parser.add_argument("--baseline", default=BASELINE, help="Baseline JSON file the results are compared against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results in the baseline file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown against the baseline, as a fraction")
+    args = parser.parse_args()
+
+    names = [name for name in BENCHMARKS if not args.only or any(name.startswith(prefix) for prefix in args.only)]
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    get_screen()
+    results = {}
+    for name in names:
+        print(f"running {name}", file=sys.stderr)
+        results[name] = BENCHMARKS[name]()
+
+    report = {"environment": get_environment(), "results": results}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, "r") as file:
+            baseline = json.load(file)["results"]
+        report["threshold"] = args.threshold
+        report["regressions"] = compare(results, baseline, args.threshold)
+
+    if args.save_baseline:
+        baseline = {"environment": report["environment"], "results": results}
+        if os.path.exists(args.baseline) and args.only:
+            #Keep the stored results of the benchmarks that were not run
+            with open(args.baseline, "r") as file:
+                baseline["results"] = {**json.load(file)["results"], **results}
+        with open(args.baseline, "w") as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output)
+    else:
+        print(output)
+
+    for regression in report.get("regressions", []):
+        print(f"REGRESSION {regression['benchmark']} {regression['metric']}: {regression['baseline']:.3f} -> {regression['value']:.3f} ms", file=sys.stderr)
+    return 1 if report.get("regressions") else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+import numpy as np
+import pygame
+
+from better_pygame import Animation, AnimationSystem, RenderBatch
+
+from .harness import benchmark, get_screen, measure_frames, measure_allocations
+
+COUNT = 5000
+FRAMES = 120
+
+def create_animations(frames:list[pygame.Surface]) -> list[Animation]:
+    rng = np.random.default_rng(0)
+    return [Animation(frames, float(rng.uniform(5, 30)), loop_count=-1) for _ in range(COUNT)]
+
+def get_frames() -> list[pygame.Surface]:
+    frames = []
+    for index in range(8):
+        frame = pygame.Surface((16, 16), pygame.SRCALPHA)
+        frame.fill((30 * index, 120, 200, 200))
+        frames.append(frame.convert_alpha())
+    return frames
+
+@benchmark(f"animations.update.{COUNT}")
+def animation_update() -> dict[str, float]:
+    get_screen()
+    animations = create_animations(get_frames())
+    def update(dt:float):
+        for animation in animations:
+            animation.update(dt)
+    result = measure_frames(update, None, FRAMES)
+    result.update(measure_allocations(lambda: update(1 / 60), 20))
+    pygame.event.clear()
+    return result
+
+@benchmark(f"animations.system_update.{COUNT}")
+def animation_system_update() -> dict[str, float]:
+    get_screen()
+    system = AnimationSystem(COUNT)
+    for animation in create_animations(get_frames()):
+        system.register(animation)
+    result = measure_frames(system.update, None, FRAMES)
+    result.update(measure_allocations(lambda: system.update(1 / 60), 20))
+    pygame.event.clear()
+    return result
+
+@benchmark(f"animations.draw.{COUNT}")
+def animation_draw() -> dict[str, float]:
+    screen = get_screen()
+    animations = create_animations(get_frames())
+    positions = np.random.default_rng(1).uniform((-100, -100), (1380, 820), (COUNT, 2)).astype(np.int64)
+    position_list = positions.tolist()
+    def draw():
+        for animation, position in zip(animations, position_list):
+            screen.blit(animation.get_frame(), position)
+    result = measure_frames(None, draw, FRAMES)
+    return result
+
+@benchmark(f"animations.render_batch.{COUNT}")
+def animation_render_batch() -> dict[str, float]:
+    screen = get_screen()
+    animations = create_animations(get_frames())
+    positions = np.random.default_rng(1).uniform((-100, -100), (1380, 820), (COUNT, 2)).astype(np.int64)
+    batch = RenderBatch(screen.get_rect())
+    def draw():
+        batch.submit_animations(animations, positions)
+        batch.flush(screen)
+    result = measure_frames(None, draw, FRAMES)
+    result.update(measure_allocations(draw, 20))
+    return result
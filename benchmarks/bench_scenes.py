@@ -0,0 +1,72 @@
+from functools import partial
+
+import pygame
+
+from better_pygame import SceneManager
+
+from .harness import benchmark, get_screen, measure_frames, measure_allocations, time_call
+
+SCREEN_SIZE = (1280, 720)
+
+def create_scene_manager() -> SceneManager:
+    #scenes.py loads its assets relative to the repository root, __main__ changes into it
+    from scenes import StartMenu, Settings
+    return SceneManager(SCREEN_SIZE, 
+                        {
+                            "start": partial(StartMenu, SCREEN_SIZE),
+                            "settings": partial(Settings, SCREEN_SIZE)
+                        },
+                        "start",
+                        dirty_rects=True)
+
+def frame_runner(scene_manager:SceneManager, screen:pygame.Surface):
+    def update(dt:float):
+        for event in pygame.event.get():
+            scene_manager.handle_event(event)
+        scene_manager.update(dt)
+    def draw():
+        pygame.display.update(scene_manager.draw(screen))
+    return update, draw
+
+@benchmark("scenes.idle_menu")
+def idle_menu() -> dict[str, float]:
+    screen = get_screen(SCREEN_SIZE)
+    scene_manager = create_scene_manager()
+    update, draw = frame_runner(scene_manager, screen)
+    measure_frames(update, draw, 10)
+    result = measure_frames(update, draw, 120)
+    def step():
+        update(1 / 60)
+        draw()
+    result.update(measure_allocations(step, 30))
+    return result
+
+@benchmark("scenes.switch")
+def scene_switch() -> dict[str, float]:
+    '''StartMenu to Settings and back, each switch runs until its transitions end'''
+    screen = get_screen(SCREEN_SIZE)
+    scene_manager = create_scene_manager()
+    update, draw = frame_runner(scene_manager, screen)
+    measure_frames(update, draw, 5)
+    results = []
+    for scene_key in ("settings", "start"):
+        scene_manager.change_scene(scene_key)
+        #Measured in chunks until the transitions end, the slowest chunk is reported
+        frames = 0
+        while scene_manager._transitioning and frames < 600:
+            results.append(measure_frames(update, draw, 30))
+            frames += 30
+    #pool_allocations counts every Surface the pool created, including the cold first switch
+    return {
+        "update_ms": max(result["update_ms"] for result in results),
+        "draw_ms": max(result["draw_ms"] for result in results),
+        "draw_p95_ms": max(result["draw_p95_ms"] for result in results),
+        "pool_allocations": scene_manager.surface_pool.allocations
+    }
+
+@benchmark("scenes.first_load")
+def first_load() -> dict[str, float]:
+    '''Building the default scene, with the images already in the asset cache after the first run'''
+    get_screen(SCREEN_SIZE)
+    create_scene_manager()
+    return {"build_ms": time_call(create_scene_manager, repeat=5)}
@@ -0,0 +1,86 @@
+import shutil
+import tempfile
+
+import numpy as np
+import pygame
+
+from better_pygame import SurfacePool, AssetCache, DiskSurfaceCache, SpatialHash, CircleCollider, EntityStore, Effect, Emitter
+
+from .harness import benchmark, get_screen, measure_frames, time_call
+
+@benchmark("systems.surface_pool")
+def surface_pool() -> dict[str, float]:
+    '''Borrowing and giving back a full screen render target, against creating one every frame'''
+    pool = SurfacePool()
+    def pooled():
+        pool.give_back(pool.borrow((1280, 720)))
+    return {
+        "borrow_ms": time_call(pooled, number=200),
+        "new_surface_ms": time_call(lambda: pygame.Surface((1280, 720), pygame.SRCALPHA), number=200)
+    }
+
+@benchmark("systems.disk_cache")
+def disk_cache() -> dict[str, float]:
+    '''Loading the menu backgrounds scaled to the screen, cold (decode and scale) and from the disk cache'''
+    get_screen()
+    directory = tempfile.mkdtemp()
+    paths = ["assets/start_menu_background.png", "assets/settings_background.png"]
+    def load():
+        cache = AssetCache(disk_cache=DiskSurfaceCache(directory))
+        for path in paths:
+            cache.get_image(path, (1280, 720))
+    def cold():
+        shutil.rmtree(directory, ignore_errors=True)
+        load()
+    try:
+        result = {"cold_ms": time_call(cold, repeat=3)}
+        load()
+        result["warm_ms"] = time_call(load, repeat=5)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return result
+
+@benchmark("systems.collider.10000")
+def collider() -> dict[str, float]:
+    '''10k moving circles, moved and paired every frame'''
+    rng = np.random.default_rng(0)
+    world = SpatialHash(16, 16384)
+    for position in rng.uniform((0, 0), (1920, 1080), (10000, 2)).tolist():
+        world.add(CircleCollider(position, 4))
+    indices = np.arange(10000)
+    positions = world.positions[:10000].copy()
+    velocities = rng.normal(0, 100, (10000, 2))
+    def update(dt:float):
+        positions[:] += velocities * dt
+        world.set_positions(indices, positions)
+        world.collide_pairs()
+    return measure_frames(update, None, 60)
+
+@benchmark("systems.entity_store")
+def entity_store() -> dict[str, float]:
+    '''Spawning 50 bullets a frame with a 3 second lifetime (about 9k alive), moved, expired and drawn'''
+    screen = get_screen()
+    rng = np.random.default_rng(0)
+    store = EntityStore(16384, bounds=screen.get_rect())
+    sprites = [pygame.Surface((6, 6)).convert()]
+    spawn_positions = rng.uniform((0, 0), (1280, 720), (50, 2))
+    spawn_velocities = rng.normal(0, 60, (50, 2))
+    def update(dt:float):
+        store.spawn_many(spawn_positions, spawn_velocities, 3.0)
+        store.update(dt)
+    measure_frames(update, None, 180)
+    return measure_frames(update, lambda: store.draw(screen, sprites), 60)
+
+@benchmark("systems.effect.20000")
+def effect() -> dict[str, float]:
+    '''An explosion holding about 20k live particles, with gravity and drag'''
+    screen = get_screen()
+    emitter = Emitter(rate=25000, duration=float("inf"), lifetime=(0.6, 1.0), speed=(20, 200), radius=30, start_size=5, end_size=1,
+                      start_color=(255, 200, 80, 255), end_color=(120, 20, 0, 0), gravity=(0, 60), drag=0.5)
+    explosion = Effect([emitter], (640, 360), seed=0)
+    explosion.start()
+    for _ in range(60):
+        explosion.update(1 / 60)
+    result = measure_frames(explosion.update, lambda: explosion.draw(screen), 120)
+    result["particles"] = len(explosion)
+    return result
@@ -0,0 +1,68 @@
+import pygame
+
+from better_pygame import Scene, SurfacePool
+from better_pygame import transition
+
+from .harness import benchmark, get_screen, measure_frames, measure_allocations
+
+SCREEN_SIZE = (1280, 720)
+FRAMES = 120
+
+class StaticScene(Scene):
+    '''Scene drawing a full screen image, like the menu backgrounds'''
+    def __init__(self, screen_size:tuple[int, int]) -> None:
+        self.image = pygame.Surface(screen_size).convert()
+        for x in range(0, screen_size[0], 40):
+            pygame.draw.rect(self.image, (x % 255, 120, 255 - x % 255), (x, 0, 20, screen_size[1]))
+    
+    def handle_event(self, event:pygame.Event):...
+    
+    def update(self, dt:float):...
+    
+    def draw(self, screen:pygame.Surface):
+        screen.blit(self.image, (0, 0))
+
+TRANSITIONS = {
+    "LinearSlideEnter": lambda: transition.LinearSlideEnter(FRAMES / 60, "left", SCREEN_SIZE),
+    "LinearSlideExit": lambda: transition.LinearSlideExit(FRAMES / 60, "up", SCREEN_SIZE),
+    "LinearFadeIn": lambda: transition.LinearFadeIn(FRAMES / 60),
+    "LinearFadeOut": lambda: transition.LinearFadeOut(FRAMES / 60),
+    "SpinEnter": lambda: transition.SpinEnter(FRAMES / 60, "down", SCREEN_SIZE),
+    "SpinExit": lambda: transition.SpinExit(FRAMES / 60, "left", SCREEN_SIZE),
+    "SpinShrinkExit": lambda: transition.SpinShrinkExit(FRAMES / 60, SCREEN_SIZE),
+}
+
+def run_transition(create, require_update:bool) -> dict[str, float]:
+    screen = get_screen(SCREEN_SIZE)
+    scene = StaticScene(SCREEN_SIZE)
+    scene.set_transition_require_update(require_update)
+    pool = SurfacePool()
+    
+    def start():
+        transition_ = create()
+        transition_.start(scene, SCREEN_SIZE, pool)
+        return transition_
+    
+    def draw():
+        screen.fill((0, 0, 0))
+        running.draw(screen)
+    
+    running = start()
+    result = measure_frames(running.update, draw, FRAMES - 1)
+    #Finish the first run, so its snapshot goes back to the pool like at the end of a real transition
+    running.update(running.duration)
+    allocations_before = pool.allocations
+    running = start()
+    
+    def step():
+        running.update(1 / 60)
+        draw()
+    result.update(measure_allocations(step, FRAMES - 1))
+    #Pooled Surfaces allocated by a second run after the first has ended, 0 once the pool is warm
+    result["pool_allocations"] = pool.allocations - allocations_before
+    pygame.event.clear()
+    return result
+
+for _name, _create in TRANSITIONS.items():
+    benchmark(f"transitions.{_name}")(lambda create=_create: run_transition(create, False))
+    benchmark(f"transitions.{_name}.live_scene")(lambda create=_create: run_transition(create, True))
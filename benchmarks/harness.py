@@ -0,0 +1,102 @@
+import gc
+import platform
+import statistics
+import time
+import tracemalloc
+from typing import Callable
+
+import numpy as np
+import pygame
+
+BENCHMARKS:dict[str, Callable[[], dict[str, float]]] = {}
+
+def benchmark(name:str):
+    '''Register a benchmark function returning a dict of metrics, metrics ending in "_ms" are checked for regressions'''
+    def register(function:Callable[[], dict[str, float]]):
+        if name in BENCHMARKS:
+            raise KeyError(f"Benchmark {name} already exists")
+        BENCHMARKS[name] = function
+        return function
+    return register
+
+def get_screen(size:tuple[int, int] = (1280, 720)) -> pygame.Surface:
+    '''Return the dummy display Surface, set to size'''
+    if not pygame.get_init():
+        pygame.init()
+    screen = pygame.display.get_surface()
+    if screen is None or screen.get_size() != size:
+        screen = pygame.display.set_mode(size)
+    return screen
+
+def time_call(function:Callable[[], object], repeat:int = 5, number:int = 1) -> float:
+    '''Return the median milliseconds of number calls of function, over repeat runs'''
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        runs.append((time.perf_counter() - start) * 1000 / number)
+    return statistics.median(runs)
+
+def measure_frames(update:Callable[[float], object]|None, draw:Callable[[], object]|None, frames:int, dt:float = 1 / 60) -> dict[str, float]:
+    '''Run update and draw for a number of frames, returns the median and 95th percentile milliseconds of each'''
+    update_times = []
+    draw_times = []
+    gc.collect()
+    for _ in range(frames):
+        if update is not None:
+            start = time.perf_counter()
+            update(dt)
+            update_times.append((time.perf_counter() - start) * 1000)
+        if draw is not None:
+            start = time.perf_counter()
+            draw()
+            draw_times.append((time.perf_counter() - start) * 1000)
+        pygame.event.pump()
+    result = {}
+    for name, times in (("update", update_times), ("draw", draw_times)):
+        if times:
+            result[f"{name}_ms"] = statistics.median(times)
+            result[f"{name}_p95_ms"] = float(np.percentile(times, 95))
+    return result
+
+def measure_allocations(step:Callable[[], object], frames:int) -> dict[str, float]:
+    '''Run step for a number of frames under tracemalloc, returns the mean Python heap peak growth per frame in KiB.
+    Pixel buffers allocated by SDL are not traced, see the surface pool counters for those'''
+    gc.collect()
+    tracemalloc.start()
+    peaks = []
+    try:
+        for _ in range(frames):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            step()
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+            pygame.event.pump()
+    finally:
+        tracemalloc.stop()
+    return {"py_peak_kib_per_frame": statistics.mean(peaks) / 1024}
+
+def get_environment() -> dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "sdl": ".".join(str(part) for part in pygame.get_sdl_version()),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "video_driver": pygame.display.get_driver() if pygame.display.get_init() else ""
+    }
+
+def compare(results:dict[str, dict[str, float]], baseline:dict[str, dict[str, float]], threshold:float, min_difference_ms:float = 0.05) -> list[dict]:
+    '''Return the timings of results that are slower than the baseline by more than threshold (a fraction, e.g. 0.25),
+    differences below min_difference_ms are ignored as noise. Percentiles are reported but too noisy to compare'''
+    regressions = []
+    for name, metrics in results.items():
+        base_metrics = baseline.get(name, {})
+        for metric, value in metrics.items():
+            base_value = base_metrics.get(metric)
+            if not metric.endswith("_ms") or metric.endswith("_p95_ms") or base_value is None:
+                continue
+            if value > base_value * (1 + threshold) and value - base_value > min_difference_ms:
+                regressions.append({"benchmark": name, "metric": metric, "baseline": base_value, "value": value, "ratio": value / base_value if base_value else float("inf")})
+    return regressions
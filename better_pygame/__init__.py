@@ -1,4 +1,18 @@
 from .scene import Scene, SceneManager
-from .animation import Animation, MultiAnimation
+from .game_loop import GameLoop
+from .replay import InputRecorder, InputReplayer
+from .animation import Animation, MultiAnimation, AnimationSystem
 from .transition import Transition
+from .surfaces import SurfacePool, SurfaceCache
+from .coordinates import Vec2, Transform
+from .entities import EntityStore
+from .effect import Effect, Emitter
+from .render_batch import RenderBatch
+from .collider import SpatialHash, RectCollider, CircleCollider, collide_masks
+from .disk_cache import DiskSurfaceCache
+from .assets import AssetCache, asset_cache, load_image
+from .prefetch import AssetPrefetcher
+from .text import FontRegistry, TextCache, GlyphAtlas
+from .ui_layer import CachedUILayer
+from .profiler import FrameProfiler
 from ._constants import *
\ No newline at end of file
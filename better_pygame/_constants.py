@@ -10,5 +10,6 @@ ON_SECTION_END = pygame.event.custom_type()
 __all__ = [
     "ON_ANIMATION_LOOP",
     "ON_ANIMATION_END",
-    "ON_TRANSITION_END"
+    "ON_TRANSITION_END",
+    "ON_EFECT_END"
 ]
\ No newline at end of file
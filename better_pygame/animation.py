@@ -1,5 +1,32 @@
+import numpy as np
 import pygame
 from ._constants import ON_ANIMATION_END, ON_ANIMATION_LOOP
+from .assets import load_image, asset_cache
+
+class _AnimationState:
+    '''Descriptor for a state attribute of Animation, stored in an AnimationSystem array while the Animation is registered to one'''
+    def __init__(self, array_name:str, cast:type) -> None:
+        self.array_name = array_name
+        self.cast = cast
+    
+    def __set_name__(self, owner, name:str):
+        self.name = name
+    
+    def __get__(self, animation, owner=None):
+        if animation is None:
+            return self
+        system = animation._system
+        if system is None:
+            return animation.__dict__[self.name]
+        return self.cast(system.__getattribute__(self.array_name)[animation._index])
+    
+    def __set__(self, animation, value):
+        system = animation._system
+        if system is None:
+            animation.__dict__[self.name] = value
+        else:
+            system.__getattribute__(self.array_name)[animation._index] = value
+
 
 class Animation:
     '''Simple Animation for an Object
@@ -10,19 +37,39 @@ class Animation:
             Called every frame to update the Animation object
         get_frame:
             Get the Surface of the current animation frame
+        get_mask:
+            Get the collision Mask of the current animation frame, built once per image
         
         Events
         ----------
-        Animation loop: type - ON_ANIMATION_LOOP, element - Animation
+        Animation loop: type - ON_ANIMATION_LOOP, element - Animation, loops - number of loops completed during the update
         Animation end: type - ON_ANIMATION_END, element - Animation
+        
+        At most one event of each type is posted per update, however long the frame took
+        
+        AnimationSystem
+        ----------------
+        Once registered to an AnimationSystem, the state of the Animation is stored in the arrays of the system
+        and advanced by AnimationSystem.update(), Animation.update() should not be called as well.
     '''
     
+    current_frame = _AnimationState("current_frames", int)
+    timer = _AnimationState("timers", float)
+    framerate = _AnimationState("framerates", float)
+    loop = _AnimationState("looping", bool)
+    curr_loop_count = _AnimationState("loops_left", int)
+    paused = _AnimationState("paused", bool)
+    _running = _AnimationState("running", bool)
+    
+    _system:"AnimationSystem|None" = None
+    _index:int = -1
+    
     def __init__(self, images:list[str|pygame.Surface], framerate:int|float, loop:bool = True, loop_count:int = -1, paused:bool = False, object_id:str|None = None) -> None:
         '''
         Parameters
         ----------------------------------------
         images: `list`[`str`|`Surface`]
-            A list of pygame Surfaces (recommended) or paths to the images
+            A list of pygame Surfaces or paths to the images, paths are loaded through the shared asset cache
         framerate: `int`
             Number of frames per second
         loop: `bool`
@@ -35,7 +82,7 @@ class Animation:
         self.images:list[pygame.Surface] = []
         for image in images:
             if isinstance(image, str):
-                self.images.append(pygame.image.load(image))
+                self.images.append(load_image(image))
             elif isinstance(image, pygame.Surface):
                 self.images.append(image)
             else:
@@ -83,25 +130,42 @@ class Animation:
             return
         
         self.timer -= dt
-        while self.timer <= 0:
-            self.current_frame += 1
-            if self.current_frame >= len(self.images):
-                if self.loop and self.curr_loop_count > 0:
-                    self.current_frame = 0
-                    self.curr_loop_count -= 1
-                    event = pygame.Event(ON_ANIMATION_LOOP, {"element":self, "object_id":self.object_id})
-                    pygame.event.post(event)
-                elif self.loop and self.curr_loop_count == -1:
-                    self.current_frame = 0
-                    event = pygame.Event(ON_ANIMATION_LOOP, {"element":self, "object_id":self.object_id})
-                    pygame.event.post(event)
-                else:
-                    self.current_frame -= 1
-                    self._running = False
-                    event = pygame.Event(ON_ANIMATION_END, {"element":self, "object_id":self.object_id})
-                    pygame.event.post(event)
-                    break
-            self.timer -= self.frame_delay
+        if self.timer > 0:
+            return
+        
+        #Number of frames passed, computed at once instead of stepping through every frame
+        frame_delay = self.frame_delay
+        frames_passed = int(-self.timer // frame_delay) + 1
+        self.timer += frames_passed * frame_delay
+        
+        frame_count = len(self.images)
+        next_frame = self.current_frame + frames_passed
+        wraps = next_frame // frame_count
+        loops = 0
+        ended = False
+        if wraps == 0:
+            self.current_frame = next_frame
+        elif self.loop and self.curr_loop_count == -1:
+            loops = wraps
+            self.current_frame = next_frame % frame_count
+        elif self.loop and wraps <= self.curr_loop_count:
+            loops = wraps
+            self.curr_loop_count -= wraps
+            self.current_frame = next_frame % frame_count
+        else:
+            #Runs out of loops, stop at the last frame
+            loops = max(self.curr_loop_count, 0) if self.loop else 0
+            self.curr_loop_count -= loops
+            self.current_frame = frame_count - 1
+            self._running = False
+            ended = True
+        
+        if loops:
+            event = pygame.Event(ON_ANIMATION_LOOP, {"element":self, "object_id":self.object_id, "loops":loops})
+            pygame.event.post(event)
+        if ended:
+            event = pygame.Event(ON_ANIMATION_END, {"element":self, "object_id":self.object_id})
+            pygame.event.post(event)
     
     def replay(self):
         '''Replay the animation from beginning'''
@@ -114,6 +178,10 @@ class Animation:
     def get_frame(self):
         '''Return the Surface for the current frame'''
         return self.images[self.current_frame]
+    
+    def get_mask(self, threshold:int = 127) -> pygame.mask.Mask:
+        '''Return the collision Mask of the current frame, cached by the asset cache so frames are never rebuilt'''
+        return asset_cache.get_mask(self.images[self.current_frame], threshold)
 
 
 class MultiAnimation:
@@ -125,6 +193,10 @@ class MultiAnimation:
             Called every frame to update the Animation object
         get_frame:
             Get the Surface of the current animation frame
+        get_mask:
+            Get the collision Mask of the current animation frame
+        
+        When registered to an AnimationSystem, only the current animation is advanced by the system
     '''
 
     def __init__(self, animations:dict[str, Animation], start:str|None = None) -> None:
@@ -132,18 +204,28 @@ class MultiAnimation:
         if start and start not in animations.keys():
             raise ValueError(f"Start key {start} not in animations")
         self.curr_animation_key = start
+        self._system:AnimationSystem|None = None
     
     def add_animation(self, key:str, animation:Animation):
         self.animations[key] = animation
+        if self._system is not None:
+            self._system.register(animation)
+            self._system.enabled[animation._index] = key == self.curr_animation_key
     
     def remove_animation(self, key:str):
         if key in self.animations.keys():
-            self.animations.pop(key)
+            animation = self.animations.pop(key)
+            if self._system is not None:
+                self._system.unregister(animation)
         else:
             raise ValueError(f"Key [{key}] not in animations")
     
     def switch_animation(self, key:str):
         if key in self.animations.keys():
+            if self._system is not None:
+                if self.curr_animation:
+                    self._system.enabled[self.curr_animation._index] = False
+                self._system.enabled[self.animations[key]._index] = True
             self.curr_animation_key = key
         else:
             raise ValueError(f"Key [{key}] not in animations")
@@ -167,13 +249,182 @@ class MultiAnimation:
     def get_frame(self):
         if self.curr_animation:
             return self.curr_animation.get_frame()
+    
+    def get_mask(self, threshold:int = 127):
+        if self.curr_animation:
+            return self.curr_animation.get_mask(threshold)
+
+
+class AnimationSystem:
+    '''Advances many Animations at once, with their state stored in NumPy arrays
+    
+        Methods
+        ----------------
+        register:
+            Add an Animation or MultiAnimation to the system
+        unregister:
+            Remove an Animation or MultiAnimation from the system, its state is moved back onto the object
+        update:
+            Called every frame to advance all registered animations in one vectorised step
+        
+        Events
+        ----------
+        Events are emitted in batch, at most one of each type per update\n
+        Animation loop: type - ON_ANIMATION_LOOP, element - AnimationSystem, elements - list of Animations, object_ids - their ids, loops - loops completed by each\n
+        Animation end: type - ON_ANIMATION_END, element - AnimationSystem, elements - list of Animations, object_ids - their ids
+    '''
+    
+    def __init__(self, capacity:int = 64, object_id:str|None = None) -> None:
+        '''
+        Parameters
+        ----------------------------------------
+        capacity: `int`
+            Initial number of animation slots, the arrays grow when needed
+        object_id: `str`
+            The id of the system, for handling events
+        '''
+        self.object_id = object_id
+        self.animations:list[Animation|None] = []
+        self._free_slots:list[int] = []
+        self._allocate(max(capacity, 1))
+    
+    def _allocate(self, capacity:int):
+        '''Internal method to (re)allocate the state arrays with a new capacity, keeping existing state'''
+        arrays = {
+            "timers": np.float64,
+            "framerates": np.float64,
+            "frame_counts": np.int64,
+            "current_frames": np.int64,
+            "loops_left": np.int64,
+            "looping": np.bool_,
+            "paused": np.bool_,
+            "running": np.bool_,
+            "enabled": np.bool_
+        }
+        used = len(self.animations)
+        for name, dtype in arrays.items():
+            array = np.zeros(capacity, dtype)
+            if used:
+                array[:used] = self.__getattribute__(name)[:used]
+            self.__setattr__(name, array)
+        self.capacity = capacity
+    
+    def __len__(self):
+        return len(self.animations) - len(self._free_slots)
+    
+    def register(self, animation:"Animation|MultiAnimation"):
+        '''Register an Animation, or every Animation of a MultiAnimation (only its current one is advanced)'''
+        if isinstance(animation, MultiAnimation):
+            if not animation.curr_animation_key and animation.animations:
+                animation.curr_animation_key = list(animation.animations.keys())[0]
+            animation._system = self
+            for key, child in animation.animations.items():
+                self.register(child)
+                self.enabled[child._index] = key == animation.curr_animation_key
+            return
+        if animation._system is self:
+            return
+        if animation._system is not None:
+            animation._system.unregister(animation)
+        
+        if self._free_slots:
+            index = self._free_slots.pop()
+            self.animations[index] = animation
+        else:
+            index = len(self.animations)
+            if index >= self.capacity:
+                self._allocate(self.capacity * 2)
+            self.animations.append(animation)
+        
+        self.timers[index] = animation.timer
+        self.framerates[index] = animation.framerate
+        self.frame_counts[index] = len(animation.images)
+        self.current_frames[index] = animation.current_frame
+        self.loops_left[index] = animation.curr_loop_count
+        self.looping[index] = animation.loop
+        self.paused[index] = animation.paused
+        self.running[index] = animation._running
+        self.enabled[index] = True
+        animation._system = self
+        animation._index = index
+    
+    def unregister(self, animation:"Animation|MultiAnimation"):
+        '''Remove an Animation from the system and move its state back onto the Animation'''
+        if isinstance(animation, MultiAnimation):
+            animation._system = None
+            for child in animation.animations.values():
+                self.unregister(child)
+            return
+        if animation._system is not self:
+            raise ValueError("Animation is not registered to this AnimationSystem")
+        index = animation._index
+        state = {
+            "current_frame": int(self.current_frames[index]),
+            "timer": float(self.timers[index]),
+            "framerate": float(self.framerates[index]),
+            "loop": bool(self.looping[index]),
+            "curr_loop_count": int(self.loops_left[index]),
+            "paused": bool(self.paused[index]),
+            "_running": bool(self.running[index])
+        }
+        animation._system = None
+        animation._index = -1
+        for name, value in state.items():
+            animation.__setattr__(name, value)
         
+        self.animations[index] = None
+        self.enabled[index] = False
+        self._free_slots.append(index)
+    
+    def update(self, dt:float):
+        '''Advance all registered animations
         
+        Parameters
+        -------------
+        dt: `float`
+            Time passed since last frame in seconds'''
+        used = len(self.animations)
+        active = self.enabled[:used] & self.running[:used] & ~self.paused[:used]
+        timers = self.timers[:used]
+        timers[active] -= dt
+        indexes = np.flatnonzero(active & (timers <= 0))
+        if indexes.size == 0:
+            return
         
+        #Number of frames passed for every due animation
+        frame_delays = 1 / self.framerates[indexes]
+        frames_passed = np.floor(-self.timers[indexes] / frame_delays).astype(np.int64) + 1
+        self.timers[indexes] += frames_passed * frame_delays
         
+        frame_counts = self.frame_counts[indexes]
+        next_frames = self.current_frames[indexes] + frames_passed
+        wraps = next_frames // frame_counts
+        loops_left = self.loops_left[indexes]
+        looping = self.looping[indexes]
         
-
-
-
-
-
+        no_wrap = wraps == 0
+        infinite = looping & (loops_left == -1)
+        within = looping & (loops_left != -1) & (wraps <= loops_left)
+        ended = ~(no_wrap | infinite | within)
+        
+        loops = np.where(no_wrap, 0, np.where(infinite | within, wraps, np.where(looping, np.maximum(loops_left, 0), 0)))
+        self.current_frames[indexes] = np.where(ended, frame_counts - 1, next_frames % frame_counts)
+        self.loops_left[indexes] = np.where(infinite, loops_left, loops_left - loops)
+        self.running[indexes[ended]] = False
+        
+        looped = np.flatnonzero(loops)
+        if looped.size:
+            elements = [self.animations[index] for index in indexes[looped]]
+            event = pygame.Event(ON_ANIMATION_LOOP, {"element":self, 
+                                                     "object_id":self.object_id, 
+                                                     "elements":elements, 
+                                                     "object_ids":[animation.object_id for animation in elements], 
+                                                     "loops":loops[looped].tolist()})
+            pygame.event.post(event)
+        if ended.any():
+            elements = [self.animations[index] for index in indexes[ended]]
+            event = pygame.Event(ON_ANIMATION_END, {"element":self, 
+                                                    "object_id":self.object_id, 
+                                                    "elements":elements, 
+                                                    "object_ids":[animation.object_id for animation in elements]})
+            pygame.event.post(event)
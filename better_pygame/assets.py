@@ -0,0 +1,191 @@
+import io
+import weakref
+
+import pygame
+
+from .surfaces import SurfaceCache
+from .disk_cache import DiskSurfaceCache
+
+class AssetCache:
+    '''Shared cache of loaded images, keyed by path and transform
+
+    Methods
+    ----------
+    get_image:
+        Load an image, or return the shared Surface if it was loaded with the same transform before
+    pin:
+        Keep an image from being evicted when the cache is over its memory budget
+    unpin:
+        Allow a pinned image to be evicted again
+    get_font:
+        Get the shared Font of a font file at a size
+    get_mask:
+        Get the collision Mask of a Surface, built once per Surface
+
+    Usage
+    ----------
+    Images are converted to the pixel format of the display (convert() / convert_alpha()), which makes blitting them much faster.
+    Images loaded before pygame.display.set_mode() is called are converted the first time they are requested after it.\n
+    The returned Surfaces are shared, copy them before drawing onto them.\n
+    With a DiskSurfaceCache, scaled images are stored on disk after they are decoded, and later launches skip decoding and scaling them.
+    '''
+    def __init__(self, max_bytes:int = 256 * 1024 * 1024, disk_cache:DiskSurfaceCache|None = None) -> None:
+        '''
+        Parameters
+        -----------
+        max_bytes: int
+            Memory budget of the cached pixel data, least recently used images that are not pinned are evicted first
+        disk_cache: DiskSurfaceCache|None
+            Persistent cache of scaled images, None to always decode the image files
+        '''
+        self.disk_cache = disk_cache
+        self.images = SurfaceCache(max_bytes)
+        self._unconverted:set[tuple] = set()
+        self.fonts:dict[tuple[str, int], pygame.font.Font] = {}
+        self._font_files:dict[str, bytes] = {}
+        #Masks live as long as their Surface, images shared through the cache share their masks
+        self.masks:weakref.WeakKeyDictionary[pygame.Surface, dict[int, pygame.mask.Mask]] = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def get_key(path:str, size:tuple[int, int]|None = None, convert:bool = True) -> tuple:
+        '''Return the cache key of an image'''
+        return path, None if size is None else (int(size[0]), int(size[1])), convert
+
+    @staticmethod
+    def _display_ready() -> bool:
+        return pygame.display.get_init() and pygame.display.get_surface() is not None
+
+    @staticmethod
+    def convert(surface:pygame.Surface) -> pygame.Surface:
+        '''Convert a Surface to the display pixel format, keeping per pixel alpha if it has any'''
+        if surface.get_flags() & pygame.SRCALPHA:
+            return surface.convert_alpha()
+        return surface.convert()
+
+    def get_image(self, path:str, size:tuple[int, int]|None = None, convert:bool = True, pin:bool = False) -> pygame.Surface:
+        '''Get the shared Surface of an image
+
+        Parameters
+        -----------
+        path: str
+            Path of the image file
+        size: tuple[int, int]|None
+            Size the image is scaled to, None to keep the original size
+        convert: bool
+            If the image is converted to the display pixel format
+        pin: bool
+            If the image is pinned, see pin()'''
+        key = AssetCache.get_key(path, size, convert)
+        if pin:
+            self.images.pin(key)
+        surface = self.images.get(key)
+        if surface is None:
+            surface = self._load(path, size)
+            if convert:
+                if AssetCache._display_ready():
+                    surface = AssetCache.convert(surface)
+                else:
+                    self._unconverted.add(key)
+            self.images.put(key, surface)
+        elif key in self._unconverted and AssetCache._display_ready():
+            surface = AssetCache.convert(surface)
+            self._unconverted.discard(key)
+            self.images.put(key, surface)
+        return surface
+
+    def put_image(self, path:str, surface:pygame.Surface, size:tuple[int, int]|None = None, convert:bool = True):
+        '''Add an already loaded (and scaled to size) image to the cache, e.g. one decoded on another thread'''
+        key = AssetCache.get_key(path, size, convert)
+        if convert:
+            if AssetCache._display_ready():
+                surface = AssetCache.convert(surface)
+            else:
+                self._unconverted.add(key)
+        self.images.put(key, surface)
+
+    def has_image(self, path:str, size:tuple[int, int]|None = None, convert:bool = True) -> bool:
+        return AssetCache.get_key(path, size, convert) in self.images
+
+    def _load(self, path:str, size:tuple[int, int]|None) -> pygame.Surface:
+        '''Internal method to decode an image, using the unscaled cached image if it exists'''
+        source = self.images.get(AssetCache.get_key(path, None, False))
+        if source is None:
+            if self.disk_cache is not None and size is not None:
+                return self.disk_cache.load(path, size)
+            source = pygame.image.load(path)
+        if size is not None and source.get_size() != AssetCache.get_key(path, size)[1]:
+            return pygame.transform.scale(source, size)
+        return source
+
+    def get_font(self, path:str, size:int) -> pygame.font.Font:
+        '''Get the shared Font of a font file at a size, the file is read from memory if it was prefetched
+
+        Parameters
+        -----------
+        path: str
+            Path of the font file
+        size: int
+            Font size'''
+        key = (path, size)
+        font = self.fonts.get(key)
+        if font is None:
+            data = self._font_files.get(path)
+            font = pygame.font.Font(path if data is None else io.BytesIO(data), size)
+            self.fonts[key] = font
+        return font
+
+    def put_font_file(self, path:str, data:bytes):
+        '''Add the content of a font file to the cache, e.g. one read on another thread'''
+        self._font_files[path] = data
+
+    def has_font(self, path:str, size:int|None = None) -> bool:
+        '''If the font file is in memory, or if the Font of size is already created'''
+        if size is None:
+            return path in self._font_files
+        return (path, size) in self.fonts
+
+    def get_mask(self, surface:pygame.Surface, threshold:int = 127) -> pygame.mask.Mask:
+        '''Get the collision Mask of a Surface, see pygame.mask.from_surface()
+
+        Parameters
+        -----------
+        surface: Surface
+            The Surface the Mask is built from, it should not be drawn onto after its Mask is built
+        threshold: int
+            Minimum alpha of the pixels that are set in the Mask'''
+        masks = self.masks.get(surface)
+        if masks is None:
+            masks = self.masks[surface] = {}
+        mask = masks.get(threshold)
+        if mask is None:
+            mask = masks[threshold] = pygame.mask.from_surface(surface, threshold)
+        return mask
+
+    def pin(self, path:str, size:tuple[int, int]|None = None, convert:bool = True):
+        '''Keep an image from being evicted, the image does not need to be loaded yet'''
+        self.images.pin(AssetCache.get_key(path, size, convert))
+
+    def unpin(self, path:str, size:tuple[int, int]|None = None, convert:bool = True):
+        '''Allow a pinned image to be evicted again'''
+        self.images.unpin(AssetCache.get_key(path, size, convert))
+
+    def evict(self, path:str, size:tuple[int, int]|None = None, convert:bool = True):
+        '''Remove an image from the cache'''
+        key = AssetCache.get_key(path, size, convert)
+        self.images.remove(key)
+        self._unconverted.discard(key)
+
+    def clear(self):
+        '''Remove all images from the cache'''
+        self.images.clear()
+        self._unconverted.clear()
+        self.fonts.clear()
+        self._font_files.clear()
+        self.masks.clear()
+
+
+asset_cache = AssetCache()
+
+def load_image(path:str, size:tuple[int, int]|None = None, convert:bool = True, pin:bool = False) -> pygame.Surface:
+    '''Get a shared image from the default AssetCache, see AssetCache.get_image()'''
+    return asset_cache.get_image(path, size, convert, pin)
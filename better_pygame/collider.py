@@ -0,0 +1,427 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+import pygame
+
+RECT = 0
+CIRCLE = 1
+
+class _ColliderState:
+    '''Descriptor for a coordinate of Collider, stored in a SpatialHash array while the Collider is added to one'''
+    def __init__(self, array_name:str, column:int|None = None, cast:type = float) -> None:
+        self.array_name = array_name
+        self.column = column
+        self.cast = cast
+
+    def __set_name__(self, owner, name:str):
+        self.name = name
+
+    def __get__(self, collider, owner=None):
+        if collider is None:
+            return self
+        world = collider._world
+        if world is None:
+            return collider.__dict__[self.name]
+        array = world.__getattribute__(self.array_name)
+        if self.column is None:
+            return self.cast(array[collider._index])
+        return self.cast(array[collider._index, self.column])
+
+    def __set__(self, collider, value):
+        world = collider._world
+        if world is None:
+            collider.__dict__[self.name] = value
+            return
+        array = world.__getattribute__(self.array_name)
+        if self.column is None:
+            array[collider._index] = value
+        else:
+            array[collider._index, self.column] = value
+            world.moved[collider._index] = True
+
+
+class Collider(ABC):
+    '''Base class of the colliders added to a SpatialHash
+
+    Attributes
+    ----------
+    owner:
+        The GameObject the collider is attached to, see GameObject.set_collider()
+    layer:
+        Bit mask of the layers the collider is on
+    mask:
+        Bit mask of the layers the collider collides with, two colliders collide if either one's mask contains the other's layer
+    '''
+    kind:int = RECT
+
+    _world:"SpatialHash|None" = None
+    _index:int = -1
+
+    x = _ColliderState("positions", 0)
+    y = _ColliderState("positions", 1)
+    _extent_x = _ColliderState("extents", 0)
+    _extent_y = _ColliderState("extents", 1)
+    layer = _ColliderState("layers", cast=int)
+    mask = _ColliderState("masks", cast=int)
+
+    def __init__(self, position:tuple[float, float], extents:tuple[float, float], owner = None, layer:int = 1, mask:int = -1) -> None:
+        self.x, self.y = position
+        self._extent_x, self._extent_y = extents
+        self.owner = owner
+        self.layer = layer
+        self.mask = mask
+
+    def move_to(self, x:float, y:float):
+        self.x = x
+        self.y = y
+
+    def move(self, dx:float, dy:float):
+        self.x += dx
+        self.y += dy
+
+    @abstractmethod
+    def get_bounds(self) -> tuple[float, float, float, float]:
+        '''Return the bounding box of the collider as (left, top, right, bottom)'''
+
+
+class RectCollider(Collider):
+    '''Axis aligned rectangle collider, positioned by its top left corner'''
+    kind = RECT
+
+    def __init__(self, rect, owner = None, layer:int = 1, mask:int = -1) -> None:
+        '''
+        Parameters
+        -----------
+        rect: `RectValue`
+            Position and size of the collider
+        owner: GameObject|None
+            The GameObject the collider belongs to
+        layer: int
+            Bit mask of the layers the collider is on
+        mask: int
+            Bit mask of the layers the collider collides with
+        '''
+        x, y, width, height = rect
+        super().__init__((x, y), (width, height), owner, layer, mask)
+
+    @property
+    def width(self) -> float:
+        return self._extent_x
+
+    @property
+    def height(self) -> float:
+        return self._extent_y
+
+    def set_size(self, width:float, height:float):
+        self._extent_x = width
+        self._extent_y = height
+
+    def get_bounds(self) -> tuple[float, float, float, float]:
+        return self.x, self.y, self.x + self.width, self.y + self.height
+
+
+class CircleCollider(Collider):
+    '''Circle collider, positioned by its centre'''
+    kind = CIRCLE
+
+    def __init__(self, center:tuple[float, float], radius:float, owner = None, layer:int = 1, mask:int = -1) -> None:
+        '''
+        Parameters
+        -----------
+        center: tuple[float, float]
+            Centre of the circle
+        radius: float
+            Radius of the circle
+        owner: GameObject|None
+            The GameObject the collider belongs to
+        layer: int
+            Bit mask of the layers the collider is on
+        mask: int
+            Bit mask of the layers the collider collides with
+        '''
+        super().__init__(center, (radius, radius), owner, layer, mask)
+
+    @property
+    def radius(self) -> float:
+        return self._extent_x
+
+    def set_radius(self, radius:float):
+        self._extent_x = radius
+        self._extent_y = radius
+
+    def get_bounds(self) -> tuple[float, float, float, float]:
+        return self.x - self.radius, self.y - self.radius, self.x + self.radius, self.y + self.radius
+
+
+class SpatialHash:
+    '''Broadphase of colliders on a uniform grid, with the collider state stored in NumPy arrays
+
+    Methods
+    ----------
+    add:
+        Add a collider
+    remove:
+        Remove a collider, its state is moved back onto the collider
+    set_positions:
+        Move many colliders at once
+    query_pairs:
+        Return the pairs of colliders whose bounding boxes overlap, as an (N, 2) array of collider indices
+    collide_pairs:
+        query_pairs() filtered by the exact shapes of the colliders
+    query_rect:
+        Return the indices of the colliders whose bounding boxes overlap a rectangle
+
+    Usage
+    ----------
+    Colliders are found by their index (collider._index), use get_colliders() to turn index pairs into colliders.\n
+    Only the grid cells of colliders that moved since the last query are recomputed.
+    The cell size should be about the size of the common colliders, a collider spanning many cells is listed in each of them.
+    '''
+
+    def __init__(self, cell_size:float = 64, capacity:int = 256) -> None:
+        '''
+        Parameters
+        -----------
+        cell_size: float
+            Width and height of a grid cell
+        capacity: int
+            Initial number of collider slots, the arrays grow when needed
+        '''
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self.colliders:list[Collider|None] = []
+        self._free_slots:list[int] = []
+        self._allocate(max(capacity, 1))
+
+    def _allocate(self, capacity:int):
+        '''Internal method to (re)allocate the state arrays with a new capacity, keeping existing state'''
+        arrays = {
+            "positions": (np.float64, (capacity, 2)),
+            "extents": (np.float64, (capacity, 2)),
+            "kinds": (np.int8, capacity),
+            "layers": (np.int64, capacity),
+            "masks": (np.int64, capacity),
+            "active": (np.bool_, capacity),
+            "moved": (np.bool_, capacity),
+            "bounds": (np.float64, (capacity, 4)),
+            "cells": (np.int64, (capacity, 4))
+        }
+        used = len(self.colliders)
+        for name, (dtype, shape) in arrays.items():
+            array = np.zeros(shape, dtype)
+            if used:
+                array[:used] = self.__getattribute__(name)[:used]
+            self.__setattr__(name, array)
+        self.capacity = capacity
+
+    def __len__(self):
+        return len(self.colliders) - len(self._free_slots)
+
+    def add(self, collider:Collider) -> int:
+        '''Add a collider, returns its index'''
+        if collider._world is self:
+            return collider._index
+        if collider._world is not None:
+            collider._world.remove(collider)
+
+        if self._free_slots:
+            index = self._free_slots.pop()
+            self.colliders[index] = collider
+        else:
+            index = len(self.colliders)
+            if index >= self.capacity:
+                self._allocate(self.capacity * 2)
+            self.colliders.append(collider)
+
+        self.positions[index] = collider.x, collider.y
+        self.extents[index] = collider._extent_x, collider._extent_y
+        self.kinds[index] = collider.kind
+        self.layers[index] = collider.layer
+        self.masks[index] = collider.mask
+        self.active[index] = True
+        self.moved[index] = True
+        collider._world = self
+        collider._index = index
+        return index
+
+    def remove(self, collider:Collider):
+        '''Remove a collider and move its state back onto it'''
+        if collider._world is not self:
+            raise ValueError("Collider is not added to this SpatialHash")
+        index = collider._index
+        state = {
+            "x": float(self.positions[index, 0]),
+            "y": float(self.positions[index, 1]),
+            "_extent_x": float(self.extents[index, 0]),
+            "_extent_y": float(self.extents[index, 1]),
+            "layer": int(self.layers[index]),
+            "mask": int(self.masks[index])
+        }
+        collider._world = None
+        collider._index = -1
+        for name, value in state.items():
+            collider.__setattr__(name, value)
+
+        self.colliders[index] = None
+        self.active[index] = False
+        self._free_slots.append(index)
+
+    def set_positions(self, indices:np.ndarray, positions:np.ndarray):
+        '''Move the colliders of indices to positions (top left corner for rects, centre for circles)'''
+        self.positions[indices] = positions
+        self.moved[indices] = True
+
+    def get_colliders(self, indices:np.ndarray) -> list:
+        '''Return the colliders of an array of indices, pairs of indices become tuples of colliders'''
+        if np.ndim(indices) == 2:
+            return [(self.colliders[a], self.colliders[b]) for a, b in indices.tolist()]
+        return [self.colliders[index] for index in np.asarray(indices).tolist()]
+
+    def _get_bounds(self, indices:np.ndarray) -> np.ndarray:
+        '''Internal method to get the bounding boxes (left, top, right, bottom) of colliders as an (N, 4) array'''
+        positions = self.positions[indices]
+        extents = self.extents[indices]
+        circle = (self.kinds[indices] == CIRCLE)[:, None]
+        #Rects are positioned by their top left corner and circles by their centre
+        top_left = np.where(circle, positions - extents, positions)
+        return np.concatenate((top_left, positions + extents), axis=1)
+
+    def update(self):
+        '''Recompute the bounding boxes and grid cells of the colliders that moved, called by the queries'''
+        indices = np.flatnonzero(self.moved[:len(self.colliders)] & self.active[:len(self.colliders)])
+        if len(indices):
+            bounds = self._get_bounds(indices)
+            self.bounds[indices] = bounds
+            self.cells[indices] = np.floor(bounds / self.cell_size).astype(np.int64)
+        self.moved[:] = False
+
+    def _get_cell_entries(self, indices:np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        '''Internal method to list every (cell key, collider index, cell x, cell y) covered by the colliders of indices'''
+        cells = self.cells[indices]
+        widths = cells[:, 2] - cells[:, 0] + 1
+        counts = widths * (cells[:, 3] - cells[:, 1] + 1)
+        owners = np.repeat(indices, counts)
+        #Position of each entry inside the cell range of its collider
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        widths = np.repeat(widths, counts)
+        cell_x = np.repeat(cells[:, 0], counts) + local % widths
+        cell_y = np.repeat(cells[:, 1], counts) + local // widths
+        keys = cell_x * 73856093 ^ cell_y * 19349663
+        return keys, owners, cell_x, cell_y
+
+    def query_pairs(self) -> np.ndarray:
+        '''Return each pair of colliders whose bounding boxes overlap and whose layers collide once, as an (N, 2) array of indices'''
+        self.update()
+        indices = np.flatnonzero(self.active[:len(self.colliders)])
+        if len(indices) < 2:
+            return np.empty((0, 2), np.int64)
+        keys, owners, cell_x, cell_y = self._get_cell_entries(indices)
+        order = np.argsort(keys)
+        keys = keys[order]
+        owners = owners[order]
+        cell_x = cell_x[order]
+        cell_y = cell_y[order]
+
+        #Entries of a cell are contiguous after sorting, pair each entry with the ones up to the end of its cell
+        first, second = [], []
+        distance = 1
+        while distance < len(keys):
+            same_key = keys[:-distance] == keys[distance:]
+            if not same_key.any():
+                break
+            #Different cells can share a key
+            same_key &= (cell_x[:-distance] == cell_x[distance:]) & (cell_y[:-distance] == cell_y[distance:])
+            a = owners[:-distance][same_key]
+            b = owners[distance:][same_key]
+            #Colliders sharing several cells are only paired in the first cell of the overlap of their cell ranges
+            first_cell = (
+                (cell_x[:-distance][same_key] == np.maximum(self.cells[a, 0], self.cells[b, 0])) &
+                (cell_y[:-distance][same_key] == np.maximum(self.cells[a, 1], self.cells[b, 1]))
+            )
+            first.append(a[first_cell])
+            second.append(b[first_cell])
+            distance += 1
+        if not first:
+            return np.empty((0, 2), np.int64)
+        first = np.concatenate(first)
+        second = np.concatenate(second)
+        low = np.minimum(first, second)
+        high = np.maximum(first, second)
+
+        bounds_low = self.bounds[low]
+        bounds_high = self.bounds[high]
+        overlap = (
+            (bounds_low[:, 0] < bounds_high[:, 2]) & (bounds_high[:, 0] < bounds_low[:, 2]) &
+            (bounds_low[:, 1] < bounds_high[:, 3]) & (bounds_high[:, 1] < bounds_low[:, 3])
+        )
+        overlap &= ((self.layers[low] & self.masks[high]) != 0) | ((self.layers[high] & self.masks[low]) != 0)
+        return np.stack((low[overlap], high[overlap]), axis=1)
+
+    def collide_pairs(self) -> np.ndarray:
+        '''Return the pairs of query_pairs() whose shapes (rect or circle) overlap, as an (N, 2) array of indices'''
+        pairs = self.query_pairs()
+        if not len(pairs):
+            return pairs
+        first, second = pairs[:, 0], pairs[:, 1]
+        kinds_first = self.kinds[first]
+        kinds_second = self.kinds[second]
+        #Rect pairs are decided by their bounding boxes
+        colliding = (kinds_first == RECT) & (kinds_second == RECT)
+
+        both_circles = (kinds_first == CIRCLE) & (kinds_second == CIRCLE)
+        if both_circles.any():
+            a, b = first[both_circles], second[both_circles]
+            distance = self.positions[a] - self.positions[b]
+            radii = self.extents[a, 0] + self.extents[b, 0]
+            colliding[both_circles] = np.einsum("ij,ij->i", distance, distance) < radii * radii
+
+        mixed = kinds_first != kinds_second
+        if mixed.any():
+            circles = np.where(kinds_first[mixed] == CIRCLE, first[mixed], second[mixed])
+            rects = np.where(kinds_first[mixed] == CIRCLE, second[mixed], first[mixed])
+            centers = self.positions[circles]
+            nearest = np.clip(centers, self.positions[rects], self.positions[rects] + self.extents[rects])
+            distance = centers - nearest
+            radii = self.extents[circles, 0]
+            colliding[mixed] = np.einsum("ij,ij->i", distance, distance) < radii * radii
+        return pairs[colliding]
+
+    def query_rect(self, rect) -> np.ndarray:
+        '''Return the indices of the colliders whose bounding boxes overlap rect'''
+        self.update()
+        x, y, width, height = rect
+        indices = np.flatnonzero(self.active[:len(self.colliders)])
+        cells = self.cells[indices]
+        min_x, min_y = int(np.floor(x / self.cell_size)), int(np.floor(y / self.cell_size))
+        max_x, max_y = int(np.floor((x + width) / self.cell_size)), int(np.floor((y + height) / self.cell_size))
+        #Cell ranges are a cheap first test before the bounding boxes
+        indices = indices[(cells[:, 0] <= max_x) & (cells[:, 2] >= min_x) & (cells[:, 1] <= max_y) & (cells[:, 3] >= min_y)]
+        bounds = self.bounds[indices]
+        overlap = (bounds[:, 0] < x + width) & (x < bounds[:, 2]) & (bounds[:, 1] < y + height) & (y < bounds[:, 3])
+        return indices[overlap]
+
+
+def collide_masks(position_a:tuple[int, int], mask_a:pygame.mask.Mask, position_b:tuple[int, int], mask_b:pygame.mask.Mask) -> tuple[int, int]|None:
+    '''Narrowphase test of two masks placed with their top left corners at positions,
+    the bounding rects are tested first and the masks are only compared if they overlap
+
+    Returns the first overlapping point relative to position_a, None if the masks do not overlap
+
+    Parameters
+    -----------
+    position_a: tuple[int, int]
+        Top left corner of mask_a
+    mask_a: Mask
+        e.g. Animation.get_mask()
+    position_b: tuple[int, int]
+        Top left corner of mask_b
+    mask_b: Mask
+        e.g. Animation.get_mask()'''
+    offset_x = int(position_b[0]) - int(position_a[0])
+    offset_y = int(position_b[1]) - int(position_a[1])
+    width_a, height_a = mask_a.get_size()
+    width_b, height_b = mask_b.get_size()
+    if offset_x >= width_a or -offset_x >= width_b or offset_y >= height_a or -offset_y >= height_b:
+        return None
+    return mask_a.overlap(mask_b, (offset_x, offset_y))
@@ -0,0 +1,262 @@
+import math
+from typing import Iterator
+
+import numpy as np
+
+class Vec2:
+    '''Mutable 2D vector, usable anywhere pygame takes a coordinate pair
+
+    Methods
+    ----------
+    set:
+        Set both components in place
+    lerp_from:
+        Set the vector to a point between two coordinate pairs in place
+    rounded:
+        Return the vector rounded to an int tuple
+
+    Usage
+    ----------
+    The operators (+, -, *, /) return new vectors, the in place operators (+=, -=, *=, /=) and set methods change the vector itself
+    and are meant for hot paths that should not allocate.\n
+    Vectors multiply and divide by numbers and, component wise, by other coordinate pairs.
+    '''
+    __slots__ = ("x", "y")
+
+    def __init__(self, x:float = 0.0, y:float = 0.0) -> None:
+        self.x = x
+        self.y = y
+
+    @classmethod
+    def from_tuple(cls, tup:"tuple[float, float]|Vec2") -> "Vec2":
+        return cls(tup[0], tup[1])
+
+    def __repr__(self) -> str:
+        return f"Vec2({self.x}, {self.y})"
+
+    def __len__(self) -> int:
+        return 2
+
+    def __getitem__(self, index:int) -> float:
+        if index == 0 or index == -2:
+            return self.x
+        if index == 1 or index == -1:
+            return self.y
+        raise IndexError("Vec2 index out of range")
+
+    def __iter__(self) -> Iterator[float]:
+        yield self.x
+        yield self.y
+
+    def __eq__(self, other) -> bool:
+        try:
+            return len(other) == 2 and self.x == other[0] and self.y == other[1]
+        except TypeError:
+            return NotImplemented
+
+    __hash__ = None
+
+    def __add__(self, other) -> "Vec2":
+        return Vec2(self.x + other[0], self.y + other[1])
+
+    __radd__ = __add__
+
+    def __sub__(self, other) -> "Vec2":
+        return Vec2(self.x - other[0], self.y - other[1])
+
+    def __rsub__(self, other) -> "Vec2":
+        return Vec2(other[0] - self.x, other[1] - self.y)
+
+    def __mul__(self, other) -> "Vec2":
+        if isinstance(other, (int, float)):
+            return Vec2(self.x * other, self.y * other)
+        return Vec2(self.x * other[0], self.y * other[1])
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other) -> "Vec2":
+        if isinstance(other, (int, float)):
+            return Vec2(self.x / other, self.y / other)
+        return Vec2(self.x / other[0], self.y / other[1])
+
+    def __neg__(self) -> "Vec2":
+        return Vec2(-self.x, -self.y)
+
+    def __iadd__(self, other) -> "Vec2":
+        self.x += other[0]
+        self.y += other[1]
+        return self
+
+    def __isub__(self, other) -> "Vec2":
+        self.x -= other[0]
+        self.y -= other[1]
+        return self
+
+    def __imul__(self, other) -> "Vec2":
+        if isinstance(other, (int, float)):
+            self.x *= other
+            self.y *= other
+        else:
+            self.x *= other[0]
+            self.y *= other[1]
+        return self
+
+    def __itruediv__(self, other) -> "Vec2":
+        if isinstance(other, (int, float)):
+            self.x /= other
+            self.y /= other
+        else:
+            self.x /= other[0]
+            self.y /= other[1]
+        return self
+
+    def set(self, x:float, y:float) -> "Vec2":
+        '''Set both components, returns the vector'''
+        self.x = x
+        self.y = y
+        return self
+
+    def lerp_from(self, start:"tuple[float, float]|Vec2", end:"tuple[float, float]|Vec2", progress:float) -> "Vec2":
+        '''Set the vector to the point at progress (0 to 1) from start to end, returns the vector'''
+        self.x = start[0] + (end[0] - start[0]) * progress
+        self.y = start[1] + (end[1] - start[1]) * progress
+        return self
+
+    def copy(self) -> "Vec2":
+        return Vec2(self.x, self.y)
+
+    def length(self) -> float:
+        return math.hypot(self.x, self.y)
+
+    def dot(self, other) -> float:
+        return self.x * other[0] + self.y * other[1]
+
+    def rounded(self) -> tuple[int, int]:
+        return round(self.x), round(self.y)
+
+    def to_tuple(self) -> tuple[float, float]:
+        return self.x, self.y
+
+
+class Transform:
+    '''2D affine transform, mapping (x, y) to (a*x + c*y + tx, b*x + d*y + ty)
+
+    Methods
+    ----------
+    translation, scaling, rotation, camera:
+        Create common transforms
+    then:
+        Combine with a transform applied afterwards
+    apply:
+        Transform a point
+    apply_points:
+        Transform an (N, 2) array of points in one call
+    inverse:
+        Return the transform mapping back
+
+    Usage
+    ----------
+    Angles are in degrees and rotate the same way as pygame.transform.rotate() (counterclockwise on screen, where y points down).\n
+    t1.then(t2) (or t2 @ t1) applies t1 first.
+    '''
+    __slots__ = ("a", "b", "c", "d", "tx", "ty")
+
+    def __init__(self, a:float = 1.0, b:float = 0.0, c:float = 0.0, d:float = 1.0, tx:float = 0.0, ty:float = 0.0) -> None:
+        self.a = a
+        self.b = b
+        self.c = c
+        self.d = d
+        self.tx = tx
+        self.ty = ty
+
+    def __repr__(self) -> str:
+        return f"Transform({self.a}, {self.b}, {self.c}, {self.d}, {self.tx}, {self.ty})"
+
+    @classmethod
+    def identity(cls) -> "Transform":
+        return cls()
+
+    @classmethod
+    def translation(cls, dx:float, dy:float) -> "Transform":
+        return cls(tx=dx, ty=dy)
+
+    @classmethod
+    def scaling(cls, sx:float, sy:float|None = None, origin:tuple[float, float] = (0, 0)) -> "Transform":
+        '''Scale about origin, sy defaults to sx'''
+        if sy is None:
+            sy = sx
+        return cls(sx, 0.0, 0.0, sy, origin[0] * (1 - sx), origin[1] * (1 - sy))
+
+    @classmethod
+    def rotation(cls, angle:float, origin:tuple[float, float] = (0, 0)) -> "Transform":
+        '''Rotate by angle degrees about origin'''
+        radians = math.radians(angle)
+        cos, sin = math.cos(radians), math.sin(radians)
+        ox, oy = origin
+        return cls(cos, -sin, sin, cos, ox - cos * ox - sin * oy, oy + sin * ox - cos * oy)
+
+    @classmethod
+    def camera(cls, position:tuple[float, float], zoom:float, screen_size:tuple[int, int]) -> "Transform":
+        '''World to screen transform of a camera centred on position'''
+        return cls(zoom, 0.0, 0.0, zoom, screen_size[0] / 2 - position[0] * zoom, screen_size[1] / 2 - position[1] * zoom)
+
+    def then(self, other:"Transform") -> "Transform":
+        '''Return the transform applying self, then other'''
+        return Transform(
+            other.a * self.a + other.c * self.b,
+            other.b * self.a + other.d * self.b,
+            other.a * self.c + other.c * self.d,
+            other.b * self.c + other.d * self.d,
+            other.a * self.tx + other.c * self.ty + other.tx,
+            other.b * self.tx + other.d * self.ty + other.ty
+        )
+
+    def __matmul__(self, other:"Transform") -> "Transform":
+        return other.then(self)
+
+    def inverse(self) -> "Transform":
+        determinant = self.a * self.d - self.b * self.c
+        if determinant == 0:
+            raise ValueError("Transform is not invertible")
+        a, b, c, d = self.d / determinant, -self.b / determinant, -self.c / determinant, self.a / determinant
+        return Transform(a, b, c, d, -(a * self.tx + c * self.ty), -(b * self.tx + d * self.ty))
+
+    def apply(self, x:float, y:float) -> tuple[float, float]:
+        '''Transform the point (x, y)'''
+        return self.a * x + self.c * y + self.tx, self.b * x + self.d * y + self.ty
+
+    def apply_vec(self, vec:Vec2, out:Vec2|None = None) -> Vec2:
+        '''Transform a Vec2, into out if given (out can be vec itself)'''
+        x, y = vec.x, vec.y
+        if out is None:
+            out = Vec2()
+        return out.set(self.a * x + self.c * y + self.tx, self.b * x + self.d * y + self.ty)
+
+    def get_matrix(self) -> np.ndarray:
+        '''Return the 2x3 matrix of the transform'''
+        return np.array(((self.a, self.c, self.tx), (self.b, self.d, self.ty)))
+
+    def apply_points(self, points:np.ndarray, out:np.ndarray|None = None) -> np.ndarray:
+        '''Transform an (N, 2) array of points in one call, into out if given (out can be points itself)'''
+        points = np.asarray(points, dtype=np.float64)
+        matrix = self.get_matrix()
+        return np.add(points @ matrix[:, :2].T, matrix[:, 2], out=out)
+
+
+def transform_points(points:np.ndarray, offset:tuple[float, float] = (0, 0), scale:float|tuple[float, float] = 1.0, out:np.ndarray|None = None) -> np.ndarray:
+    '''Scale then offset an (N, 2) array of points in one call, the common case of world to screen without rotation
+
+    Parameters
+    -----------
+    points: ndarray
+        (N, 2) array of points
+    offset: tuple[float, float]
+        Added after scaling
+    scale: float|tuple[float, float]
+        Scale of both axes or of each axis
+    out: ndarray|None
+        Array the result is written to, can be points itself'''
+    points = np.asarray(points, dtype=np.float64)
+    out = np.multiply(points, scale, out=out)
+    out += offset
+    return out
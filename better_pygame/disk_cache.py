@@ -0,0 +1,172 @@
+import hashlib
+import json
+import mmap
+import os
+import threading
+
+import pygame
+
+class DiskSurfaceCache:
+    '''Persistent cache of decoded and scaled images, stored as raw pixel buffers in a directory
+
+    Methods
+    ----------
+    get:
+        Return the cached Surface of an image at a size, memory mapped from the cache file
+    put:
+        Store the pixels of a Surface decoded from an image
+    load:
+        Return the Surface of an image at a size, decoding and storing it on a cache miss
+    prune:
+        Delete the cache files of outdated sources
+
+    Usage
+    ----------
+    Entries are keyed by the hash of the source file, the target size and the pixel format,
+    so an entry is never used once its source file changes.\n
+    Source hashes are remembered in an index with the file modification time and size, unchanged files are not hashed again.\n
+    The returned Surfaces are mapped copy-on-write, drawing onto them does not change the cache file.
+    '''
+    INDEX_FILE = "index.json"
+
+    def __init__(self, directory:str = ".cache/surfaces") -> None:
+        '''
+        Parameters
+        -----------
+        directory: str
+            Directory the cache files are stored in, created if it does not exist
+        '''
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._sources:dict[str, list] = self._read_index()
+
+        self.hits = 0
+        self.misses = 0
+
+    def _read_index(self) -> dict[str, list]:
+        '''Internal method to read the index of source hashes'''
+        try:
+            with open(os.path.join(self.directory, DiskSurfaceCache.INDEX_FILE), "r") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self):
+        '''Internal method to write the index of source hashes, replacing the old index in one step'''
+        index_path = os.path.join(self.directory, DiskSurfaceCache.INDEX_FILE)
+        with open(index_path + ".tmp", "w") as file:
+            json.dump(self._sources, file)
+        os.replace(index_path + ".tmp", index_path)
+
+    def get_source_hash(self, path:str) -> str:
+        '''Return the hash of a source file, the file is only read if it changed since it was last hashed'''
+        source = os.path.abspath(path)
+        stat = os.stat(source)
+        with self._lock:
+            entry = self._sources.get(source)
+            if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                return entry[2]
+        with open(source, "rb") as file:
+            source_hash = hashlib.sha1(file.read()).hexdigest()
+        with self._lock:
+            self._sources[source] = [stat.st_mtime_ns, stat.st_size, source_hash]
+            #Entries are shared by sources with the same content, only remove them once no source uses them
+            if entry is not None and entry[2] != source_hash and all(other[2] != entry[2] for other in self._sources.values()):
+                self._remove_entries(entry[2])
+            self._write_index()
+        return source_hash
+
+    @staticmethod
+    def get_format(surface:pygame.Surface) -> str:
+        '''Return the pixel format a Surface is stored in'''
+        return "RGBA" if surface.get_flags() & pygame.SRCALPHA else "RGB"
+
+    def _get_file(self, source_hash:str, size:tuple[int, int], pixel_format:str) -> str:
+        return os.path.join(self.directory, f"{source_hash}_{size[0]}x{size[1]}_{pixel_format}.raw")
+
+    def _find_file(self, source_hash:str, size:tuple[int, int]) -> tuple[str, str]|tuple[None, None]:
+        '''Internal method to find the cache file of an entry in any pixel format'''
+        for pixel_format in ("RGBA", "RGB"):
+            file = self._get_file(source_hash, size, pixel_format)
+            if os.path.exists(file):
+                return file, pixel_format
+        return None, None
+
+    def get(self, path:str, size:tuple[int, int]) -> pygame.Surface|None:
+        '''Return the cached Surface of an image scaled to size, None if it is not cached
+
+        Parameters
+        -----------
+        path: str
+            Path of the source image
+        size: tuple[int, int]
+            Size the image was scaled to'''
+        size = (int(size[0]), int(size[1]))
+        file, pixel_format = self._find_file(self.get_source_hash(path), size)
+        if file is None:
+            self.misses += 1
+            return None
+        with open(file, "rb") as data:
+            if os.fstat(data.fileno()).st_size != size[0] * size[1] * len(pixel_format):
+                self.misses += 1
+                return None
+            buffer = mmap.mmap(data.fileno(), 0, access=mmap.ACCESS_COPY)
+        self.hits += 1
+        #The Surface keeps a reference to the mapped buffer
+        return pygame.image.frombuffer(buffer, size, pixel_format)
+
+    def put(self, path:str, surface:pygame.Surface):
+        '''Store the pixels of a Surface decoded from the image at path, keyed by the size of the Surface'''
+        size = surface.get_size()
+        pixel_format = DiskSurfaceCache.get_format(surface)
+        file = self._get_file(self.get_source_hash(path), size, pixel_format)
+        #Prefetch threads can store the same entry at the same time, each writes its own temporary file
+        temp_file = f"{file}.{threading.get_ident()}.tmp"
+        with open(temp_file, "wb") as data:
+            data.write(pygame.image.tobytes(surface, pixel_format))
+        os.replace(temp_file, file)
+
+    def load(self, path:str, size:tuple[int, int]|None = None) -> pygame.Surface:
+        '''Return the Surface of an image scaled to size, decoding, scaling and storing it if it is not cached
+
+        Parameters
+        -----------
+        path: str
+            Path of the source image
+        size: tuple[int, int]|None
+            Size the image is scaled to, None to keep the original size (always decoded, the size is unknown before decoding)'''
+        if size is not None:
+            surface = self.get(path, size)
+            if surface is not None:
+                return surface
+        surface = pygame.image.load(path)
+        if size is not None and surface.get_size() != (int(size[0]), int(size[1])):
+            surface = pygame.transform.scale(surface, size)
+        if size is not None:
+            self.put(path, surface)
+        return surface
+
+    def _remove_entries(self, source_hash:str):
+        '''Internal method to delete the cache files of a source hash'''
+        for file in os.listdir(self.directory):
+            if file.startswith(source_hash + "_"):
+                os.remove(os.path.join(self.directory, file))
+
+    def prune(self):
+        '''Delete the cache files of sources that no longer exist or changed since they were cached'''
+        with self._lock:
+            for source in [source for source in self._sources if not os.path.exists(source)]:
+                del self._sources[source]
+            self._write_index()
+            hashes = {entry[2] for entry in self._sources.values()}
+        for file in os.listdir(self.directory):
+            if file.endswith(".raw") and file.split("_")[0] not in hashes:
+                os.remove(os.path.join(self.directory, file))
+
+    def clear(self):
+        '''Delete all cache files'''
+        with self._lock:
+            for file in os.listdir(self.directory):
+                os.remove(os.path.join(self.directory, file))
+            self._sources.clear()
@@ -1,5 +1,327 @@
+import math
+
+import numpy as np
 import pygame
 
+from ._constants import ON_EFECT_END
+
+class Emitter:
+    '''Describes the particles an Effect spawns and how they look over their lifetime
+
+    Usage
+    ----------
+    Ranges are (min, max) tuples, every particle gets a uniform random value in the range.\n
+    Angles are in degrees, 0 points right and 90 points up (counterclockwise on screen, like pygame.transform.rotate()).\n
+    Colour and size go from their start to their end value over the life of a particle, in `steps` steps,
+    each step is a sprite drawn once and shared by every Effect using the Emitter. Reuse Emitter objects across effects.
+    '''
+    def __init__(self,
+                 rate:float = 0,
+                 burst:int = 0,
+                 duration:float = math.inf,
+                 lifetime:tuple[float, float] = (0.5, 1.0),
+                 speed:tuple[float, float] = (50, 100),
+                 angle:tuple[float, float] = (0, 360),
+                 radius:float = 0,
+                 offset:tuple[float, float] = (0, 0),
+                 start_size:float = 4,
+                 end_size:float = 1,
+                 start_color:pygame.Color|tuple = (255, 255, 255, 255),
+                 end_color:pygame.Color|tuple = (255, 255, 255, 0),
+                 gravity:tuple[float, float] = (0, 0),
+                 drag:float = 0,
+                 steps:int = 8
+                 ) -> None:
+        '''
+        Parameters
+        -----------
+        rate: float
+            Particles spawned per second while the emitter runs
+        burst: int
+            Particles spawned at once when the effect starts
+        duration: float
+            Seconds the emitter spawns at rate, inf (the default) to spawn until Effect.stop()
+        lifetime: tuple[float, float]
+            Range of seconds a particle lives
+        speed: tuple[float, float]
+            Range of the initial speed in pixels per second
+        angle: tuple[float, float]
+            Range of the initial direction in degrees
+        radius: float
+            Particles spawn at a random point within radius of the emitter
+        offset: tuple[float, float]
+            Position of the emitter relative to the position of the effect
+        start_size, end_size: float
+            Diameter in pixels at the start and end of the life of a particle
+        start_color, end_color: `ColorValue`
+            Colour at the start and end of the life of a particle, alpha included
+        gravity: tuple[float, float]
+            Acceleration in pixels per second squared
+        drag: float
+            Fraction of the velocity lost per second
+        steps: int
+            Number of cached sprites the colour and size change through
+        '''
+        if steps <= 0:
+            raise ValueError("steps must be positive")
+        self.rate = rate
+        self.burst = burst
+        self.duration = duration
+        self.lifetime = lifetime
+        self.speed = speed
+        self.angle = angle
+        self.radius = radius
+        self.offset = offset
+        self.start_size = start_size
+        self.end_size = end_size
+        self.start_color = pygame.Color(start_color)
+        self.end_color = pygame.Color(end_color)
+        self.gravity = gravity
+        self.drag = drag
+        self.steps = steps
+        self._sprites:list[pygame.Surface]|None = None
+
+    def get_sprites(self) -> list[pygame.Surface]:
+        '''Return the sprites of the steps of the life of a particle, drawn on first use'''
+        if self._sprites is None:
+            sprites = []
+            for step in range(self.steps):
+                progress = step / (self.steps - 1) if self.steps > 1 else 0
+                size = max(1, round(self.start_size + (self.end_size - self.start_size) * progress))
+                sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+                pygame.draw.circle(sprite, self.start_color.lerp(self.end_color, progress), (size / 2, size / 2), size / 2)
+                sprites.append(sprite)
+            self._sprites = sprites
+        return self._sprites
+
+
 class Effect:
-    def __init__(self) -> None:
-        pass
\ No newline at end of file
+    '''Particle effect, particles are spawned by Emitters and their state is stored in NumPy arrays
+
+    Methods
+    ----------
+    start:
+        Start (or restart) the effect, bursts are spawned
+    stop:
+        Stop spawning, the effect ends when the live particles expire
+    move_to:
+        Move the effect, only new particles spawn at the new position
+    update:
+        Spawn, move and expire the particles in vectorised passes
+    draw:
+        Draw every particle in one fblits call
+
+    Usage
+    ----------
+    Particle state is in the arrays positions, velocities, ages, lifetimes and emitter_indices (index of the Emitter),
+    packed in the first len(effect) rows. Colour and size follow from the age as the index of a cached sprite.\n
+    Pass a seed to spawn the same particles every run, e.g. for replays.
+
+    Events
+    ----------
+    Effect end: type - ON_EFECT_END, element - Effect, object_id - its id
+    '''
+    def __init__(self, emitters:list[Emitter], position:tuple[float, float] = (0, 0), capacity:int = 1024, special_flags:int = 0, seed:int|None = None, object_id:str|None = None) -> None:
+        '''
+        Parameters
+        -----------
+        emitters: list[Emitter]
+            The emitters of the effect
+        position: tuple[float, float]
+            Position of the effect, the emitters are placed relative to it
+        capacity: int
+            Number of preallocated particle slots, the arrays grow when needed
+        special_flags: int
+            Blend flags of the particles, e.g. pygame.BLEND_ADD for fire and flashes
+        seed: int|None
+            Seed of the random spawn values, None for a random seed
+        object_id: str|None
+            The id of the effect, for handling events
+        '''
+        if not emitters:
+            raise ValueError("Effect requires at least one Emitter")
+        self.emitters = emitters
+        self.position = position
+        self.special_flags = special_flags
+        self.object_id = object_id
+        self.rng = np.random.default_rng(seed)
+
+        #Per emitter parameters used by the vectorised passes
+        self._gravity = np.array([emitter.gravity for emitter in emitters], np.float64)
+        self._use_gravity = bool(self._gravity.any())
+        self._drag = np.array([emitter.drag for emitter in emitters], np.float64)
+        self._use_drag = bool(self._drag.any())
+        self._steps = np.array([emitter.steps for emitter in emitters], np.int64)
+        self._first_sprite = np.concatenate(([0], np.cumsum(self._steps)[:-1]))
+        self._sprites:list[pygame.Surface] = []
+        for emitter in emitters:
+            self._sprites.extend(emitter.get_sprites())
+        self._half_sizes = np.array([sprite.get_size() for sprite in self._sprites], np.float64) / 2
+
+        self.capacity = 0
+        self.count = 0
+        self._allocate(max(capacity, 1))
+
+        self.running = False
+        self.emitting = False
+        self.elapsed = 0.0
+        self._spawn_carry = np.zeros(len(emitters))
+
+    def _allocate(self, capacity:int):
+        '''Internal method to (re)allocate the state arrays with a new capacity, keeping existing state'''
+        arrays = {
+            "positions": (np.float64, (capacity, 2)),
+            "velocities": (np.float64, (capacity, 2)),
+            "ages": (np.float64, capacity),
+            "lifetimes": (np.float64, capacity),
+            "emitter_indices": (np.int64, capacity)
+        }
+        count = self.count
+        for name, (dtype, shape) in arrays.items():
+            array = np.zeros(shape, dtype)
+            if count:
+                array[:count] = self.__getattribute__(name)[:count]
+            self.__setattr__(name, array)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def start(self):
+        '''Start the effect, particles of a previous run are removed'''
+        self.count = 0
+        self.elapsed = 0.0
+        self._spawn_carry[:] = 0
+        self.running = True
+        self.emitting = True
+        for index, emitter in enumerate(self.emitters):
+            if emitter.burst:
+                self._spawn(index, emitter.burst)
+
+    def stop(self):
+        '''Stop spawning particles, the effect ends when the live particles expire'''
+        self.emitting = False
+
+    def move_to(self, position:tuple[float, float]):
+        self.position = position
+
+    def _spawn(self, emitter_index:int, count:int):
+        '''Internal method to add count particles of an emitter'''
+        if self.count + count > self.capacity:
+            capacity = self.capacity
+            while capacity < self.count + count:
+                capacity *= 2
+            self._allocate(capacity)
+        emitter = self.emitters[emitter_index]
+        rng = self.rng
+        new = slice(self.count, self.count + count)
+
+        angles = np.radians(rng.uniform(emitter.angle[0], emitter.angle[1], count))
+        speeds = rng.uniform(emitter.speed[0], emitter.speed[1], count)
+        #y points down on screen, so positive angles point up
+        self.velocities[new, 0] = np.cos(angles) * speeds
+        self.velocities[new, 1] = -np.sin(angles) * speeds
+
+        positions = self.positions[new]
+        positions[:, 0] = self.position[0] + emitter.offset[0]
+        positions[:, 1] = self.position[1] + emitter.offset[1]
+        if emitter.radius:
+            #Uniform over the disc
+            distances = emitter.radius * np.sqrt(rng.random(count))
+            directions = rng.uniform(0, 2 * math.pi, count)
+            positions[:, 0] += np.cos(directions) * distances
+            positions[:, 1] += np.sin(directions) * distances
+
+        self.ages[new] = 0
+        self.lifetimes[new] = rng.uniform(emitter.lifetime[0], emitter.lifetime[1], count)
+        self.emitter_indices[new] = emitter_index
+        self.count += count
+
+    def _emit(self, dt:float):
+        '''Internal method to spawn the particles of the emitters running at a rate'''
+        for index, emitter in enumerate(self.emitters):
+            if not emitter.rate or self.elapsed >= emitter.duration:
+                continue
+            #Spawn for the part of dt the emitter was running, the fraction of a particle is carried to the next update
+            active_time = min(dt, emitter.duration - self.elapsed)
+            amount = emitter.rate * active_time + self._spawn_carry[index]
+            count = int(amount)
+            self._spawn_carry[index] = amount - count
+            if count:
+                self._spawn(index, count)
+
+    def _is_emitting(self) -> bool:
+        '''Internal method to check if any emitter will spawn more particles'''
+        return self.emitting and any(emitter.rate and self.elapsed < emitter.duration for emitter in self.emitters)
+
+    def update(self, dt:float):
+        '''Spawn new particles, move the particles and remove the expired ones.
+        Emits ON_EFECT_END when the emitters are done and the last particle expired'''
+        if not self.running:
+            return
+        if self.emitting:
+            self._emit(dt)
+        self.elapsed += dt
+
+        count = self.count
+        if count:
+            velocities = self.velocities[:count]
+            if self._use_gravity or self._use_drag:
+                emitters = self.emitter_indices[:count]
+                if self._use_gravity:
+                    velocities += self._gravity[emitters] * dt
+                if self._use_drag:
+                    velocities *= np.maximum(0, 1 - self._drag[emitters] * dt)[:, None]
+            self.positions[:count] += velocities * dt
+            ages = self.ages[:count]
+            ages += dt
+
+            alive = ages < self.lifetimes[:count]
+            alive_count = int(np.count_nonzero(alive))
+            if alive_count != count:
+                #Pack the live particles into the front of the arrays, keeping their order
+                for array in (self.positions, self.velocities, self.ages, self.lifetimes, self.emitter_indices):
+                    array[:alive_count] = array[:count][alive]
+                self.count = alive_count
+
+        if not self.count and not self._is_emitting():
+            self.running = False
+            self.emitting = False
+            event = pygame.Event(ON_EFECT_END, {"element":self, "object_id":self.object_id})
+            pygame.event.post(event)
+
+    def get_sprite_indices(self) -> np.ndarray:
+        '''Return the index of the current sprite of every live particle, from its emitter and age'''
+        count = self.count
+        emitters = self.emitter_indices[:count]
+        steps = self._steps[emitters]
+        step = (self.ages[:count] / self.lifetimes[:count] * steps).astype(np.int64)
+        np.minimum(step, steps - 1, out=step)
+        return self._first_sprite[emitters] + step
+
+    def get_blits(self, offset:tuple[float, float] = (0, 0)) -> tuple[list[pygame.Surface], np.ndarray]:
+        '''Return the sprites and top left corners (an (N, 2) int array) of the live particles
+
+        Parameters
+        -----------
+        offset: tuple[float, float]
+            Added to every position, e.g. the negated camera position'''
+        if not self.count:
+            return [], np.empty((0, 2), np.int64)
+        sprite_indices = self.get_sprite_indices()
+        top_left = self.positions[:self.count] - self._half_sizes[sprite_indices]
+        top_left += offset
+        return list(map(self._sprites.__getitem__, sprite_indices.tolist())), top_left.astype(np.int64)
+
+    def draw(self, screen:pygame.Surface, offset:tuple[float, float] = (0, 0)):
+        '''Draw every live particle centred on its position, see also RenderBatch.submit_effect()
+
+        Parameters
+        -----------
+        screen: Surface
+            The Surface drawn onto
+        offset: tuple[float, float]
+            Added to every position, e.g. the negated camera position'''
+        sprites, top_left = self.get_blits(offset)
+        if sprites:
+            screen.fblits(zip(sprites, top_left.tolist()), self.special_flags)
@@ -0,0 +1,212 @@
+import numpy as np
+import pygame
+
+class EntityStore:
+    '''Pool of simple entities (e.g. bullets) stored as NumPy arrays, updated by vectorised passes instead of per object methods
+
+    Methods
+    ----------
+    spawn:
+        Add an entity in a free slot, returns its index
+    spawn_many:
+        Add many entities at once
+    despawn:
+        Free the slot of an entity
+    update:
+        Move the entities, then despawn the expired and off screen ones
+    draw:
+        Draw every entity with its sprite
+
+    Usage
+    ----------
+    Entities are identified by their slot index, slots are reused after despawn.
+    Per entity state is read and written through the arrays, e.g. store.velocities[index] = (0, 100).\n
+    Positions are the centres of the entities, lifetimes are in seconds (inf for no limit)
+    and sprites are indices into the list of Surfaces passed to draw().
+    '''
+    def __init__(self, capacity:int = 1024, bounds:pygame.Rect|tuple|None = None, cull_margin:float = 0, grow:bool = True) -> None:
+        '''
+        Parameters
+        -----------
+        capacity: int
+            Number of preallocated entity slots
+        bounds: `RectValue`|None
+            Entities leaving the area are despawned by update(), None for no culling
+        cull_margin: float
+            Distance entities can travel outside bounds before they are culled
+        grow: bool
+            If the arrays grow when all slots are used, otherwise spawning raises a ValueError
+        '''
+        self.bounds = None if bounds is None else pygame.Rect(bounds)
+        self.cull_margin = cull_margin
+        self.grow = grow
+        self.capacity = 0
+        self._used = 0
+        self._free_count = 0
+        self._allocate(max(capacity, 1))
+
+    def _allocate(self, capacity:int):
+        '''Internal method to (re)allocate the state arrays with a new capacity, keeping existing state'''
+        arrays = {
+            "positions": (np.float64, (capacity, 2)),
+            "velocities": (np.float64, (capacity, 2)),
+            "lifetimes": (np.float64, capacity),
+            "sprites": (np.int32, capacity),
+            "alive": (np.bool_, capacity)
+        }
+        old_capacity = self.capacity
+        for name, (dtype, shape) in arrays.items():
+            array = np.zeros(shape, dtype)
+            if old_capacity:
+                array[:old_capacity] = self.__getattribute__(name)
+            self.__setattr__(name, array)
+        #Stack of free slots, lowest on top so entities fill the arrays from the front.
+        #New slots are all above the old ones, so they go under the free slots that are left
+        free = np.empty(capacity, np.int64)
+        new_slots = np.arange(capacity - 1, old_capacity - 1, -1)
+        free[:len(new_slots)] = new_slots
+        if old_capacity:
+            free[len(new_slots):len(new_slots) + self._free_count] = self._free[:self._free_count]
+        self._free = free
+        self._free_count += len(new_slots)
+        self._scratch = np.empty((capacity, 2), np.float64)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.capacity - self._free_count
+
+    def _take_slots(self, count:int) -> np.ndarray:
+        '''Internal method to pop count slots from the free stack'''
+        if not count:
+            return np.empty(0, np.int64)
+        if count > self._free_count:
+            if not self.grow:
+                raise ValueError("EntityStore is full")
+            capacity = self.capacity
+            while capacity - len(self) < count:
+                capacity *= 2
+            self._allocate(capacity)
+        self._free_count -= count
+        slots = self._free[self._free_count:self._free_count + count][::-1].copy()
+        self._used = max(self._used, int(slots.max()) + 1)
+        return slots
+
+    def spawn(self, position:tuple[float, float], velocity:tuple[float, float] = (0, 0), lifetime:float = float("inf"), sprite:int = 0) -> int:
+        '''Add an entity, returns its index
+
+        Parameters
+        -----------
+        position: tuple[float, float]
+            Centre of the entity
+        velocity: tuple[float, float]
+            Movement per second
+        lifetime: float
+            Seconds until the entity is despawned
+        sprite: int
+            Index of the sprite of the entity'''
+        if self._free_count:
+            #Same as _take_slots(1), without creating arrays
+            self._free_count -= 1
+            index = int(self._free[self._free_count])
+            if index >= self._used:
+                self._used = index + 1
+        else:
+            index = int(self._take_slots(1)[0])
+        self.positions[index] = position
+        self.velocities[index] = velocity
+        self.lifetimes[index] = lifetime
+        self.sprites[index] = sprite
+        self.alive[index] = True
+        return index
+
+    def spawn_many(self, positions:np.ndarray, velocities:np.ndarray|tuple = (0, 0), lifetimes:np.ndarray|float = float("inf"), sprites:np.ndarray|int = 0) -> np.ndarray:
+        '''Add an entity for every row of positions, the other arguments are arrays of the same length or one value for all, returns the indices'''
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        slots = self._take_slots(len(positions))
+        self.positions[slots] = positions
+        self.velocities[slots] = velocities
+        self.lifetimes[slots] = lifetimes
+        self.sprites[slots] = sprites
+        self.alive[slots] = True
+        return slots
+
+    def despawn(self, index:int):
+        '''Free the slot of an entity, does nothing if it is not alive'''
+        if not self.alive[index]:
+            return
+        self.alive[index] = False
+        self._free[self._free_count] = index
+        self._free_count += 1
+
+    def despawn_many(self, indices:np.ndarray):
+        '''Free the slots of many entities, indices that are not alive are ignored'''
+        indices = np.unique(np.asarray(indices, dtype=np.int64))
+        indices = indices[self.alive[indices]]
+        self.alive[indices] = False
+        #Pushed lowest on top, so the lowest of the freed slots is reused first
+        self._free[self._free_count:self._free_count + len(indices)] = indices[::-1]
+        self._free_count += len(indices)
+
+    def get_alive(self) -> np.ndarray:
+        '''Return the indices of the alive entities'''
+        return np.flatnonzero(self.alive[:self._used])
+
+    def update(self, dt:float) -> np.ndarray:
+        '''Move the entities by their velocities, then despawn the ones whose lifetime ran out or that left the bounds
+
+        Returns the indices of the despawned entities'''
+        used = self._used
+        if not used:
+            return np.empty(0, np.int64)
+        #Dead slots are moved as well, one pass over the packed arrays is cheaper than selecting the alive ones
+        np.multiply(self.velocities[:used], dt, out=self._scratch[:used])
+        self.positions[:used] += self._scratch[:used]
+        self.lifetimes[:used] -= dt
+
+        alive = self.alive[:used]
+        expired = alive & (self.lifetimes[:used] <= 0)
+        if self.bounds is not None:
+            positions = self.positions[:used]
+            margin = self.cull_margin
+            expired |= alive & (
+                (positions[:, 0] < self.bounds.left - margin) | (positions[:, 0] > self.bounds.right + margin) |
+                (positions[:, 1] < self.bounds.top - margin) | (positions[:, 1] > self.bounds.bottom + margin)
+            )
+        despawned = np.flatnonzero(expired)
+        if len(despawned):
+            self.despawn_many(despawned)
+        return despawned
+
+    def clear(self):
+        '''Despawn every entity'''
+        self.alive[:] = False
+        self._free[:] = np.arange(self.capacity - 1, -1, -1)
+        self._free_count = self.capacity
+        self._used = 0
+
+    def get_sprite_rects(self, sprites:list[pygame.Surface]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        '''Return the sprite indices, top left corners and sizes of the sprites of the alive entities, centred on their positions
+
+        Parameters
+        -----------
+        sprites: list[Surface]
+            The Surfaces the sprite indices refer to'''
+        alive = self.get_alive()
+        sprite_indices = self.sprites[alive]
+        sizes = np.array([sprite.get_size() for sprite in sprites], np.int64).reshape(-1, 2)[sprite_indices]
+        top_left = (self.positions[alive] - sizes / 2).astype(np.int64)
+        return sprite_indices, top_left, sizes
+
+    def draw(self, screen:pygame.Surface, sprites:list[pygame.Surface]):
+        '''Draw every alive entity with its sprite centred on its position, see also RenderBatch.submit_entities()
+
+        Parameters
+        -----------
+        screen: Surface
+            The Surface drawn onto
+        sprites: list[Surface]
+            The Surfaces the sprite indices refer to'''
+        sprite_indices, top_left, _ = self.get_sprite_rects(sprites)
+        if not len(sprite_indices):
+            return
+        screen.fblits([(sprites[sprite], position) for sprite, position in zip(sprite_indices.tolist(), top_left.tolist())])
@@ -0,0 +1,156 @@
+import pygame
+
+from .scene import SceneManager
+from .replay import InputRecorder
+
+class GameLoop:
+    '''Main loop running the SceneManager at a fixed simulation rate
+
+    Methods
+    ----------
+    run:
+        Run the loop until the window is closed or stop() is called
+    advance:
+        Run one frame of the loop with the time passed since the last frame
+    stop:
+        End the loop after the current frame
+
+    Usage
+    ----------
+    SceneManager.update() is always called with the same dt (1 / update_rate), as many times as the time passed requires,
+    so the simulation does not depend on the frame rate.\n
+    The time left over after the updates is exposed as SceneManager.interpolation_alpha (0 to 1, fraction of an update step)
+    for scenes that want to draw positions between the last two updates.\n
+    When the frame took longer than max_updates_per_frame update steps the loop is behind, the extra time is dropped
+    and drawing is skipped (at most max_draw_skip frames in a row) to catch up.\n
+    With an InputRecorder the session can be played back by InputReplayer.\n
+    With a FrameProfiler on the SceneManager the whole frame is timed as loop:game_loop.frame.
+    '''
+    def __init__(self, scene_manager:SceneManager, screen:pygame.Surface|None = None, fps:int = 60, update_rate:int = 60, max_updates_per_frame:int = 5, max_draw_skip:int = 5, headless:bool = False, recorder:InputRecorder|None = None) -> None:
+        '''
+        Parameters
+        -----------
+        scene_manager: SceneManager
+            The SceneManager that is updated and drawn
+        screen: Surface|None
+            The display Surface, not used when headless
+        fps: int
+            Maximum frames drawn per second, 0 for no limit
+        update_rate: int
+            Simulation updates per second
+        max_updates_per_frame: int
+            Maximum number of updates run to catch up in one frame
+        max_draw_skip: int
+            Maximum number of frames in a row that are not drawn when the loop is behind
+        headless: bool
+            If the loop only updates, nothing is drawn and the loop runs as fast as possible
+        recorder: InputRecorder|None
+            Records the events and frame times of run() for InputReplayer, closed when run() returns
+        '''
+        if update_rate <= 0:
+            raise ValueError("update_rate must be positive")
+        self.scene_manager = scene_manager
+        self.screen = screen
+        self.fps = fps
+        self.update_rate = update_rate
+        self.update_step = 1 / update_rate
+        self.max_updates_per_frame = max_updates_per_frame
+        self.max_draw_skip = max_draw_skip
+        self.headless = headless
+        if not headless and screen is None:
+            raise ValueError("GameLoop requires a screen unless headless")
+        self.recorder = recorder
+        if recorder is not None:
+            recorder.update_rate = update_rate
+
+        self.clock = pygame.time.Clock()
+        self.running = False
+        self._accumulator = 0.0
+        self._skipped_draws = 0
+
+        self.updates = 0
+        self.frames = 0
+        self.dropped_time = 0.0
+
+    def stop(self):
+        '''End the loop after the current frame'''
+        self.running = False
+
+    def handle_events(self):
+        '''Pass the pending events onto the SceneManager, a QUIT event stops the loop'''
+        recorder = self.recorder
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.stop()
+            if recorder is not None:
+                recorder.record_event(event)
+            self.scene_manager.handle_event(event)
+
+    def advance(self, frame_time:float) -> bool:
+        '''Run the updates for frame_time seconds and draw the frame, returns if the frame was drawn
+
+        Parameters
+        -----------
+        frame_time: float
+            Seconds passed since the last frame'''
+        self._accumulator += frame_time
+        steps = 0
+        while self._accumulator >= self.update_step and steps < self.max_updates_per_frame:
+            self.scene_manager.update(self.update_step)
+            self._accumulator -= self.update_step
+            steps += 1
+        self.updates += steps
+
+        behind = self._accumulator >= self.update_step
+        if behind:
+            #Drop the time that cannot be caught up with instead of falling further behind every frame
+            self.dropped_time += self._accumulator - self._accumulator % self.update_step
+            self._accumulator %= self.update_step
+        self.scene_manager.interpolation_alpha = self._accumulator / self.update_step
+
+        if self.headless:
+            return False
+        if behind and self._skipped_draws < self.max_draw_skip:
+            self._skipped_draws += 1
+            return False
+        self._skipped_draws = 0
+        changed_rects = self.scene_manager.draw(self.screen)
+        pygame.display.update(changed_rects)
+        self.frames += 1
+        return True
+
+    def run(self, max_updates:int|None = None):
+        '''Run the loop until the window is closed or stop() is called
+
+        Parameters
+        -----------
+        max_updates: int|None
+            Stop after this number of updates, None to run until stopped'''
+        self.running = True
+        self.clock.tick()
+        try:
+            self._run(max_updates)
+        finally:
+            if self.recorder is not None:
+                self.recorder.close()
+    
+    def _run(self, max_updates:int|None):
+        '''Internal method running the frames of run()'''
+        while self.running:
+            self.handle_events()
+            if not self.running:
+                break
+            if self.headless:
+                #Simulate as fast as possible, one update step per frame
+                frame_time = self.update_step
+            else:
+                frame_time = self.clock.tick(self.fps) / 1000
+            profiler = self.scene_manager.profiler
+            if profiler:
+                profiler.time("loop", "game_loop", "frame", self.advance, frame_time)
+            else:
+                self.advance(frame_time)
+            if self.recorder is not None:
+                self.recorder.end_frame(frame_time)
+            if max_updates is not None and self.updates >= max_updates:
+                self.running = False
@@ -2,6 +2,13 @@ from abc import ABC, abstractmethod
 import pygame
 
 class GameObject(ABC):
+    collider = None
+    
+    def set_collider(self, collider):
+        '''Attach a Collider (see collider.py) to the GameObject, the collider's owner is set to the GameObject'''
+        collider.owner = self
+        self.collider = collider
+    
     @abstractmethod
     def handle_event(self, event:pygame.Event):...
     
@@ -0,0 +1,110 @@
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+import pygame
+
+from .assets import AssetCache, asset_cache
+from .disk_cache import DiskSurfaceCache
+
+def _load_image_file(path:str, size:tuple[int, int]|None, disk_cache:DiskSurfaceCache|None) -> pygame.Surface:
+    '''Decode (and scale) an image, runs on a worker thread'''
+    if disk_cache is not None and size is not None:
+        return disk_cache.load(path, size)
+    surface = pygame.image.load(path)
+    if size is not None and surface.get_size() != size:
+        surface = pygame.transform.scale(surface, size)
+    return surface
+
+def _read_font_file(path:str) -> bytes:
+    '''Read a font file into memory, runs on a worker thread'''
+    with open(path, "rb") as file:
+        return file.read()
+
+
+class AssetPrefetcher:
+    '''Loads the assets of asset manifests on a thread pool and hands them to an AssetCache on the main thread
+
+    Methods
+    ----------
+    prefetch:
+        Start loading the assets of a manifest that are not cached yet
+    collect:
+        Move finished assets into the AssetCache, called on the main thread every frame
+    is_ready:
+        If all assets of a manifest are loaded
+    wait:
+        Block until all assets of a manifest are loaded
+
+    Asset manifest
+    ----------------
+    A dict of the assets used by a Scene (see Scene.get_asset_manifest()), listed below (`key`: `value_type`)\n
+    `images`: `list[tuple[str, tuple[int, int]|None]]` - path of the image and the size it is scaled to\n
+    `fonts`: `list[tuple[str, int]]` - path of the font file and the font size
+    '''
+    def __init__(self, cache:AssetCache = asset_cache, max_workers:int = 2) -> None:
+        '''
+        Parameters
+        -----------
+        cache: AssetCache
+            The cache the loaded assets are added to, the shared default cache if not provided
+        max_workers: int
+            Number of worker threads
+        '''
+        self.cache = cache
+        self.max_workers = max_workers
+        self._executor:ThreadPoolExecutor|None = None
+        self._pending:dict[tuple, Future] = {}
+
+    def _submit(self, key:tuple, function, *args):
+        '''Internal method to run a loader on the thread pool'''
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="asset_prefetch")
+        self._pending[key] = self._executor.submit(function, *args)
+
+    def prefetch(self, manifest:dict[str, list]):
+        '''Start loading all assets of the manifest that are neither cached nor loading'''
+        for path, size in manifest.get("images", []):
+            key = ("image", path, None if size is None else tuple(size))
+            if key in self._pending or self.cache.has_image(path, size):
+                continue
+            self._submit(key, _load_image_file, path, key[2], self.cache.disk_cache)
+        for path, size in manifest.get("fonts", []):
+            key = ("font", path)
+            if key in self._pending or self.cache.has_font(path) or self.cache.has_font(path, size):
+                continue
+            self._submit(key, _read_font_file, path)
+
+    def collect(self):
+        '''Move finished assets into the cache, must be called from the main thread.
+        Assets that failed to load are dropped, loading them again on the main thread raises the error'''
+        for key in [key for key, future in self._pending.items() if future.done()]:
+            future = self._pending.pop(key)
+            if future.exception() is not None:
+                continue
+            if key[0] == "image":
+                self.cache.put_image(key[1], future.result(), key[2])
+            else:
+                self.cache.put_font_file(key[1], future.result())
+
+    def _get_futures(self, manifest:dict[str, list]) -> list[Future]:
+        '''Internal method to get the pending loads of a manifest'''
+        keys = [("image", path, None if size is None else tuple(size)) for path, size in manifest.get("images", [])]
+        keys += [("font", path) for path, _ in manifest.get("fonts", [])]
+        return [self._pending[key] for key in keys if key in self._pending]
+
+    def is_ready(self, manifest:dict[str, list]) -> bool:
+        '''If none of the assets of the manifest are still loading'''
+        return not self._get_futures(manifest)
+
+    def wait(self, manifest:dict[str, list], timeout:float|None = None):
+        '''Block until the assets of the manifest are loaded, then collect them'''
+        futures = self._get_futures(manifest)
+        if futures:
+            wait(futures, timeout)
+        self.collect()
+
+    def shutdown(self):
+        '''Stop the worker threads, pending loads are cancelled'''
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._pending.clear()
@@ -0,0 +1,212 @@
+import json
+import os
+from collections import deque
+from time import perf_counter
+
+import numpy as np
+import pygame
+
+class FrameProfiler:
+    '''Times the phases of the scenes and transitions run by a SceneManager
+
+    Methods
+    ----------
+    time:
+        Call a function and record how long it took
+    record:
+        Record a duration measured elsewhere
+    get_stats:
+        Return the count, mean, p50, p95, p99 and max of every timed phase in milliseconds
+    draw_overlay:
+        Draw the slowest phases onto the screen, when the overlay is shown
+    export_json, export_chrome_trace:
+        Write the statistics or the recorded timeline to a file
+
+    Usage
+    ----------
+    Pass a FrameProfiler to SceneManager(profiler=...) (or set scene_manager.profiler), the SceneManager then times
+    Scene.handle_event(), Scene.update() and Scene.draw() of every scene, keyed by scene key,
+    and Transition.update() and Transition.draw(), keyed by object_id (the class name if it has none).\n
+    Timings are kept in a ring buffer of the last `capacity` samples per phase, so percentiles cover a rolling window.\n
+    A disabled profiler (enabled = False) is falsy, the SceneManager then skips all timing. Without a profiler
+    the only cost is one check per call.\n
+    The overlay is toggled with toggle_key (F3 by default) and refreshed every refresh_frames frames.
+    Trace events for export_chrome_trace() are only recorded if trace is True, the file opens in chrome://tracing or Perfetto.
+    '''
+    def __init__(self, capacity:int = 600, trace:bool = False, trace_capacity:int = 100000, toggle_key:int|None = pygame.K_F3, show_overlay:bool = False, refresh_frames:int = 30) -> None:
+        '''
+        Parameters
+        -----------
+        capacity: int
+            Number of recent samples kept per phase for the percentiles
+        trace: bool
+            If every timed call is also kept as a trace event for export_chrome_trace()
+        trace_capacity: int
+            Maximum number of trace events kept, the oldest are dropped first
+        toggle_key: int|None
+            Key that shows and hides the overlay, None to only toggle it from code
+        show_overlay: bool
+            If the overlay is shown from the start
+        refresh_frames: int
+            Frames between updates of the overlay text
+        '''
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.enabled = True
+        self.capacity = capacity
+        self.trace = trace
+        self.toggle_key = toggle_key
+        self.show_overlay = show_overlay
+        self.refresh_frames = refresh_frames
+
+        #Ring buffers of durations in ms: key -> [samples, next index, count]
+        self._samples:dict[str, list] = {}
+        self._trace_events:deque[tuple[str, float, float]] = deque(maxlen=trace_capacity)
+        self._origin = perf_counter()
+
+        self._overlay:pygame.Surface|None = None
+        self._overlay_frames = 0
+        self._font:pygame.font.Font|None = None
+
+    def __bool__(self) -> bool:
+        return self.enabled
+
+    @staticmethod
+    def get_key(category:str, name:str, phase:str) -> str:
+        '''Return the key of a phase, e.g. scene:start.update'''
+        return f"{category}:{name}.{phase}"
+
+    def time(self, category:str, name:str, phase:str, function, *args):
+        '''Call function(*args), record its duration and return its result
+
+        Parameters
+        -----------
+        category: str
+            Kind of the timed object, e.g. scene or transition
+        name: str
+            Identifier of the timed object, e.g. the scene key
+        phase: str
+            Name of the timed method, e.g. update'''
+        start = perf_counter()
+        result = function(*args)
+        self.record(self.get_key(category, name, phase), start, perf_counter())
+        return result
+
+    def record(self, key:str, start:float, end:float):
+        '''Record a duration between two perf_counter() readings under key'''
+        entry = self._samples.get(key)
+        if entry is None:
+            entry = self._samples[key] = [np.zeros(self.capacity), 0, 0]
+        samples, index, count = entry
+        samples[index] = (end - start) * 1000
+        entry[1] = (index + 1) % self.capacity
+        if count < self.capacity:
+            entry[2] = count + 1
+        if self.trace:
+            self._trace_events.append((key, start, end))
+
+    def reset(self):
+        '''Drop every recorded sample and trace event'''
+        self._samples.clear()
+        self._trace_events.clear()
+        self._overlay = None
+
+    def get_stats(self) -> dict[str, dict[str, float]]:
+        '''Return {key: {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}} over the samples in the ring buffers'''
+        stats = {}
+        for key, (samples, _, count) in self._samples.items():
+            if not count:
+                continue
+            window = samples[:count]
+            p50, p95, p99 = np.percentile(window, (50, 95, 99))
+            stats[key] = {
+                "count": count,
+                "mean_ms": float(window.mean()),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+                "max_ms": float(window.max())
+            }
+        return stats
+
+    def handle_event(self, event:pygame.Event) -> bool:
+        '''Toggle the overlay on toggle_key, returns True if the overlay was toggled'''
+        if event.type == pygame.KEYDOWN and self.toggle_key is not None and event.key == self.toggle_key:
+            self.toggle_overlay()
+            return True
+        return False
+
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+        self._overlay = None
+
+    def _render_overlay(self, lines:int) -> pygame.Surface:
+        '''Internal method to render the overlay text of the slowest phases by p95'''
+        if self._font is None:
+            self._font = pygame.font.Font(None, 18)
+        stats = sorted(self.get_stats().items(), key=lambda item: item[1]["p95_ms"], reverse=True)[:lines]
+        rows = [("phase", "p50", "p95", "p99")]
+        rows += [(key, f"{value['p50_ms']:.2f}", f"{value['p95_ms']:.2f}", f"{value['p99_ms']:.2f}") for key, value in stats]
+        #The default font is not monospaced, so every column is rendered and aligned separately
+        rendered = [[self._font.render(text, True, (230, 230, 230)) for text in row] for row in rows]
+        key_width = max(row[0].get_width() for row in rendered) + 12
+        column_width = max(text.get_width() for row in rendered for text in row[1:]) + 12
+        line_size = self._font.get_linesize()
+        overlay = pygame.Surface((key_width + column_width * 3 + 8, len(rendered) * line_size + 8))
+        #Opaque, so blitting it again every frame over an unchanged screen gives the same pixels
+        overlay.fill((20, 20, 20))
+        for i, row in enumerate(rendered):
+            y = 4 + i * line_size
+            overlay.blit(row[0], (4, y))
+            for j, text in enumerate(row[1:]):
+                #Numbers are right aligned
+                overlay.blit(text, (4 + key_width + column_width * (j + 1) - text.get_width(), y))
+        return overlay
+
+    def draw_overlay(self, screen:pygame.Surface, position:tuple[int, int] = (0, 0), lines:int = 10) -> pygame.Rect|None:
+        '''Draw the p50/p95/p99 of the slowest phases onto screen if the overlay is shown, returns the drawn area
+
+        Parameters
+        -----------
+        screen: Surface
+            The Surface drawn onto
+        position: tuple[int, int]
+            Top left corner of the overlay
+        lines: int
+            Number of phases listed'''
+        if not self.show_overlay:
+            return None
+        self._overlay_frames += 1
+        if self._overlay is None or self._overlay_frames >= self.refresh_frames:
+            self._overlay = self._render_overlay(lines)
+            self._overlay_frames = 0
+        return screen.blit(self._overlay, position)
+
+    def export_json(self, path:str):
+        '''Write the statistics of get_stats() to a JSON file'''
+        with open(path, "w") as file:
+            json.dump({"capacity": self.capacity, "stats": self.get_stats()}, file, indent=2, sort_keys=True)
+
+    def get_chrome_trace(self) -> dict:
+        '''Return the recorded trace events in the Chrome trace event format'''
+        pid = os.getpid()
+        events = []
+        for key, start, end in self._trace_events:
+            category = key.split(":", 1)[0]
+            events.append({
+                "name": key,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self._origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": pid,
+                "tid": 0
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path:str):
+        '''Write the recorded trace events to a Chrome trace JSON file, requires trace to be True'''
+        if not self.trace:
+            raise ValueError("FrameProfiler was created without trace, no trace events are recorded")
+        with open(path, "w") as file:
+            json.dump(self.get_chrome_trace(), file)
@@ -0,0 +1,182 @@
+from itertools import compress
+
+import numpy as np
+import pygame
+
+from .animation import Animation, MultiAnimation
+from .entities import EntityStore
+from .effect import Effect
+
+class RenderBatch:
+    '''Collects sprites during a draw and blits them in one call per layer
+
+    Methods
+    ----------
+    submit:
+        Add a Surface at a position on a layer, skipped if it is outside the view
+    submit_animation:
+        Add the current frame of an Animation or MultiAnimation
+    submit_animations:
+        Add the current frames of many animations, culled in one vectorised pass
+    submit_many:
+        Add one Surface at many positions, culled in one vectorised pass
+    submit_entities:
+        Add the sprites of the alive entities of an EntityStore
+    submit_effect:
+        Add the particles of an Effect
+    flush:
+        Blit everything submitted onto a Surface, lowest layer first, and empty the batch
+
+    Usage
+    ----------
+    Submit sprites in Scene.draw() and call flush(screen) at its end.\n
+    Within a layer sprites are grouped by Surface, the order of overlapping sprites on the same layer is not kept,
+    put sprites that must overlap in a fixed order on different layers.
+    '''
+    def __init__(self, view:pygame.Rect|tuple|None = None, sort_textures:bool = True) -> None:
+        '''
+        Parameters
+        -----------
+        view: `RectValue`|None
+            Sprites not overlapping the view are culled on submission, None for no culling
+        sort_textures: bool
+            If the sprites of a layer are grouped by Surface before blitting
+        '''
+        self.view = None if view is None else pygame.Rect(view)
+        self.sort_textures = sort_textures
+        self._layers:dict[int, list[tuple[pygame.Surface, tuple[int, int]]]] = {}
+
+        self.submitted = 0
+        self.culled = 0
+        #Counts of the last flush
+        self.last_stats = {"drawn": 0, "culled": 0}
+
+    def set_view(self, view:pygame.Rect|tuple|None):
+        self.view = None if view is None else pygame.Rect(view)
+
+    def _get_layer(self, layer:int) -> list[tuple[pygame.Surface, tuple[int, int]]]:
+        blits = self._layers.get(layer)
+        if blits is None:
+            blits = self._layers[layer] = []
+        return blits
+
+    def submit(self, surface:pygame.Surface, position:tuple[int, int], layer:int = 0) -> bool:
+        '''Add a Surface with its top left corner at position, returns False if it was culled
+
+        Parameters
+        -----------
+        surface: Surface
+            The Surface to blit
+        position: tuple[int, int]
+            Top left corner of the Surface
+        layer: int
+            Layers are drawn from the lowest'''
+        view = self.view
+        if view is not None:
+            x, y = position
+            width, height = surface.get_size()
+            if x >= view.right or y >= view.bottom or x + width <= view.left or y + height <= view.top:
+                self.culled += 1
+                return False
+        self._get_layer(layer).append((surface, position))
+        self.submitted += 1
+        return True
+
+    def submit_animation(self, animation:Animation|MultiAnimation, position:tuple[int, int], layer:int = 0) -> bool:
+        '''Add the current frame of an animation, returns False if it was culled or has no frame'''
+        frame = animation.get_frame()
+        if frame is None:
+            return False
+        return self.submit(frame, position, layer)
+
+    def submit_animations(self, animations:list[Animation|MultiAnimation], positions:np.ndarray, layer:int = 0):
+        '''Add the current frames of many animations at the top left corners of an (N, 2) array of positions, culled in one vectorised pass'''
+        frames = [animation.get_frame() for animation in animations]
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+        if None in frames:
+            #Animations without a frame are skipped, like in submit_animation()
+            has_frame = [frame is not None for frame in frames]
+            frames = list(compress(frames, has_frame))
+            positions = positions[has_frame]
+        if self.view is not None and frames:
+            #Culled with the size of the largest frame, so no sprite in view is dropped
+            unique_frames = set(frames)
+            size = (max(frame.get_width() for frame in unique_frames), max(frame.get_height() for frame in unique_frames))
+            visible = self._cull(positions, np.broadcast_to(size, positions.shape))
+            frames = list(compress(frames, visible.tolist()))
+            positions = positions[visible]
+        self._get_layer(layer).extend(zip(frames, positions.tolist()))
+        self.submitted += len(frames)
+
+    def _cull(self, top_left:np.ndarray, sizes:np.ndarray) -> np.ndarray:
+        '''Internal method to get the mask of the rects inside the view'''
+        view = self.view
+        visible = (
+            (top_left[:, 0] < view.right) & (top_left[:, 1] < view.bottom) &
+            (top_left[:, 0] + sizes[:, 0] > view.left) & (top_left[:, 1] + sizes[:, 1] > view.top)
+        )
+        self.culled += int(len(visible) - np.count_nonzero(visible))
+        return visible
+
+    def submit_many(self, surface:pygame.Surface, positions:np.ndarray, layer:int = 0):
+        '''Add a Surface at every top left corner of an (N, 2) array of positions'''
+        positions = np.asarray(positions).astype(np.int64).reshape(-1, 2)
+        if self.view is not None:
+            positions = positions[self._cull(positions, np.broadcast_to(surface.get_size(), positions.shape))]
+        self._get_layer(layer).extend((surface, position) for position in positions.tolist())
+        self.submitted += len(positions)
+
+    def submit_entities(self, store:EntityStore, sprites:list[pygame.Surface], layer:int = 0):
+        '''Add the sprites of the alive entities of an EntityStore, centred on their positions
+
+        Parameters
+        -----------
+        store: EntityStore
+            The entities to draw
+        sprites: list[Surface]
+            The Surfaces the sprite indices of the entities refer to
+        layer: int
+            Layers are drawn from the lowest'''
+        sprite_indices, top_left, sizes = store.get_sprite_rects(sprites)
+        if self.view is not None:
+            visible = self._cull(top_left, sizes)
+            sprite_indices = sprite_indices[visible]
+            top_left = top_left[visible]
+        self._get_layer(layer).extend((sprites[sprite], position) for sprite, position in zip(sprite_indices.tolist(), top_left.tolist()))
+        self.submitted += len(sprite_indices)
+
+    def submit_effect(self, effect:Effect, layer:int = 0, offset:tuple[float, float] = (0, 0)):
+        '''Add the live particles of an Effect, effects with special_flags are not supported as a batch blits without blend flags'''
+        if effect.special_flags:
+            raise ValueError("Effects with special_flags cannot be batched, use Effect.draw()")
+        sprites, top_left = effect.get_blits(offset)
+        if self.view is not None and sprites:
+            #Culled with the size of the largest sprite, so no particle in view is dropped
+            size = (max(sprite.get_width() for sprite in effect._sprites), max(sprite.get_height() for sprite in effect._sprites))
+            visible = self._cull(top_left, np.broadcast_to(size, top_left.shape))
+            sprites = list(compress(sprites, visible.tolist()))
+            top_left = top_left[visible]
+        self._get_layer(layer).extend(zip(sprites, top_left.tolist()))
+        self.submitted += len(sprites)
+
+    def flush(self, screen:pygame.Surface) -> int:
+        '''Blit the submitted sprites onto screen, lowest layer first, and empty the batch. Returns the number of sprites drawn'''
+        drawn = 0
+        for layer in sorted(self._layers):
+            blits = self._layers[layer]
+            if not blits:
+                continue
+            if self.sort_textures:
+                #Consecutive blits of the same Surface are cheaper
+                blits.sort(key=lambda blit: id(blit[0]))
+            screen.fblits(blits)
+            drawn += len(blits)
+        self.last_stats = {"drawn": drawn, "culled": self.culled}
+        self.clear()
+        return drawn
+
+    def clear(self):
+        '''Drop everything submitted'''
+        self._layers.clear()
+        self.submitted = 0
+        self.culled = 0
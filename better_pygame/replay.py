@@ -0,0 +1,260 @@
+import struct
+import time
+from typing import TYPE_CHECKING, BinaryIO, Iterator
+
+import pygame
+
+if TYPE_CHECKING:
+    from .game_loop import GameLoop
+
+#File header: magic, format version, GameLoop.update_rate
+_HEADER = struct.Struct("<4sHI")
+_MAGIC = b"BPIR"
+_VERSION = 1
+#Frame: frame time, number of events, mouse position
+_FRAME = struct.Struct("<dHii")
+#Event: type, number of attributes
+_EVENT = struct.Struct("<IB")
+
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+_LENGTH = struct.Struct("<H")
+
+def _encode_value(value, out:bytearray) -> bool:
+    '''Append a tagged event attribute value to out, returns False if the type is not supported'''
+    if value is None:
+        out += b"n"
+    elif value is True or value is False:
+        out += b"T" if value else b"F"
+    elif isinstance(value, int):
+        out += b"i"
+        out += _INT.pack(value)
+    elif isinstance(value, float):
+        out += b"f"
+        out += _FLOAT.pack(value)
+    elif isinstance(value, str):
+        encoded = value.encode("utf-8")
+        out += b"s"
+        out += _LENGTH.pack(len(encoded))
+        out += encoded
+    elif isinstance(value, (tuple, list)):
+        start = len(out)
+        out += b"t"
+        out += _LENGTH.pack(len(value))
+        for item in value:
+            if not _encode_value(item, out):
+                del out[start:]
+                return False
+    else:
+        return False
+    return True
+
+def _decode_value(data:bytes, offset:int):
+    '''Read a tagged value at offset, returns the value and the offset after it'''
+    tag = data[offset:offset + 1]
+    offset += 1
+    if tag == b"n":
+        return None, offset
+    if tag == b"T":
+        return True, offset
+    if tag == b"F":
+        return False, offset
+    if tag == b"i":
+        return _INT.unpack_from(data, offset)[0], offset + _INT.size
+    if tag == b"f":
+        return _FLOAT.unpack_from(data, offset)[0], offset + _FLOAT.size
+    if tag == b"s":
+        length = _LENGTH.unpack_from(data, offset)[0]
+        offset += _LENGTH.size
+        return data[offset:offset + length].decode("utf-8"), offset + length
+    if tag == b"t":
+        length = _LENGTH.unpack_from(data, offset)[0]
+        offset += _LENGTH.size
+        items = []
+        for _ in range(length):
+            item, offset = _decode_value(data, offset)
+            items.append(item)
+        return tuple(items), offset
+    raise ValueError(f"Invalid value tag {tag!r} in input log")
+
+
+class InputRecorder:
+    '''Records the input events and frame times of a GameLoop to a compact binary log
+
+    Methods
+    ----------
+    record_event:
+        Add an event handled in the current frame
+    end_frame:
+        Write the current frame with its frame time
+    close:
+        Flush and close the log
+
+    Usage
+    ----------
+    Pass the recorder to GameLoop(recorder=...), it records every frame of GameLoop.run() until it is closed.\n
+    Only pygame's own events (types below pygame.USEREVENT) are recorded, custom events such as ON_TRANSITION_END,
+    ON_SECTION_START or pygame_gui events follow from the input and are generated again when the log is replayed.
+    The mouse position is recorded once per frame, as pygame_gui reads it with pygame.mouse.get_pos().
+    Event attributes that are not None, bool, int, float, str or tuples of them are left out.
+    '''
+    def __init__(self, path:str, update_rate:int = 60) -> None:
+        '''
+        Parameters
+        -----------
+        path: str
+            The file the log is written to
+        update_rate: int
+            Updates per second of the recorded GameLoop, set by GameLoop when the recorder is passed to it
+        '''
+        self.path = path
+        self.update_rate = update_rate
+        self.frames = 0
+        self._file:BinaryIO|None = None
+        self._events = bytearray()
+        self._event_count = 0
+
+    def _open(self):
+        '''Internal method to create the log and write its header'''
+        self._file = open(self.path, "wb")
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, self.update_rate))
+
+    def record_event(self, event:pygame.Event):
+        '''Add an event handled in the current frame, custom events are ignored'''
+        if event.type >= pygame.USEREVENT:
+            return
+        attributes = bytearray()
+        count = 0
+        for name, value in event.dict.items():
+            encoded_name = name.encode("ascii")
+            start = len(attributes)
+            attributes.append(len(encoded_name))
+            attributes += encoded_name
+            if _encode_value(value, attributes):
+                count += 1
+            else:
+                del attributes[start:]
+        self._events += _EVENT.pack(event.type, count)
+        self._events += attributes
+        self._event_count += 1
+
+    def end_frame(self, frame_time:float):
+        '''Write the events added since the last frame with the frame time passed to GameLoop.advance()'''
+        if self._file is None:
+            self._open()
+        x, y = pygame.mouse.get_pos()
+        self._file.write(_FRAME.pack(frame_time, self._event_count, x, y))
+        self._file.write(self._events)
+        self._events.clear()
+        self._event_count = 0
+        self.frames += 1
+
+    def close(self):
+        '''Flush and close the log, events of an unfinished frame are dropped'''
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._events.clear()
+        self._event_count = 0
+
+
+class InputReplayer:
+    '''Feeds a log written by InputRecorder back through a GameLoop
+
+    Methods
+    ----------
+    get_frames:
+        Iterate the recorded frames
+    run:
+        Replay the log through a GameLoop, as fast as possible or at the recorded pace
+
+    Usage
+    ----------
+    Build the same scenes as the recorded session, then call replayer.run(GameLoop(scene_manager, headless=True)).
+    With a FrameProfiler on the SceneManager this gives a repeatable load test of a real session.\n
+    Custom events are not in the log, they are taken from the pygame event queue every frame and handled before the recorded
+    events of the frame, the same order they have in a live session. Real input in the queue is dropped during the replay.
+    '''
+    def __init__(self, path:str) -> None:
+        '''
+        Parameters
+        -----------
+        path: str
+            The log written by InputRecorder
+        '''
+        self.path = path
+        with open(path, "rb") as file:
+            self._data = file.read()
+        if len(self._data) < _HEADER.size:
+            raise ValueError(f"{path} is not an input log")
+        magic, version, self.update_rate = _HEADER.unpack_from(self._data, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not an input log")
+        if version != _VERSION:
+            raise ValueError(f"Input log version {version} is not supported")
+
+    def get_frames(self) -> Iterator[tuple[float, tuple[int, int], list[pygame.Event]]]:
+        '''Iterate the recorded frames as (frame time, mouse position, events)'''
+        data = self._data
+        offset = _HEADER.size
+        while offset < len(data):
+            frame_time, event_count, x, y = _FRAME.unpack_from(data, offset)
+            offset += _FRAME.size
+            events = []
+            for _ in range(event_count):
+                event_type, attribute_count = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                attributes = {}
+                for _ in range(attribute_count):
+                    name_length = data[offset]
+                    name = data[offset + 1:offset + 1 + name_length].decode("ascii")
+                    attributes[name], offset = _decode_value(data, offset + 1 + name_length)
+                events.append(pygame.Event(event_type, attributes))
+            yield frame_time, (x, y), events
+
+    def run(self, game_loop:"GameLoop", realtime:bool = False, draw:bool = False) -> int:
+        '''Replay the log through game_loop, returns the number of frames replayed
+
+        Parameters
+        -----------
+        game_loop: GameLoop
+            The loop of the scenes to replay, its update_rate must match the recording
+        realtime: bool
+            If frames are replayed at the recorded pace instead of as fast as possible
+        draw: bool
+            If the frames are drawn, requires the GameLoop to have a screen'''
+        if game_loop.update_rate != self.update_rate:
+            raise ValueError(f"Input log was recorded at update_rate {self.update_rate}, GameLoop runs at {game_loop.update_rate}")
+        if draw and game_loop.screen is None:
+            raise ValueError("Drawing a replay requires a GameLoop with a screen")
+        scene_manager = game_loop.scene_manager
+        headless = game_loop.headless
+        game_loop.headless = not draw
+        game_loop.running = True
+        mouse_position = None
+        frames = 0
+        next_frame = time.perf_counter()
+        try:
+            for frame_time, position, events in self.get_frames():
+                if position != mouse_position:
+                    #Moving the mouse queues a MOUSEMOTION, dropped below with the other real input
+                    pygame.mouse.set_pos(position)
+                    mouse_position = position
+                for event in pygame.event.get():
+                    if event.type >= pygame.USEREVENT:
+                        scene_manager.handle_event(event)
+                for event in events:
+                    scene_manager.handle_event(event)
+                if realtime:
+                    next_frame += frame_time
+                    delay = next_frame - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                game_loop.advance(frame_time)
+                frames += 1
+                if not game_loop.running:
+                    break
+        finally:
+            game_loop.headless = headless
+            game_loop.running = False
+        return frames
@@ -1,9 +1,16 @@
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import partial
+from typing import Callable
 
 import pygame
 
 from ._constants import ON_TRANSITION_END
 from .transition import Transition
+from .surfaces import SurfacePool
+from .prefetch import AssetPrefetcher
+from .assets import asset_cache
+from .profiler import FrameProfiler
 
 class Scene(ABC):
     '''Abstract base class for Scene
@@ -16,6 +23,39 @@ class Scene(ABC):
         Called to update the elements inside the Scene with time delta since last call
     draw:
         Called to draw the elements of the Scene onto the screen
+    mark_dirty:
+        Report a region of the Scene that changed, used when uses_dirty_rects is True
+    on_load:
+        Called by the SceneManager after the Scene is built
+    on_unload:
+        Called by the SceneManager before the Scene is dropped to free memory
+    
+    Dirty rectangles
+    -----------------
+    Set the class attribute `uses_dirty_rects = True` and call mark_dirty() whenever something visible changes.\n
+    A SceneManager created with dirty_rects=True then only redraws (clipped) and updates the changed regions,
+    an idle Scene costs nothing to draw.
+    
+    Asset prefetch
+    ----------------
+    Override the classmethod get_asset_manifest() to list the images and fonts the Scene loads through the asset cache,
+    and set `next_scenes` to the keys of the scenes likely to be opened from it.
+    A SceneManager created with prefetch=True loads those assets on a thread pool ahead of time.
+    
+    Loading and unloading
+    ----------------------
+    A SceneManager can be given a factory (e.g. the Scene class or a functools.partial of it) instead of a Scene,
+    the Scene is then only built when it is first opened, and dropped again (on_unload()) when the SceneManager is over its memory budget.
+    get_memory_usage() estimates the memory held by the Scene, by default the images of its asset manifest.
+    
+    Scene stack
+    -------------
+    SceneManager.push_scene() opens a Scene over the current one (e.g. a pause menu or a HUD), pop_scene() closes it again.
+    Class attributes declare how a Scene on the stack treats the scenes below it:\n
+    `opaque` - the Scene covers the whole screen, the scenes below are not drawn once its enter transition has finished\n
+    `pauses_below` - the scenes below are not updated, they are drawn from a snapshot of their last frame\n
+    `passes_input` - events the Scene handles are passed onto the Scene below as well\n
+    An opaque Scene that does not pause lets the scenes below keep updating without drawing them.
     
     Use Example
     --------------
@@ -25,6 +65,18 @@ class Scene(ABC):
         def handle_event(self, event):
             if event.type == '''
     
+    _transition_require_update:bool = False
+    
+    next_scenes:list[str] = []
+    
+    uses_dirty_rects:bool = False
+    _dirty_full:bool = True
+    
+    opaque:bool = True
+    pauses_below:bool = True
+    passes_input:bool = False
+    _dirty_rects:list[pygame.Rect]|tuple = ()
+    
     def __init__(self, scene_manager) -> None:
         self.scene_manager = scene_manager
     @abstractmethod
@@ -36,6 +88,29 @@ class Scene(ABC):
     @abstractmethod
     def draw(self, screen:pygame.Surface):...
     
+    @classmethod
+    def get_asset_manifest(cls, screen_size:tuple[int, int]) -> dict[str, list]:
+        '''Return the assets used by the Scene, see AssetPrefetcher for the format of the manifest
+        
+        Parameters
+        -----------
+        screen_size: tuple[int, int]
+            Screen size of the SceneManager, for images scaled to the screen'''
+        return {"images": [], "fonts": []}
+    
+    def on_load(self):
+        '''Called by the SceneManager after the Scene is built, before it is first updated or drawn'''
+    
+    def on_unload(self):
+        '''Called by the SceneManager before the Scene is dropped, by default evicts the images of the asset manifest from the asset cache'''
+        for path, size in self.get_asset_manifest(self.scene_manager.screen_size).get("images", []):
+            asset_cache.evict(path, size)
+    
+    def get_memory_usage(self) -> int:
+        '''Return the estimated number of bytes held by the Scene, used for the memory budget of the SceneManager.
+        By default the pixel data of the images in the asset manifest, images without a size are not counted'''
+        return sum(int(size[0]) * int(size[1]) * 4 for _, size in self.get_asset_manifest(self.scene_manager.screen_size).get("images", []) if size is not None)
+    
     def set_enter_transition(self, transition):
         self._enter_transition = transition
     
@@ -43,30 +118,71 @@ class Scene(ABC):
         self._exit_transition = transition
     
     def set_transition_require_update(self, transition_require_update:bool):
+        '''Set if the Scene is updated during its transitions, scenes that are not updated are drawn once and the snapshot is reused by the transition'''
         self._transition_require_update = transition_require_update
+    
+    def mark_dirty(self, rect:pygame.Rect|tuple|None = None):
+        '''Report a changed region of the Scene
+        
+        Parameters
+        -----------
+        rect: `Rect`|`tuple`|`None`
+            The changed region in screen coordinates, None for the whole Scene'''
+        if rect is None:
+            self._dirty_full = True
+            return
+        if not self._dirty_rects:
+            self._dirty_rects = []
+        self._dirty_rects.append(pygame.Rect(rect))
+    
+    def get_dirty_rects(self) -> list[pygame.Rect]|None:
+        '''Return and clear the regions changed since the last call, None if the whole Scene has to be redrawn.
+        Always None when uses_dirty_rects is False'''
+        if not self.uses_dirty_rects or self._dirty_full:
+            self._dirty_full = False
+            self._dirty_rects = ()
+            return None
+        rects = self._dirty_rects
+        self._dirty_rects = ()
+        return list(rects)
 
 class SceneManager:
     '''Manager of Scenes
     
     '''
-    def __init__(self, screen_size:tuple[int, int], scenes:dict[str, Scene], default_scene:str|None = None, handle_event_during_transition:bool = False) -> None:
+    def __init__(self, screen_size:tuple[int, int], scenes:dict[str, Scene|Callable[[], Scene]], default_scene:str|None = None, handle_event_during_transition:bool = False, dirty_rects:bool = False, prefetch:bool = False, memory_budget:int|None = None, profiler:FrameProfiler|None = None) -> None:
         '''
         Initialize Scene Manager, scene_manager will be automatically added to the provided scenes as an attribute (scene._scene_manager)
         Parameters
         -----------
         screen_size: tuple[int, int]
             Defaulted screen size
-        scenes: dict[str, Scene]
-            Pass in all the scenes and their key as string as identifier
+        scenes: dict[str, Scene|Callable[[], Scene]]
+            Pass in all the scenes and their key as string as identifier, 
+            a factory that takes no arguments can be passed instead of a Scene to build the Scene when it is first opened
         default_scene: str
             key of the first scene that is selected, if not provided, the first scene provided will be the default
         handle_event_during_transition: bool
             If the scene manager will pass events onto the current scene if a transition is currently running
+        dirty_rects: bool
+            If draw() only redraws the regions reported by Scene.mark_dirty(), full redraws are still done during transitions
+        prefetch: bool
+            If the assets of the next likely scenes (Scene.next_scenes) are loaded on a thread pool in the background
+        memory_budget: int|None
+            Bytes of memory (see Scene.get_memory_usage()) the loaded scenes may hold, 
+            least recently opened scenes built from factories are unloaded when over budget, None for no limit
+        profiler: FrameProfiler|None
+            Times the handle_event, update and draw calls of the scenes and transitions, None for no profiling
         '''
         self.screen_size = screen_size
-        self.scenes = scenes
-        for value in self.scenes.values():
-            value.scene_manager = self
+        self.scenes:dict[str, Scene] = {}
+        self.scene_factories:dict[str, Callable[[], Scene]] = {}
+        self.memory_budget = memory_budget
+        self._scene_memory:OrderedDict[str, int] = OrderedDict()
+        #Created before the default scene is built, get_scene() uses it
+        self.prefetcher = AssetPrefetcher() if prefetch else None
+        for key, scene in scenes.items():
+            self._register_scene(key, scene)
         if not default_scene:
             keys = list(scenes.keys())
             if len(keys) > 0:
@@ -77,40 +193,172 @@ class SceneManager:
             if default_scene not in scenes.keys():
                 raise ValueError(f"Default scene {default_scene} not in scenes")
             self.default_scene = default_scene
+        self.prev_scene:Scene|None = None
+        self.prev_scene_key:str|None = None
         if not self.default_scene:
             self.curr_scene = None
             print("Scene Manager missing default scene.")
         else:
-            self.curr_scene = scenes[self.default_scene]
+            self.curr_scene = self.get_scene(self.default_scene)
+        self.curr_scene_key = self.default_scene
+        #Keys of the opened scenes, bottom first, the last is the current scene
+        self.scene_stack:list[str] = [self.default_scene] if self.curr_scene else []
+        self._stack_snapshot:pygame.Surface|None = None
+        self._stack_snapshot_keys:tuple[str, ...] = ()
         
-        self.prev_scene:Scene|None = None
         self.handle_event_during_transition = handle_event_during_transition
         
         self._transitioning:bool = False
         self._running_transitions:list[Transition] = []
+        
+        self.surface_pool = SurfacePool()
+        
+        self.dirty_rects = dirty_rects
+        self._full_redraw = True
+        
+        #Fraction of an update step passed since the last update, set by GameLoop before drawing
+        self.interpolation_alpha:float = 1.0
+        
+        self._prefetch_next_scenes()
+        
+        self.profiler = profiler
+        self._overlay_rect:pygame.Rect|None = None
     
-    def add_scene(self, key:str, scene:Scene):
-        """Add a scene to the manager"""
-        if key in self.scenes.keys():
+    def add_scene(self, key:str, scene:Scene|Callable[[], Scene]):
+        """Add a scene, or a factory building the scene when it is first opened, to the manager"""
+        if self.has_scene(key):
             raise KeyError(f"Scene with key {key} already exists")
+        self._register_scene(key, scene)
+    
+    def _register_scene(self, key:str, scene:Scene|Callable[[], Scene]):
+        '''Internal method to add a scene or a scene factory'''
+        if isinstance(scene, Scene):
+            self.scenes[key] = scene
+            self._on_scene_loaded(key, scene)
+        else:
+            self.scene_factories[key] = scene
+    
+    def _on_scene_loaded(self, key:str, scene:Scene):
+        '''Internal method to set up a built scene'''
         scene.scene_manager = self
-        self.scenes[key] = scene
+        scene.on_load()
+        self._scene_memory[key] = scene.get_memory_usage()
+    
+    def has_scene(self, key:str) -> bool:
+        '''If a scene or a scene factory is added under key'''
+        return key in self.scenes or key in self.scene_factories
+    
+    def is_loaded(self, key:str) -> bool:
+        '''If the scene of key is built'''
+        return key in self.scenes
+    
+    def get_scene(self, key:str) -> Scene:
+        '''Return the scene of key, building it with its factory if it is not loaded'''
+        scene = self.scenes.get(key)
+        if scene is None:
+            if key not in self.scene_factories:
+                raise KeyError(f"Scene {key} not in scenes")
+            if self.prefetcher is not None:
+                #Finish the loads started by prefetch_scene(), so the factory gets its images from the cache instead of decoding them again
+                self.prefetcher.wait(self.get_asset_manifest(key))
+            scene = self.scene_factories[key]()
+            self.scenes[key] = scene
+            self._on_scene_loaded(key, scene)
+        self._scene_memory.move_to_end(key)
+        return scene
+    
+    def unload_scene(self, key:str):
+        '''Drop a loaded scene built from a factory, it is built again when it is next opened.
+        
+        Scenes that are added as Scene instances and scenes in use (see _is_scene_in_use()) are never unloaded'''
+        scene = self.scenes.get(key)
+        if scene is None or key not in self.scene_factories:
+            return
+        if self._is_scene_in_use(key, scene):
+            raise ValueError(f"Scene {key} is in use and cannot be unloaded")
+        scene.on_unload()
+        del self.scenes[key]
+        del self._scene_memory[key]
+    
+    def _is_scene_in_use(self, key:str, scene:Scene) -> bool:
+        '''Internal method to check if a scene is the current or previous scene, on the scene stack or drawn by a running transition'''
+        return (scene is self.curr_scene or scene is self.prev_scene or key in self.scene_stack
+                or scene in self.get_transitioning_scenes())
+    
+    def get_memory_usage(self) -> int:
+        '''Return the estimated bytes held by the loaded scenes'''
+        return sum(self._scene_memory.values())
+    
+    def _enforce_memory_budget(self):
+        '''Internal method to unload the least recently opened scenes until the loaded scenes fit in the memory budget'''
+        if self.memory_budget is None:
+            return
+        usage = self.get_memory_usage()
+        for key in list(self._scene_memory):
+            if usage <= self.memory_budget:
+                break
+            scene = self.scenes[key]
+            if key not in self.scene_factories or self._is_scene_in_use(key, scene):
+                continue
+            usage -= self._scene_memory[key]
+            self.unload_scene(key)
+    
+    def _get_scene_class(self, key:str) -> type[Scene]|None:
+        '''Internal method to get the class of a scene without building it, None if it cannot be resolved from the factory'''
+        if key in self.scenes:
+            return type(self.scenes[key])
+        factory = self.scene_factories[key]
+        while isinstance(factory, partial):
+            factory = factory.func
+        if isinstance(factory, type) and issubclass(factory, Scene):
+            return factory
+        return None
+    
+    def get_asset_manifest(self, scene_key:str) -> dict[str, list]:
+        '''Return the asset manifest of a scene, empty if the scene is not loaded and its class cannot be resolved from its factory'''
+        scene_class = self._get_scene_class(scene_key)
+        if scene_class is None:
+            return {"images": [], "fonts": []}
+        return scene_class.get_asset_manifest(self.screen_size)
+    
+    def prefetch_scene(self, scene_key:str):
+        '''Start loading the assets of a scene in the background, does nothing if prefetch is disabled'''
+        if self.prefetcher is None:
+            return
+        self.prefetcher.prefetch(self.get_asset_manifest(scene_key))
+    
+    def _prefetch_next_scenes(self):
+        '''Internal method to prefetch the scenes likely to be opened from the current scene'''
+        if self.prefetcher is None or not self.curr_scene:
+            return
+        for scene_key in self.curr_scene.next_scenes:
+            if self.has_scene(scene_key):
+                self.prefetch_scene(scene_key)
+    
+    def shutdown(self):
+        '''Stop the background prefetch threads'''
+        if self.prefetcher is not None:
+            self.prefetcher.shutdown()
     
     def start_transition(self, transition:Transition, scene:Scene):
-        transition.start(scene, self.screen_size)
+        transition.start(scene, self.screen_size, self.surface_pool)
         self._transitioning = True
         self._running_transitions.append(transition)
     
     def change_scene(self, scene_key:str):
-        '''Change to another scene, runs exit and enter transitions
+        '''Change to another scene, runs exit and enter transitions. With scenes pushed on the stack only the top scene is replaced
         
         Parameters
         -----------
         scene_key: str
             The key of the scene to switch to'''
-        if scene_key not in self.scenes.keys():
+        if not self.has_scene(scene_key):
             raise ValueError(f"Scene {scene_key} not in scenes")
+        if scene_key in self.scene_stack[:-1]:
+            raise ValueError(f"Scene {scene_key} is already on the scene stack")
+        self.prefetch_scene(scene_key)
         self.prev_scene = self.curr_scene
+        self.prev_scene_key = self.curr_scene_key
         if self.prev_scene:
             try:
                 exit_transition:Transition = self.prev_scene.__getattribute__("_exit_transition")
@@ -119,13 +367,150 @@ class SceneManager:
             else:
                 self.start_transition(exit_transition, self.prev_scene)
         
-        self.curr_scene = self.scenes[scene_key]
+        self.curr_scene = self.get_scene(scene_key)
+        self.curr_scene_key = scene_key
+        if self.scene_stack:
+            self.scene_stack[-1] = scene_key
+        else:
+            self.scene_stack.append(scene_key)
+        self._on_stack_changed()
+    
+    def _on_stack_changed(self):
+        '''Internal method to start the enter transition of the new current scene after the scene stack changed'''
+        self._release_stack_snapshot()
+        self._enforce_memory_budget()
+        self._full_redraw = True
         try:
             enter_transition:Transition = self.curr_scene.__getattribute__("_enter_transition")
         except:
             pass
         else:
             self.start_transition(enter_transition, self.curr_scene)
+        self._prefetch_next_scenes()
+    
+    def push_scene(self, scene_key:str):
+        '''Open a scene over the current scene, runs the enter transition of the pushed scene.
+        See Scene stack in Scene for how the scenes below are drawn and updated
+        
+        Parameters
+        -----------
+        scene_key: str
+            The key of the scene to open'''
+        if not self.has_scene(scene_key):
+            raise ValueError(f"Scene {scene_key} not in scenes")
+        if scene_key in self.scene_stack:
+            raise ValueError(f"Scene {scene_key} is already on the scene stack")
+        self.prefetch_scene(scene_key)
+        #The scene below stays open, it is drawn as part of the stack instead of as the previous scene
+        self.prev_scene = None
+        self.prev_scene_key = None
+        self.curr_scene = self.get_scene(scene_key)
+        self.curr_scene_key = scene_key
+        self.scene_stack.append(scene_key)
+        self._on_stack_changed()
+    
+    def pop_scene(self) -> str:
+        '''Close the current scene and return to the scene below it, runs the exit transition of the closed scene.
+        Returns the key of the closed scene'''
+        if len(self.scene_stack) < 2:
+            raise ValueError("No scene pushed on the scene stack")
+        scene_key = self.scene_stack.pop()
+        self.prev_scene = self.curr_scene
+        self.prev_scene_key = scene_key
+        try:
+            exit_transition:Transition = self.prev_scene.__getattribute__("_exit_transition")
+        except:
+            pass
+        else:
+            self.start_transition(exit_transition, self.prev_scene)
+        self.curr_scene_key = self.scene_stack[-1]
+        self.curr_scene = self.get_scene(self.curr_scene_key)
+        self._release_stack_snapshot()
+        self._full_redraw = True
+        self._prefetch_next_scenes()
+        return scene_key
+    
+    def _get_visible_index(self, top:int|None = None) -> int:
+        '''Internal method to get the stack index of the lowest drawn scene, the topmost opaque scene at or below top (the current scene by default)'''
+        stack = self.scene_stack
+        if top is None:
+            top = len(stack) - 1
+        for index in range(top, 0, -1):
+            if self.scenes[stack[index]].opaque:
+                return index
+        return 0
+    
+    def _get_paused_index(self) -> int:
+        '''Internal method to get the stack index below which scenes are paused, the topmost scene that pauses below'''
+        stack = self.scene_stack
+        for index in range(len(stack) - 1, 0, -1):
+            if self.scenes[stack[index]].pauses_below:
+                return index
+        return 0
+    
+    def _release_stack_snapshot(self):
+        '''Internal method to drop the snapshot of the paused scenes'''
+        if self._stack_snapshot is not None:
+            self.surface_pool.give_back(self._stack_snapshot)
+            self._stack_snapshot = None
+            self._stack_snapshot_keys = ()
+    
+    def _get_stack_snapshot(self, start:int, end:int) -> pygame.Surface:
+        '''Internal method to get the snapshot of the paused scenes stack[start:end], drawn once when they are first paused'''
+        keys = tuple(self.scene_stack[start:end])
+        if self._stack_snapshot is None or self._stack_snapshot_keys != keys:
+            self._release_stack_snapshot()
+            snapshot = self.surface_pool.borrow(self.screen_size, 0)
+            snapshot.fill((0,0,0))
+            for key in keys:
+                self._draw_scene(snapshot, self.scenes[key], key)
+            self._stack_snapshot = snapshot
+            self._stack_snapshot_keys = keys
+        return self._stack_snapshot
+    
+    def _draw_below(self, screen:pygame.Surface):
+        '''Internal method to draw the visible scenes below the current scene, paused scenes from their snapshot'''
+        top = len(self.scene_stack) - 1
+        if top < 1:
+            return
+        if self._transitioning and self.curr_scene in self.get_transitioning_scenes():
+            #The pushed scene does not cover the scenes below while its enter transition is running
+            visible = self._get_visible_index(top - 1)
+        else:
+            visible = self._get_visible_index()
+        if visible == top:
+            return
+        paused = self._get_paused_index()
+        if visible < paused:
+            screen.blit(self._get_stack_snapshot(visible, paused), (0, 0))
+        for index in range(max(visible, paused), top):
+            key = self.scene_stack[index]
+            self._draw_scene(screen, self.scenes[key], key)
+    
+    def _get_dirty_rects_below(self, rects:list[pygame.Rect]) -> list[pygame.Rect]|None:
+        '''Internal method to add the changed regions of the visible, running scenes below the current scene to rects,
+        None if one of them has to be redrawn fully'''
+        top = len(self.scene_stack) - 1
+        for index in range(max(self._get_visible_index(), self._get_paused_index()), top):
+            scene_rects = self.scenes[self.scene_stack[index]].get_dirty_rects()
+            if scene_rects is None:
+                return None
+            rects = rects + scene_rects
+        return rects
+    
+    def _handle_event_below(self, event:pygame.Event):
+        '''Internal method to pass an event onto the running scenes below the current scene, while they pass input'''
+        profiler = self.profiler
+        stack = self.scene_stack
+        for index in range(len(stack) - 2, self._get_paused_index() - 1, -1):
+            key = stack[index]
+            scene = self.scenes[key]
+            if profiler:
+                profiler.time("scene", key, "handle_event", scene.handle_event, event)
+            else:
+                scene.handle_event(event)
+            if not scene.passes_input:
+                break
     
     
     def handle_event(self, event:pygame.Event):
@@ -135,11 +520,21 @@ class SceneManager:
                 if len(self._running_transitions) == 0:
                     self._transitioning = False
         
+        profiler = self.profiler
+        if profiler:
+            profiler.handle_event(event)
+        
         if not self.curr_scene:
             return
         if self._transitioning and not self.handle_event_during_transition:
             return
-        self.curr_scene.handle_event(event)
+        scene = self.curr_scene
+        if profiler:
+            profiler.time("scene", self.curr_scene_key, "handle_event", scene.handle_event, event)
+        else:
+            scene.handle_event(event)
+        if scene.passes_input and len(self.scene_stack) > 1:
+            self._handle_event_below(event)
     
     def _transition_get_priority(self, transition:Transition):
         if transition == self.curr_scene:
@@ -155,14 +550,39 @@ class SceneManager:
     def get_transitioning_scenes(self):
         return [t.scene for t in self._running_transitions if t.scene]
     
+    def _get_scene_key(self, scene:Scene) -> str:
+        '''Internal method to find the key of a scene for the profiler'''
+        if scene is self.curr_scene:
+            return self.curr_scene_key
+        if scene is self.prev_scene:
+            return self.prev_scene_key
+        for key, loaded_scene in self.scenes.items():
+            if loaded_scene is scene:
+                return key
+        return type(scene).__name__
+    
+    @staticmethod
+    def _get_transition_name(transition:Transition) -> str:
+        '''Internal method to get the name of a transition for the profiler'''
+        return transition.object_id or type(transition).__name__
+    
     def update(self, dt:float):
+        if self.prefetcher is not None:
+            self.prefetcher.collect()
         if not self.curr_scene:
             return
+        profiler = self.profiler
         curr_scene_transitioning = False
         prev_scene_transitioning = False
         if self._transitioning:
             for transition in self._running_transitions:
-                transition.update(dt)
+                if self.prefetcher is not None and transition.scene is self.curr_scene and transition.elapsed + dt >= transition.duration:
+                    #The enter transition does not complete before the assets of the scene are ready
+                    self.prefetcher.wait(self.get_asset_manifest(self.curr_scene_key))
+                if profiler:
+                    profiler.time("transition", self._get_transition_name(transition), "update", transition.update, dt)
+                else:
+                    transition.update(dt)
                 scene = transition.scene
                 if not scene:
                     continue
@@ -172,41 +592,108 @@ class SceneManager:
                     pass
                 else:
                     if require_update:
-                        scene.update(dt)
+                        if profiler:
+                            profiler.time("scene", self._get_scene_key(scene), "update", scene.update, dt)
+                        else:
+                            scene.update(dt)
                 if self.curr_scene == scene:
                     curr_scene_transitioning = True
                 elif self.prev_scene == scene:
                     prev_scene_transitioning = True
         
         if not prev_scene_transitioning and self.prev_scene:
-            self.prev_scene.update(dt)
+            if profiler:
+                profiler.time("scene", self.prev_scene_key, "update", self.prev_scene.update, dt)
+            else:
+                self.prev_scene.update(dt)
         if not curr_scene_transitioning:
-            self.curr_scene.update(dt)
+            if profiler:
+                profiler.time("scene", self.curr_scene_key, "update", self.curr_scene.update, dt)
+            else:
+                self.curr_scene.update(dt)
+        
+        stack = self.scene_stack
+        if len(stack) > 1:
+            #Scenes below the topmost scene that pauses below are not updated, occluded scenes are still updated
+            for index in range(self._get_paused_index(), len(stack) - 1):
+                key = stack[index]
+                if profiler:
+                    profiler.time("scene", key, "update", self.scenes[key].update, dt)
+                else:
+                    self.scenes[key].update(dt)
     
-    def draw(self, screen:pygame.Surface):
-        screen.fill((0,0,0))
+    def draw(self, screen:pygame.Surface) -> list[pygame.Rect]:
+        '''Draw the scenes and running transitions onto the screen
+        
+        Returns the list of changed screen regions, to be passed onto pygame.display.update()'''
+        profiler = self.profiler
+        if not profiler:
+            return self._draw(screen)
+        rects = self._draw(screen)
+        overlay_rect = profiler.draw_overlay(screen)
+        if overlay_rect != self._overlay_rect:
+            #The overlay changed size, redraw the area it left on the next frame
+            self._full_redraw = True
+            self._overlay_rect = overlay_rect
+        if overlay_rect is not None:
+            rects.append(overlay_rect)
+        return rects
+    
+    def _draw_scene(self, screen:pygame.Surface, scene:Scene, scene_key:str|None):
+        '''Internal method to draw a scene, timed by the profiler'''
+        profiler = self.profiler
+        if profiler:
+            profiler.time("scene", scene_key, "draw", scene.draw, screen)
+        else:
+            scene.draw(screen)
+    
+    def _draw(self, screen:pygame.Surface) -> list[pygame.Rect]:
+        '''Internal method to draw the scenes and running transitions, returns the changed screen regions'''
         if not self.curr_scene:
-            return
+            screen.fill((0,0,0))
+            return [screen.get_rect()]
+        
+        if self.dirty_rects and not self._transitioning and not self._full_redraw:
+            rects = self.curr_scene.get_dirty_rects()
+            if rects is not None and len(self.scene_stack) > 1:
+                rects = self._get_dirty_rects_below(rects)
+            if rects is not None:
+                return self._draw_dirty(screen, rects)
+        else:
+            #Clear changes reported before the full redraw
+            self.curr_scene.get_dirty_rects()
         
+        #Keep redrawing fully until the first frame after the transitions end
+        self._full_redraw = self._transitioning
+        screen.fill((0,0,0))
+        self._draw_below(screen)
         if self._transitioning:
             transitioning_scenes = self.get_transitioning_scenes()
             if self.prev_scene and self.prev_scene not in transitioning_scenes:
-                self.prev_scene.draw(screen)
+                self._draw_scene(screen, self.prev_scene, self.prev_scene_key)
             if self.curr_scene not in transitioning_scenes:
-                self.curr_scene.draw(screen)
-                
+                self._draw_scene(screen, self.curr_scene, self.curr_scene_key)
+            
+            profiler = self.profiler
             for transition in self._running_transitions:
-                transition.draw(screen)
-            return
-        self.curr_scene.draw(screen)
-        
-       
-
-    
+                if profiler:
+                    profiler.time("transition", self._get_transition_name(transition), "draw", transition.draw, screen)
+                else:
+                    transition.draw(screen)
+            return [screen.get_rect()]
+        self._draw_scene(screen, self.curr_scene, self.curr_scene_key)
+        return [screen.get_rect()]
     
-
-
-
-
-
-
+    def _draw_dirty(self, screen:pygame.Surface, rects:list[pygame.Rect]) -> list[pygame.Rect]:
+        '''Internal method to redraw only the union of the changed regions of the current scene'''
+        if not rects:
+            return []
+        area = rects[0].unionall(rects[1:]).clip(screen.get_rect())
+        if area.width <= 0 or area.height <= 0:
+            return []
+        screen.set_clip(area)
+        screen.fill((0,0,0))
+        self._draw_below(screen)
+        self._draw_scene(screen, self.curr_scene, self.curr_scene_key)
+        screen.set_clip(None)
+        return [area]
@@ -0,0 +1,204 @@
+from collections import OrderedDict
+from typing import Hashable
+
+import pygame
+
+class SurfacePool:
+    '''Pool of reusable render target Surfaces, keyed by size and flags
+
+    Methods
+    ----------
+    borrow:
+        Get a Surface of a specific size and flags from the pool, a new one is created if none are free
+    give_back:
+        Return a borrowed Surface to the pool so it can be reused
+    borrow_area:
+        Get a Surface of a specific size, cut out of a bigger pooled Surface when possible
+
+    Usage
+    ----------
+    Borrowed Surfaces are not cleared by the pool, fill them before drawing if needed.\n
+    Every borrowed Surface should be given back once it is no longer used (usually at the end of the frame).
+    '''
+    def __init__(self, max_free_per_key:int = 4) -> None:
+        '''
+        Parameters
+        -----------
+        max_free_per_key: int
+            Maximum number of free Surfaces kept for each (size, flags) key, extra Surfaces given back are dropped
+        '''
+        self.max_free_per_key = max_free_per_key
+        self._free:dict[tuple[tuple[int, int], int], list[pygame.Surface]] = {}
+        self._areas:dict[pygame.Surface, pygame.Surface] = {}
+
+        self.allocations = 0
+        self.borrows = 0
+
+    @staticmethod
+    def _get_key(size:tuple[int|float, int|float], flags:int):
+        return (max(int(size[0]), 0), max(int(size[1]), 0)), flags & pygame.SRCALPHA
+
+    def borrow(self, size:tuple[int|float, int|float], flags:int = pygame.SRCALPHA) -> pygame.Surface:
+        '''Borrow a Surface from the pool
+
+        Parameters
+        -----------
+        size: tuple[int|float, int|float]
+            Size of the Surface, floats are truncated
+        flags: int
+            Surface flags, default SRCALPHA'''
+        key = SurfacePool._get_key(size, flags)
+        self.borrows += 1
+        free = self._free.get(key)
+        if free:
+            return free.pop()
+        self.allocations += 1
+        return pygame.Surface(key[0], key[1])
+
+    def borrow_area(self, size:tuple[int|float, int|float], container_size:tuple[int, int], flags:int = pygame.SRCALPHA) -> pygame.Surface:
+        '''Borrow a Surface of size, as a subsurface of a pooled Surface of container_size if it fits inside
+
+        Used for Surfaces whose size changes every frame (e.g. a shrinking transition) so that no new pixel buffer is allocated.
+
+        Parameters
+        -----------
+        size: tuple[int|float, int|float]
+            Size of the Surface, floats are truncated
+        container_size: tuple[int, int]
+            Size of the pooled Surface the area is cut out of
+        flags: int
+            Surface flags, default SRCALPHA'''
+        key = SurfacePool._get_key(size, flags)
+        if key[0][0] > container_size[0] or key[0][1] > container_size[1]:
+            return self.borrow(size, flags)
+        container = self.borrow(container_size, flags)
+        if key[0] == container.get_size():
+            return container
+        area = container.subsurface((0, 0), key[0])
+        self._areas[area] = container
+        return area
+
+    def give_back(self, surface:pygame.Surface):
+        '''Give a borrowed Surface back to the pool'''
+        container = self._areas.pop(surface, None)
+        if container is not None:
+            surface = container
+        key = SurfacePool._get_key(surface.get_size(), surface.get_flags())
+        free = self._free.setdefault(key, [])
+        if len(free) < self.max_free_per_key:
+            free.append(surface)
+
+    def clear(self):
+        '''Drop all free Surfaces in the pool'''
+        self._free.clear()
+
+    def get_stats(self):
+        '''Return a dict of pool statistics, `allocations` is the number of Surfaces created by the pool'''
+        return {
+            "allocations": self.allocations,
+            "borrows": self.borrows,
+            "free": sum(len(free) for free in self._free.values())
+        }
+
+
+class SurfaceCache:
+    '''Least recently used cache of Surfaces, bounded by the total size of their pixel data
+
+    Methods
+    ----------
+    get:
+        Get a cached Surface, marking it as recently used
+    put:
+        Add a Surface to the cache, evicting the least recently used Surfaces if over budget
+    pin:
+        Keep the Surface of a key from being evicted
+    '''
+    def __init__(self, max_bytes:int) -> None:
+        '''
+        Parameters
+        -----------
+        max_bytes: int
+            Maximum total bytes of pixel data held by the cache
+        '''
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries:OrderedDict[Hashable, pygame.Surface] = OrderedDict()
+        self._pinned:set[Hashable] = set()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_surface_bytes(surface:pygame.Surface):
+        '''Return the number of bytes of pixel data of a Surface'''
+        width, height = surface.get_size()
+        return width * height * surface.get_bytesize()
+
+    def __contains__(self, key:Hashable):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key:Hashable) -> pygame.Surface|None:
+        '''Return the Surface cached under key, None if missing'''
+        surface = self._entries.get(key)
+        if surface is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return surface
+
+    def put(self, key:Hashable, surface:pygame.Surface, evict:bool = True) -> bool:
+        '''Cache a Surface under key, returns if the Surface was cached
+
+        Parameters
+        -----------
+        key: Hashable
+            Key of the Surface
+        surface: Surface
+            The Surface to cache
+        evict: bool
+            If least recently used Surfaces are dropped to make space, if False the Surface is only cached when it fits'''
+        size = SurfaceCache.get_surface_bytes(surface)
+        #The existing entry of key is only replaced once the new Surface is known to fit
+        old = self._entries.get(key)
+        old_size = 0 if old is None else SurfaceCache.get_surface_bytes(old)
+        if self.bytes - old_size + size > self.max_bytes:
+            if not evict:
+                return False
+            pinned_bytes = sum(SurfaceCache.get_surface_bytes(self._entries[pinned]) for pinned in self._pinned if pinned in self._entries and pinned != key)
+            if pinned_bytes + size > self.max_bytes:
+                return False
+        self.remove(key)
+        if self.bytes + size > self.max_bytes:
+            for evicted_key in [entry_key for entry_key in self._entries if entry_key not in self._pinned]:
+                if self.bytes + size <= self.max_bytes:
+                    break
+                self.remove(evicted_key)
+        self._entries[key] = surface
+        self.bytes += size
+        return True
+
+    def pin(self, key:Hashable):
+        '''Keep the Surface cached under key from being evicted, the key can be pinned before it is cached'''
+        self._pinned.add(key)
+
+    def unpin(self, key:Hashable):
+        '''Allow the Surface cached under key to be evicted again'''
+        self._pinned.discard(key)
+
+    def is_pinned(self, key:Hashable):
+        return key in self._pinned
+
+    def remove(self, key:Hashable):
+        '''Remove the Surface cached under key if it exists'''
+        surface = self._entries.pop(key, None)
+        if surface is not None:
+            self.bytes -= SurfaceCache.get_surface_bytes(surface)
+
+    def clear(self):
+        '''Remove all cached Surfaces'''
+        self._entries.clear()
+        self.bytes = 0
@@ -0,0 +1,157 @@
+import pygame
+
+from .assets import AssetCache, asset_cache
+from .surfaces import SurfaceCache
+
+class FontRegistry:
+    '''Named font faces, with one shared Font for each face and size
+
+    Methods
+    ----------
+    register:
+        Add a font face by name
+    get:
+        Get the shared Font of a face at a size
+    '''
+    def __init__(self, cache:AssetCache = asset_cache) -> None:
+        '''
+        Parameters
+        -----------
+        cache: AssetCache
+            The cache holding the Fonts, the shared default cache if not provided
+        '''
+        self.cache = cache
+        self.paths:dict[str, str] = {}
+
+    def register(self, name:str, path:str):
+        '''Add a font face
+
+        Parameters
+        -----------
+        name: str
+            Name of the face, e.g. "bold"
+        path: str
+            Path of the font file'''
+        self.paths[name] = path
+
+    def get(self, name:str, size:int) -> pygame.font.Font:
+        '''Get the shared Font of a registered face at a size'''
+        if name not in self.paths:
+            raise KeyError(f"Font {name} is not registered")
+        return self.cache.get_font(self.paths[name], size)
+
+    def get_manifest(self, fonts:list[tuple[str, int]]) -> dict[str, list]:
+        '''Return an asset manifest (see AssetPrefetcher) of a list of (face name, size)'''
+        return {"images": [], "fonts": [(self.paths[name], size) for name, size in fonts]}
+
+
+class TextCache:
+    '''Least recently used cache of rendered text Surfaces
+
+    Methods
+    ----------
+    render:
+        Render text with a Font, returning the cached Surface if the same text was rendered before
+
+    Usage
+    ----------
+    The returned Surfaces are shared, copy them before drawing onto them.
+    '''
+    def __init__(self, max_bytes:int = 16 * 1024 * 1024) -> None:
+        '''
+        Parameters
+        -----------
+        max_bytes: int
+            Maximum total bytes of rendered text kept
+        '''
+        self.surfaces = SurfaceCache(max_bytes)
+
+    def render(self, font:pygame.font.Font, text:str, antialias:bool, color, background = None) -> pygame.Surface:
+        '''Return the Surface of text rendered with font, see pygame.font.Font.render()'''
+        key = (font, text, antialias, tuple(pygame.Color(color)), None if background is None else tuple(pygame.Color(background)))
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = font.render(text, antialias, color, background)
+            self.surfaces.put(key, surface)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+class GlyphAtlas:
+    '''Pre-rendered characters of one Font and colour, for text that changes often such as scores and timers
+
+    Methods
+    ----------
+    draw:
+        Draw text onto a Surface by blitting the pre-rendered characters
+    get_size:
+        Return the size of text drawn by the atlas
+
+    Usage
+    ----------
+    Characters are placed by their own advance, kerning between characters is not applied.\n
+    Characters missing from the atlas are added the first time they are drawn.
+    '''
+    def __init__(self, font:pygame.font.Font, color, antialias:bool = True, characters:str = "0123456789:.-+%/ ") -> None:
+        '''
+        Parameters
+        -----------
+        font: Font
+            The Font the characters are rendered with
+        color: `ColorValue`
+            Colour of the characters
+        antialias: bool
+            If the characters are antialiased
+        characters: str
+            Characters rendered into the atlas in advance
+        '''
+        self.font = font
+        self.color = color
+        self.antialias = antialias
+        self.height = font.get_height()
+        self.atlas = pygame.Surface((0, self.height), pygame.SRCALPHA)
+        self.glyphs:dict[str, pygame.Rect] = {}
+        self.add_characters(characters)
+
+    def add_characters(self, characters:str):
+        '''Render characters into the atlas, the atlas is rebuilt once for all new characters'''
+        new_characters = [character for character in dict.fromkeys(characters) if character not in self.glyphs]
+        if not new_characters:
+            return
+        rendered = [self.font.render(character, self.antialias, self.color) for character in new_characters]
+        x = self.atlas.get_width()
+        atlas = pygame.Surface((x + sum(glyph.get_width() for glyph in rendered), self.height), pygame.SRCALPHA)
+        atlas.blit(self.atlas, (0, 0))
+        for character, glyph in zip(new_characters, rendered):
+            atlas.blit(glyph, (x, 0))
+            self.glyphs[character] = pygame.Rect(x, 0, glyph.get_width(), self.height)
+            x += glyph.get_width()
+        self.atlas = atlas
+
+    def get_size(self, text:str) -> tuple[int, int]:
+        '''Return the size of text drawn by the atlas'''
+        self.add_characters(text)
+        return sum(self.glyphs[character].width for character in text), self.height
+
+    def draw(self, surface:pygame.Surface, text:str, position:tuple[int, int]) -> pygame.Rect:
+        '''Draw text onto surface with its top left corner at position, returns the drawn area
+
+        Parameters
+        -----------
+        surface: Surface
+            The Surface drawn onto
+        text: str
+            The text to draw
+        position: tuple[int, int]
+            Top left corner of the text'''
+        self.add_characters(text)
+        x, y = position
+        blits = []
+        for character in text:
+            area = self.glyphs[character]
+            blits.append((self.atlas, (x, y), area))
+            x += area.width
+        surface.blits(blits, doreturn=False)
+        return pygame.Rect(position, (x - position[0], self.height))
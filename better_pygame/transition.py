@@ -1,10 +1,30 @@
-from typing import Literal, Sequence
+from bisect import bisect_right
+from typing import Literal, NamedTuple, Sequence
 
 import pygame
 
 from ._constants import ON_TRANSITION_END
 from .utils import *
 from .section import Section
+from .surfaces import SurfacePool, SurfaceCache
+from .coordinates import Vec2
+
+class Keyframe(NamedTuple):
+    '''A compiled section of a Transition, with all omitted values resolved.
+    A size of None stands for the scene size, which is only known when the transition starts'''
+    start_time:float
+    duration:float
+    start_position:tuple[float, float]
+    end_position:tuple[float, float]
+    start_size:tuple[float, float]|None
+    end_size:tuple[float, float]|None
+    start_angle:float
+    end_angle:float
+    start_transparency:float
+    end_transparency:float
+    rotation_origin:tuple[int, int]|None
+    section:dict|Section
+
 
 class Transition:
     '''Base of all scene transitions
@@ -16,16 +36,32 @@ class Transition:
     If Scene is animated, Scene.update() should be called every loop such that the animation will still run during transition.\n
     Do be aware that the Scene's objects coordinates are not moved along with the transition, Scene.handle_event() should not be called while transition is running.\n
     
+    Timeline
+    ----------
+    The sections are compiled into a table of keyframes when the transition is created.
+    The state of the transition is evaluated from the elapsed time, so seek() can jump to any time without replaying the frames in between.
+    
+    Rotation cache
+    ----------------
+    Rotating a full screen Surface is expensive, enable_rotation_cache() quantises the angle of rotating sections to a fixed step
+    and reuses the scaled and rotated snapshots (only for scenes drawn once, see the snapshot parameter).\n
+    prebake() renders all quantised frames ahead of time, e.g. during a loading screen.
+    
     Events
     ----------
     on transition end - type: ON_TRANSITION_END, element: Transition, object_id:str|None
     '''
-    def __init__(self, sections:Sequence[dict|Section] = [], object_id:str|None = None) -> None:
+    def __init__(self, sections:Sequence[dict|Section] = [], object_id:str|None = None, snapshot:bool = True) -> None:
         '''
         Parameters
         ------------
         sections: list[dict|Section]
             A list of different sections at different durations of the transition
+        object_id: str|None
+            The id of the object, for handling events
+        snapshot: bool
+            If the scene is drawn only once when the transition starts, used when the scene does not require update during transition.
+            The snapshot is dropped automatically if the scene opts back into updates (Scene.set_transition_require_update)
         
         sections dict
         --------------
@@ -36,7 +72,7 @@ class Transition:
         `start_size`: `tuple[int|float, int|float]` - size of the scene at the start of the section\n
         `end_size`: `tuple[int|float, int|float]` - size of the scene at the end of the section\n
         `start_angle`: `int|float` - angle of rotation of the scene at the start of the section\n
-        `end_angle`: `int|float` - angle of rotation of the scene at the end of the section, 
+        `end_angle`: `int|float` - angle of rotation of the scene at the end of the section,
             bigger than start for clockwise, smaller than start for anti-clockwise\n
         `rotation_origin`: `tuple[int, int]` - x, y coordinates of the origin of rotation, default is center\n
         `start_transparency`: `int|float` - transparency of the scene at the start of the section, 0-255\n
@@ -45,23 +81,85 @@ class Transition:
         Angles can be bigger than 360, for example, start_angle=0 end_engle=720 gives you 2 clockwise rotations.
         '''
         self.sections = sections
+        self.keyframes = Transition.compile_sections(sections)
+        self._start_times = [keyframe.start_time for keyframe in self.keyframes]
+        self.duration = self.keyframes[-1].start_time + self.keyframes[-1].duration if self.keyframes else 0
+        
         self.curr_section_index = 0
         self.scene = None
+        self.surface_pool:SurfacePool|None = None
+        self.elapsed = 0
         self.timer = 0
         self._running = False
         
-        self._curr_position = (0, 0)
-        self._curr_position_change_rate = None
-        self._curr_size_change_rate = None
+        #Updated in place every frame
+        self._curr_position = Vec2()
+        self._curr_size = Vec2()
+        self._blit_position = Vec2()
         self._curr_angle = 0
-        self._curr_angle_change_rate = None
         self._curr_transparency = 255
-        self._curr_transparency_change_rate = None
+        self._draw_paths:list[Literal["offset", "fade", "transform"]] = []
+        self._draw_path:Literal["offset", "fade", "transform"] = "transform"
+        
+        self.snapshot = snapshot
+        self._snapshot_surf:pygame.Surface|None = None
+        
+        self.rotation_cache_step = 2.0
+        self._rotation_cache:SurfaceCache|None = None
+        self._prebaked_scene = None
         
         self.object_id = object_id
-
-
-    def start(self, scene, scene_size:tuple[int, int]):
+    
+    @staticmethod
+    def _get_section_value(section:dict|Section, key:str):
+        '''Internal method to get a value of a section, None if not set'''
+        if isinstance(section, Section):
+            return section.__getattribute__(key)
+        return section.get(key)
+    
+    @staticmethod
+    def compile_sections(sections:Sequence[dict|Section]) -> list[Keyframe]:
+        '''Resolve omitted values of the sections and compile them into a list of Keyframes with cumulative start times'''
+        keyframes:list[Keyframe] = []
+        start_time = 0
+        position, size, angle, transparency = (0, 0), None, 0, 255
+        for index, section in enumerate(sections):
+            duration = Transition._get_section_value(section, "duration")
+            if duration is None:
+                raise ValueError(f"Duration missing from Transition section, index-{index}")
+            
+            start_position = Transition._get_section_value(section, "start_position")
+            start_position = position if start_position is None else start_position
+            end_position = Transition._get_section_value(section, "end_position")
+            end_position = start_position if end_position is None else end_position
+            
+            start_size = Transition._get_section_value(section, "start_size")
+            start_size = size if start_size is None else start_size
+            end_size = Transition._get_section_value(section, "end_size")
+            end_size = start_size if end_size is None else end_size
+            
+            start_angle = Transition._get_section_value(section, "start_angle")
+            start_angle = angle if start_angle is None else start_angle
+            end_angle = Transition._get_section_value(section, "end_angle")
+            end_angle = start_angle if end_angle is None else end_angle
+            
+            start_transparency = Transition._get_section_value(section, "start_transparency")
+            start_transparency = transparency if start_transparency is None else start_transparency
+            end_transparency = Transition._get_section_value(section, "end_transparency")
+            end_transparency = start_transparency if end_transparency is None else end_transparency
+            
+            keyframes.append(Keyframe(start_time, duration,
+                                      start_position, end_position,
+                                      start_size, end_size,
+                                      start_angle, end_angle,
+                                      start_transparency, end_transparency,
+                                      Transition._get_section_value(section, "rotation_origin"),
+                                      section))
+            start_time += duration
+            position, size, angle, transparency = end_position, end_size, end_angle, end_transparency
+        return keyframes
+    
+    def start(self, scene, scene_size:tuple[int, int], surface_pool:SurfacePool|None = None):
         '''Start the transition for a specific scene
         
         Parameters
@@ -69,13 +167,83 @@ class Transition:
         scene: `Scene`
             The scene to be transitioned
         scene_size: `tuple`[`int`, `int`]
-            The intended screen size for the scene'''
+            The intended screen size for the scene
+        surface_pool: `SurfacePool`|`None`
+            Pool to borrow render targets from, usually owned by the SceneManager. A private pool is created if not provided'''
+        if not self.keyframes:
+            raise ValueError("Transition has no sections")
         self.scene = scene
         self.scene_size = scene_size
-        self._curr_size = scene_size
+        if surface_pool is not None:
+            self.surface_pool = surface_pool
+        elif self.surface_pool is None:
+            self.surface_pool = SurfacePool()
+        self._draw_paths = [self._get_draw_path(keyframe) for keyframe in self.keyframes]
         
-        self._on_change_section()
+        self._release_snapshot()
+        if self.snapshot and not self._scene_requires_update():
+            self._snapshot_surf = self._draw_scene()
+        if self._rotation_cache is not None and self._prebaked_scene is not scene:
+            #Frames cached from an earlier run may show an outdated scene
+            self._rotation_cache.clear()
+            self._prebaked_scene = None
+        
+        self.elapsed = 0
+        self.curr_section_index = 0
+        self._evaluate()
         self._running = True
+        self._section_on_start(0)
+    
+    def enable_rotation_cache(self, angle_step:float = 2.0, max_bytes:int = 256 * 1024 * 1024):
+        '''Reuse scaled and rotated snapshots of the scene for rotating sections
+        
+        Parameters
+        ------------
+        angle_step: `float`
+            Angles are quantised to multiples of this step (in degrees) from the section start angle
+        max_bytes: `int`
+            Maximum bytes of pixel data kept by the cache, least recently used frames are dropped first'''
+        if angle_step <= 0:
+            raise ValueError("angle_step must be positive")
+        self.rotation_cache_step = angle_step
+        self._rotation_cache = SurfaceCache(max_bytes)
+        self._prebaked_scene = None
+    
+    def disable_rotation_cache(self):
+        '''Drop the rotation cache and all of its frames'''
+        self._rotation_cache = None
+        self._prebaked_scene = None
+    
+    def prebake(self, scene, scene_size:tuple[int, int]) -> int:
+        '''Render all quantised rotation frames of the transition ahead of time, enables the rotation cache if needed.
+        Frames that do not fit into the cache budget are skipped. Call again if the look of the scene changes.
+        
+        Parameters
+        ------------
+        scene: `Scene`
+            The scene that will be transitioned
+        scene_size: `tuple`[`int`, `int`]
+            The intended screen size for the scene
+        
+        Returns the number of frames cached'''
+        if self._rotation_cache is None:
+            self.enable_rotation_cache()
+        cache = self._rotation_cache
+        cache.clear()
+        
+        snapshot = transparent_surface(scene_size)
+        scene.draw(snapshot)
+        baked = 0
+        for index, keyframe in enumerate(self.keyframes):
+            if keyframe.start_angle == keyframe.end_angle:
+                continue
+            for step in range(self._get_rotation_steps(keyframe) + 1):
+                _, size, angle = self._get_quantised_state(keyframe, step * self._get_rotation_step_time(keyframe), scene_size)
+                if not cache.put((index, step), Transition._scale_rotate(snapshot, size, angle), evict=False):
+                    break
+                baked += 1
+        self._prebaked_scene = scene
+        return baked
     
     def terminate(self):
         '''Terminate the running transition and reset all attributes. Triggers ON_TRANSITION_END event'''
@@ -83,145 +251,261 @@ class Transition:
             return
         self.curr_section_index = 0
         self.scene = None
+        self.elapsed = 0
         self.timer = 0
         self._running = False
+        self._release_snapshot()
         
-        self._curr_position = (0, 0)
-        self._curr_position_change_rate = None
-        self._curr_size_change_rate = None
+        self._curr_position.set(0, 0)
+        self._curr_size.set(*self.scene_size)
         self._curr_angle = 0
-        self._curr_angle_change_rate = None
         self._curr_transparency = 255
-        self._curr_transparency_change_rate = None
         event = pygame.Event(ON_TRANSITION_END, {"element":self, "object_id":self.object_id})
         pygame.event.post(event)
     
     @staticmethod
     def get_change_rate_tup(start_tup:tuple[int|float, int|float], end_tup:tuple[int|float, int|float], duration:int|float):
         return tup_divide(tup_subtract(end_tup, start_tup), (duration, duration))
-
+    
     @staticmethod
     def get_change_rate(start_val:int|float, end_val:int|float, duration:int|float):
         return (end_val - start_val) / duration
     
-    def _set_change_rate(self, curr_section:dict|Section, attribute:Literal["position","size","angle","transparency"], duration):
-        '''Internal set change rate when section changes'''
-        if isinstance(curr_section, Section):
-            start_val = curr_section.__getattribute__("start_"+attribute)
-        else:
-            start_val = curr_section.get("start_"+attribute)
-        if start_val is None:
-            start_val = self.__getattribute__("_curr_"+attribute)
-        else:
-            self.__setattr__("_curr_"+attribute, start_val)
-            
-        if isinstance(curr_section, Section):
-            end_val = curr_section.__getattribute__("end_"+attribute)
-        else:
-            end_val = curr_section.get("end_"+attribute)
-        if end_val is not None:
-            if attribute == "position" or attribute == "size":
-                self.__setattr__("_curr_"+attribute+"_change_rate", Transition.get_change_rate_tup(start_val, end_val, duration))
-            else:
-                self.__setattr__("_curr_"+attribute+"_change_rate", Transition.get_change_rate(start_val, end_val, duration))
-        
+    def _get_draw_path(self, keyframe:Keyframe) -> Literal["offset", "fade", "transform"]:
+        '''Internal method to pick the cheapest draw path that covers what a section animates
         
+        `offset` - only the position changes, the scene is blitted (or drawn directly) at an offset\n
+        `fade` - the transparency changes as well, the scene is blitted with a surface alpha\n
+        `transform` - size or angle changes, the scene goes through scale and rotate'''
+        start_size = keyframe.start_size or self.scene_size
+        end_size = keyframe.end_size or self.scene_size
+        if start_size != self.scene_size or end_size != self.scene_size or keyframe.start_angle % 360 or keyframe.end_angle % 360 or keyframe.start_angle != keyframe.end_angle:
+            return "transform"
+        if keyframe.start_transparency < 255 or keyframe.end_transparency < 255:
+            return "fade"
+        return "offset"
     
+    def _find_section_index(self, time:float) -> int:
+        '''Internal method to binary search the index of the section running at time'''
+        return min(max(bisect_right(self._start_times, time) - 1, 0), len(self.keyframes) - 1)
     
-    def _on_change_section(self):
-        '''Internal method called when section changes'''
-        curr_section = self.sections[self.curr_section_index]
-        
-        if isinstance(curr_section, Section):
-            self.timer:int|float = curr_section.duration
-            duration = curr_section.duration
-            curr_section.on_start()
+    def _evaluate(self):
+        '''Internal method to set the current values from the elapsed time'''
+        keyframe = self.keyframes[self.curr_section_index]
+        section_time = self.elapsed - keyframe.start_time
+        if keyframe.duration <= 0 or section_time >= keyframe.duration:
+            progress = 1
         else:
-            self.timer:int|float = curr_section["duration"]
-            duration = curr_section["duration"]
+            progress = max(section_time, 0) / keyframe.duration
+        self.timer = keyframe.duration - section_time
         
-        if duration is None:
-            raise ValueError(f"Duration missing from Transition section, index-{self.curr_section_index}")
-        
-        #Defaulting current values
-        self._curr_position_change_rate = None
-        self._curr_size_change_rate = None
-        self._curr_angle_change_rate = None
-        self._curr_transparency_change_rate = None
+        self._curr_position.lerp_from(keyframe.start_position, keyframe.end_position, progress)
+        self._curr_size.lerp_from(keyframe.start_size or self.scene_size, keyframe.end_size or self.scene_size, progress)
+        self._curr_angle = lerp(keyframe.start_angle, keyframe.end_angle, progress)
+        self._curr_transparency = lerp(keyframe.start_transparency, keyframe.end_transparency, progress)
+        self._draw_path = self._draw_paths[self.curr_section_index]
+    
+    def _section_on_start(self, index:int):
+        '''Internal method to trigger the start event of a section'''
+        section = self.keyframes[index].section
+        if isinstance(section, Section):
+            section.on_start()
+    
+    def _section_on_end(self, index:int):
+        '''Internal method to trigger the end event of a section'''
+        section = self.keyframes[index].section
+        if isinstance(section, Section):
+            section.on_end()
+    
+    def seek(self, time:float):
+        '''Jump to a time of the running transition, values are evaluated directly without replaying the frames in between.
+        Section events are not triggered, the transition ends on the next update() if time is at or after the end
         
-        # Set change rates for position, size, angle and transparency
-        self._set_change_rate(curr_section, "position", duration)
-        self._set_change_rate(curr_section, "size", duration)
-        self._set_change_rate(curr_section, "angle", duration)
-        self._set_change_rate(curr_section, "transparency", duration)
-    
-    
-    def _update_curr_values(self, time:float):
-        '''Internal method to update current values based on change rates'''
-        if self._curr_position_change_rate:
-            self._curr_position = tup_add(self._curr_position, tup_multiply(self._curr_position_change_rate, (time, time)))
-        if self._curr_size_change_rate:
-            self._curr_size = tup_add(self._curr_size, tup_multiply(self._curr_size_change_rate, (time, time)))
-        if self._curr_angle_change_rate:
-            self._curr_angle += self._curr_angle_change_rate * time
-            if self._curr_angle > 360:
-                self._curr_angle -= 360
-            elif self._curr_angle < 0:
-                self._curr_angle += 360
-        if self._curr_transparency_change_rate:
-            self._curr_transparency += self._curr_transparency_change_rate * time
+        Parameters
+        ------------
+        time: `float`
+            Time since the start of the transition in seconds'''
+        if not self._running:
+            return
+        self.elapsed = min(max(time, 0), self.duration)
+        self.curr_section_index = self._find_section_index(self.elapsed)
+        self._evaluate()
     
     def update(self, dt:float):
         '''Update transition for each frame'''
-        self.timer -= dt
-        if self.timer < 0:
-            section_time = self.timer + dt
-        else:
-            section_time = dt
-        self._update_curr_values(section_time)
-        
-        if self.timer < 0:
-            #When current section ends
-            curr_section = self.sections[self.curr_section_index]
-            if isinstance(curr_section, Section):
-                curr_section.on_end()
+        if not self._running:
+            return
+        self.elapsed += dt
+        index = self._find_section_index(self.elapsed)
+        #Trigger events of every section boundary crossed during this frame
+        while self.curr_section_index < index:
+            self._section_on_end(self.curr_section_index)
             self.curr_section_index += 1
-            if self.curr_section_index >= len(self.sections):
-                #All sections end
-                self._running = False
-                self.scene = None
-                self.curr_section_index -= 1
-                event = pygame.Event(ON_TRANSITION_END, {"element":self, "object_id":self.object_id})
-                pygame.event.post(event)
-                
-            #Change to next section and update with the remaining unused time of the previous section
-            self._on_change_section()
-            self.update(dt - section_time)
+            self._section_on_start(self.curr_section_index)
+        self._evaluate()
+        
+        if self.elapsed >= self.duration:
+            #All sections end
+            self._section_on_end(self.curr_section_index)
+            self._running = False
+            self.scene = None
+            self._release_snapshot()
+            event = pygame.Event(ON_TRANSITION_END, {"element":self, "object_id":self.object_id})
+            pygame.event.post(event)
     
-    def draw(self, screen:pygame.Surface):
-        '''Draw the transitioning scene on the screen'''
-        if not self.scene:
+    def _scene_requires_update(self) -> bool:
+        '''Internal method to check if the scene keeps changing during the transition'''
+        return bool(getattr(self.scene, "_transition_require_update", False))
+    
+    def _draw_scene(self) -> pygame.Surface:
+        '''Internal method to draw the scene onto a borrowed Surface'''
+        scene_surf = self.surface_pool.borrow(self.scene_size)
+        scene_surf.fill((0, 0, 0, 0))
+        self.scene.draw(scene_surf)
+        return scene_surf
+    
+    def _release_snapshot(self):
+        '''Internal method to give the snapshot Surface back to the pool'''
+        if self._snapshot_surf is not None:
+            self.surface_pool.give_back(self._snapshot_surf)
+            self._snapshot_surf = None
+    
+    def _render_scene(self) -> pygame.Surface:
+        '''Internal method to get the Surface of the scene, either the snapshot or a freshly drawn borrowed Surface.
+        Use _release_scene_surf() on the result after use'''
+        if self._snapshot_surf is not None:
+            if not self._scene_requires_update():
+                return self._snapshot_surf
+            #Scene opted back into updates, the snapshot is outdated
+            self._release_snapshot()
+        return self._draw_scene()
+    
+    def _release_scene_surf(self, scene_surf:pygame.Surface):
+        '''Internal method to give back a Surface from _render_scene()'''
+        if scene_surf is not self._snapshot_surf:
+            self.surface_pool.give_back(scene_surf)
+    
+    def _draw_offset(self, screen:pygame.Surface):
+        '''Internal draw path for sections that only move the scene'''
+        #Truncated like Surface.blit() truncates float positions, both branches put the scene on the same pixels
+        x, y = int(self._curr_position[0]), int(self._curr_position[1])
+        if x >= 0 and y >= 0 and (self._snapshot_surf is None or self._scene_requires_update()):
+            #Draw straight onto the screen, the subsurface keeps the scene's own coordinates
+            area = screen.get_rect().clip(pygame.Rect((x, y), self.scene_size))
+            if area.width > 0 and area.height > 0:
+                self.scene.draw(screen.subsurface(area))
             return
-        surf = transparent_surface(self.scene_size)
-        self.scene.draw(surf)
-        surf = pygame.transform.scale(surf, self._curr_size)
-        surf = pygame.transform.rotate(surf, self._curr_angle % 360)
-        
-        curr_section = self.sections[self.curr_section_index]
-        rotation_origin = curr_section.rotation_origin if isinstance(curr_section, Section) else curr_section.get("rotation_origin")
+        scene_surf = self._render_scene()
+        screen.blit(scene_surf, self._curr_position)
+        self._release_scene_surf(scene_surf)
+    
+    def _draw_faded(self, screen:pygame.Surface):
+        '''Internal draw path for sections that move and fade the scene'''
+        scene_surf = self._render_scene()
+        scene_surf.set_alpha(int(self._curr_transparency))
+        screen.blit(scene_surf, self._curr_position)
+        scene_surf.set_alpha(255)
+        self._release_scene_surf(scene_surf)
+    
+    def _get_rotation_step_time(self, keyframe:Keyframe) -> float:
+        '''Internal method to get the time it takes a rotating section to turn by rotation_cache_step'''
+        return self.rotation_cache_step * keyframe.duration / abs(keyframe.end_angle - keyframe.start_angle)
+    
+    def _get_rotation_steps(self, keyframe:Keyframe) -> int:
+        '''Internal method to get the number of quantised steps of a rotating section'''
+        return round(abs(keyframe.end_angle - keyframe.start_angle) / self.rotation_cache_step)
+    
+    def _get_quantised_state(self, keyframe:Keyframe, section_time:float, scene_size:tuple[int, int]):
+        '''Internal method to get (step, size, angle) of a rotating section at section_time, quantised to rotation_cache_step'''
+        step_time = self._get_rotation_step_time(keyframe)
+        step = round(min(max(section_time, 0), keyframe.duration) / step_time)
+        progress = min(step * step_time / keyframe.duration, 1)
+        size = lerp_tup(keyframe.start_size or scene_size, keyframe.end_size or scene_size, progress)
+        return step, (max(size[0], 0), max(size[1], 0)), lerp(keyframe.start_angle, keyframe.end_angle, progress)
+    
+    @staticmethod
+    def _scale_rotate(surface:pygame.Surface, size:tuple[float, float], angle:float) -> pygame.Surface:
+        '''Internal method to get a new scaled and rotated copy of a Surface'''
+        if (int(size[0]), int(size[1])) != surface.get_size():
+            surface = pygame.transform.scale(surface, size)
+        else:
+            surface = surface.copy()
+        angle %= 360
+        if angle:
+            surface = pygame.transform.rotate(surface, angle)
+        return surface
+    
+    def _get_blit_position(self, rotated_size:tuple[int, int], size:"tuple[float, float]|Vec2") -> Vec2:
+        '''Internal method to get the position of the rotated surface, shifted to keep the rotation origin in place'''
+        rotation_origin = self.keyframes[self.curr_section_index].rotation_origin
         if rotation_origin is None:
             #Set rotation origin to center
-            rotation_origin = tup_divide(self._curr_size, (2, 2))
-        origin_to_size_ratio = tup_divide(rotation_origin, self.scene_size)
+            origin_x, origin_y = size[0] / 2, size[1] / 2
+        else:
+            origin_x, origin_y = rotation_origin
+        shift_x = round((rotated_size[0] - size[0]) * origin_x / self.scene_size[0])
+        shift_y = round((rotated_size[1] - size[1]) * origin_y / self.scene_size[1])
+        return self._blit_position.set(self._curr_position.x - shift_x, self._curr_position.y - shift_y)
+    
+    def _draw_cached_rotation(self, screen:pygame.Surface):
+        '''Internal draw path for rotating sections of a snapshot scene, using the rotation cache'''
+        keyframe = self.keyframes[self.curr_section_index]
+        step, size, angle = self._get_quantised_state(keyframe, self.elapsed - keyframe.start_time, self.scene_size)
+        key = (self.curr_section_index, step)
+        rotated_surf = self._rotation_cache.get(key)
+        if rotated_surf is None:
+            rotated_surf = Transition._scale_rotate(self._snapshot_surf, size, angle)
+            self._rotation_cache.put(key, rotated_surf)
         
-        rotated_size = surf.get_size()
-        if rotated_size != self._curr_size:
+        rotated_surf.set_alpha(int(self._curr_transparency))
+        screen.blit(rotated_surf, self._get_blit_position(rotated_surf.get_size(), size))
+        rotated_surf.set_alpha(255)
+    
+    def _draw_transformed(self, screen:pygame.Surface):
+        '''Internal draw path for sections that scale or rotate the scene'''
+        keyframe = self.keyframes[self.curr_section_index]
+        if self._rotation_cache is not None and keyframe.start_angle != keyframe.end_angle and self._snapshot_surf is not None and not self._scene_requires_update():
+            self._draw_cached_rotation(screen)
+            return
+        pool = self.surface_pool
+        scene_surf = self._render_scene()
+        surf = scene_surf
+        
+        if (int(self._curr_size[0]), int(self._curr_size[1])) != scene_surf.get_size():
+            #Scale into a pooled destination instead of allocating a new Surface
+            surf = pool.borrow_area(self._curr_size, self.scene_size)
+            pygame.transform.scale(scene_surf, surf.get_size(), surf)
+        
+        angle = self._curr_angle % 360
+        if angle:
+            #pygame.transform.rotate has no destination argument, the rotated Surface is the only allocation left
+            rotated_surf = pygame.transform.rotate(surf, angle)
+        else:
+            rotated_surf = surf
+        
+        if rotated_surf is not surf:
             # Reposition the surface to keep rotation origin at center
-            position_shift = tup_round(tup_multiply(tup_subtract((rotated_size[0], rotated_size[1]), self._curr_size), origin_to_size_ratio))
+            blit_position = self._get_blit_position(rotated_surf.get_size(), self._curr_size)
+        else:
+            blit_position = self._curr_position
+        rotated_surf.set_alpha(int(self._curr_transparency))
+        screen.blit(rotated_surf, blit_position)
+        rotated_surf.set_alpha(255)
+        
+        if surf is not scene_surf:
+            pool.give_back(surf)
+        self._release_scene_surf(scene_surf)
+    
+    def draw(self, screen:pygame.Surface):
+        '''Draw the transitioning scene on the screen'''
+        if not self.scene or not self.surface_pool:
+            return
+        if self._draw_path == "offset":
+            self._draw_offset(screen)
+        elif self._draw_path == "fade":
+            self._draw_faded(screen)
         else:
-            position_shift = (0,0)
-        surf.set_alpha(int(self._curr_transparency))
-        screen.blit(surf, tup_subtract(self._curr_position, position_shift))
+            self._draw_transformed(screen)
 
 
 
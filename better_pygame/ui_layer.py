@@ -0,0 +1,104 @@
+import pygame
+
+class CachedUILayer:
+    '''A background and the elements of a pygame_gui UIManager composited into one cached Surface
+
+    Methods
+    ----------
+    process_events:
+        Pass an event onto the UIManager
+    update:
+        Update the UIManager, returns if the layer has to be redrawn
+    draw:
+        Draw the layer onto a Surface, redrawing the cached Surface only if the UI changed
+    invalidate:
+        Force the layer to be redrawn
+
+    Usage
+    ----------
+    Use instead of calling the UIManager directly in the handle_event, update and draw methods of a Scene, e.g.\n
+    def update(self, dt):
+        if self.ui_layer.update(dt):
+            self.mark_dirty()\n
+    The layer is redrawn when an event is consumed by the UI, or when an element changed its image, position or visibility
+    (hover, press and animation states of pygame_gui elements set a new image).
+    Elements that draw onto their image in place are not detected, call invalidate() after changing them.
+    '''
+    def __init__(self, ui_manager, size:tuple[int, int], background:pygame.Surface|None = None, background_color = (0, 0, 0)) -> None:
+        '''
+        Parameters
+        -----------
+        ui_manager: `pygame_gui.UIManager`
+            The UIManager drawn onto the layer
+        size: tuple[int, int]
+            Size of the layer
+        background: Surface|None
+            Drawn below the UI, background_color is used if not provided
+        background_color: `ColorValue`
+            Colour of the layer below the UI when there is no background
+        '''
+        self.ui_manager = ui_manager
+        self.size = size
+        self.background = background
+        self.background_color = background_color
+        self.surface = pygame.Surface(size)
+        self._ui_state:list[tuple] = []
+        self._dirty = True
+
+    def set_background(self, background:pygame.Surface|None):
+        self.background = background
+        self._dirty = True
+
+    def invalidate(self):
+        '''Redraw the layer the next time it is drawn'''
+        self._dirty = True
+
+    @property
+    def dirty(self) -> bool:
+        '''If the layer is redrawn the next time it is drawn'''
+        return self._dirty
+
+    def process_events(self, event:pygame.Event) -> bool:
+        '''Pass an event onto the UIManager, returns if the event was consumed by the UI'''
+        consumed = self.ui_manager.process_events(event)
+        if consumed:
+            self._dirty = True
+        return consumed
+
+    def _get_ui_state(self) -> list[tuple]:
+        '''Internal method to get the image, position and visibility of every element'''
+        return [(sprite.image, tuple(sprite.rect), sprite.visible) for sprite in self.ui_manager.get_sprite_group().sprites()]
+
+    def _ui_state_changed(self, ui_state:list[tuple]) -> bool:
+        '''Internal method to compare against the last drawn state, images are compared by identity'''
+        if len(ui_state) != len(self._ui_state):
+            return True
+        for (image, rect, visible), (last_image, last_rect, last_visible) in zip(ui_state, self._ui_state):
+            if image is not last_image or rect != last_rect or visible != last_visible:
+                return True
+        return False
+
+    def update(self, dt:float) -> bool:
+        '''Update the UIManager with time delta since last call, returns if the layer has to be redrawn'''
+        self.ui_manager.update(dt)
+        ui_state = self._get_ui_state()
+        if self._ui_state_changed(ui_state):
+            self._dirty = True
+        #Keeping the images referenced makes sure their ids are not reused
+        self._ui_state = ui_state
+        return self._dirty
+
+    def redraw(self):
+        '''Redraw the cached Surface'''
+        if self.background is not None:
+            self.surface.blit(self.background, (0, 0))
+        else:
+            self.surface.fill(self.background_color)
+        self.ui_manager.draw_ui(self.surface)
+        self._dirty = False
+
+    def draw(self, screen:pygame.Surface, position:tuple[int, int] = (0, 0)):
+        '''Draw the layer onto screen, redrawing the cached Surface first if the UI changed'''
+        if self._dirty:
+            self.redraw()
+        screen.blit(self.surface, position)
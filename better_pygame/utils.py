@@ -19,4 +19,10 @@ def tup_round(tup:tuple[float, float], decimals:int=0):
     return round(tup[0], decimals), round(tup[1], decimals)
 
 def transparent_surface(size:tuple[int|float, int|float]):
-    return pygame.Surface(size, pygame.SRCALPHA)
\ No newline at end of file
+    return pygame.Surface(size, pygame.SRCALPHA)
+
+def lerp(start:int|float, end:int|float, progress:float):
+    return start + (end - start) * progress
+
+def lerp_tup(tup1:tuple[int|float, int|float], tup2:tuple[int|float, int|float], progress:float):
+    return tup1[0] + (tup2[0] - tup1[0]) * progress, tup1[1] + (tup2[1] - tup1[1]) * progress
\ No newline at end of file
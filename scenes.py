@@ -1,15 +1,30 @@
+from functools import partial
+
 import pygame
 import pygame_gui
 
 from better_pygame import *
+from better_pygame import transition
 
 pygame.font.init()
-normal_font = lambda size:pygame.font.Font("fonts/Helvetica-Font/Helvetica.ttf", size)
-bold_font = lambda size:pygame.font.Font("fonts/Helvetica-Font/Helvetica-Bold.ttf", size)
-oblique_font = lambda size:pygame.font.Font("fonts/Helvetica-Font/Helvetica-Oblique.ttf", size)
-bold_oblique_font = lambda size:pygame.font.Font("fonts/Helvetica-Font/Helvetica-BoldOblique.ttf", size)
+fonts = FontRegistry()
+fonts.register("normal", "fonts/Helvetica-Font/Helvetica.ttf")
+fonts.register("bold", "fonts/Helvetica-Font/Helvetica-Bold.ttf")
+fonts.register("oblique", "fonts/Helvetica-Font/Helvetica-Oblique.ttf")
+fonts.register("bold_oblique", "fonts/Helvetica-Font/Helvetica-BoldOblique.ttf")
+normal_font = partial(fonts.get, "normal")
+bold_font = partial(fonts.get, "bold")
+oblique_font = partial(fonts.get, "oblique")
+bold_oblique_font = partial(fonts.get, "bold_oblique")
 
 class StartMenu(Scene):
+    uses_dirty_rects = True
+    next_scenes = ["settings"]
+    
+    @classmethod
+    def get_asset_manifest(cls, screen_size:tuple[int, int]):
+        return {"images": [("assets/start_menu_background.png", screen_size)], "fonts": []}
+    
     def __init__(self, screen_size: tuple[int, int]) -> None:
         self.ui_manager = pygame_gui.UIManager(screen_size, "themes/start_menu.json")
                     
@@ -32,8 +47,11 @@ class StartMenu(Scene):
                                                          anchors={"center":"center"},
                                                          object_id=pygame_gui.core.ObjectID("#settings_button", "@image_button"))
         
-        self.background_img = pygame.image.load("assets/start_menu_background.png")
-        self.background_img = pygame.transform.scale(self.background_img, screen_size)
+        self.background_img = load_image("assets/start_menu_background.png", screen_size)
+        self.ui_layer = CachedUILayer(self.ui_manager, screen_size, self.background_img)
+        
+        self.set_enter_transition(transition.LinearFadeIn(3))
+        self.set_exit_transition(transition.LinearFadeOut(3))
         
     
     def handle_event(self, event:pygame.Event):
@@ -41,18 +59,27 @@ class StartMenu(Scene):
             if event.ui_element == self.settings_btn:
                 # Switch to settings scene
                 self.scene_manager.change_scene("settings")
-        self.ui_manager.process_events(event)
+        if self.ui_layer.process_events(event):
+            self.mark_dirty()
         
 
     def update(self, dt:float):
-        self.ui_manager.update(dt)
+        # Hover, press and animation states of the UI show up as changes of the layer
+        if self.ui_layer.update(dt):
+            self.mark_dirty()
 
     def draw(self, screen:pygame.Surface):
-        screen.blit(self.background_img, (0,0))
-        self.ui_manager.draw_ui(screen)
+        self.ui_layer.draw(screen)
 
 
 class Settings(Scene):
+    uses_dirty_rects = True
+    next_scenes = ["start"]
+    
+    @classmethod
+    def get_asset_manifest(cls, screen_size:tuple[int, int]):
+        return {"images": [("assets/settings_background.png", screen_size)], "fonts": []}
+    
     def __init__(self, screen_size:tuple[int, int]) -> None:
         self.ui_manager = pygame_gui.UIManager(screen_size, "themes/settings.json")
         
@@ -61,9 +88,12 @@ class Settings(Scene):
                                                        self.ui_manager,
                                                        object_id=pygame_gui.core.ObjectID("#return_button", "@image_button"))
         
-        self.background_img = pygame.image.load("assets/settings_background.png")
-        self.background_img = pygame.transform.scale(self.background_img, screen_size)
+        self.background_img = load_image("assets/settings_background.png", screen_size)
+        self.ui_layer = CachedUILayer(self.ui_manager, screen_size, self.background_img)
         
+        self.set_enter_transition(transition.SpinEnter(3, "left", screen_size))
+        self.set_exit_transition(transition.SpinShrinkExit(3, screen_size))
+        self.set_transition_require_update(True)
         
     
     def handle_event(self, event: pygame.Event):
@@ -71,13 +101,14 @@ class Settings(Scene):
             if event.ui_element == self.return_btn:
                 # Switch back to start menu
                 self.scene_manager.change_scene("start")
-        self.ui_manager.process_events(event)
+        if self.ui_layer.process_events(event):
+            self.mark_dirty()
     
     def update(self, dt: float):
-        self.ui_manager.update(dt)
+        if self.ui_layer.update(dt):
+            self.mark_dirty()
     
     def draw(self, screen: pygame.Surface):
-        screen.blit(self.background_img, (0,0))
-        self.ui_manager.draw_ui(screen)
+        self.ui_layer.draw(screen)
     
     
\ No newline at end of file
@@ -0,0 +1,27 @@
+import os
+import sys
+
+#pygame has to see the dummy drivers before it is imported
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import pygame
+import pytest
+
+@pytest.fixture(autouse=True, scope="session")
+def display():
+    pygame.init()
+    screen = pygame.display.set_mode((320, 240))
+    yield screen
+    pygame.quit()
+
+@pytest.fixture(autouse=True)
+def clear_events():
+    pygame.event.clear()
+    yield
+    pygame.event.clear()
@@ -0,0 +1,113 @@
+import random
+
+import pygame
+import pytest
+
+from better_pygame import Animation, MultiAnimation, AnimationSystem
+from better_pygame._constants import ON_ANIMATION_LOOP, ON_ANIMATION_END
+
+FRAMERATE = 8
+#Multiples of 1/64 keep the timers exact, so stepping and arithmetic give the same frames
+DTS = [i / 64 for i in (1, 3, 4, 8, 16, 24, 40, 64, 130)]
+
+def create_animation(frame_count:int, loop:bool, loop_count:int) -> Animation:
+    images = [pygame.Surface((4, 4)) for _ in range(frame_count)]
+    return Animation(images, FRAMERATE, loop, loop_count)
+
+class ReferenceAnimation:
+    '''Steps through every frame one at a time, the behaviour Animation.update() computes arithmetically'''
+    def __init__(self, frame_count:int, loop:bool, loop_count:int) -> None:
+        self.frame_count = frame_count
+        self.loop = loop
+        self.loops_left = loop_count
+        self.frame = 0
+        self.timer = 1 / FRAMERATE
+        self.running = True
+
+    def update(self, dt:float) -> tuple[int, bool]:
+        '''Returns the loops completed and if the animation ended'''
+        if not self.running:
+            return 0, False
+        self.timer -= dt
+        loops = 0
+        while self.timer <= 0:
+            self.timer += 1 / FRAMERATE
+            if self.frame + 1 < self.frame_count:
+                self.frame += 1
+            elif self.loop and self.loops_left == -1:
+                self.frame = 0
+                loops += 1
+            elif self.loop and self.loops_left > 0:
+                self.loops_left -= 1
+                self.frame = 0
+                loops += 1
+            else:
+                self.frame = self.frame_count - 1
+                self.running = False
+                return loops, True
+        return loops, False
+
+def get_events() -> tuple[int, bool]:
+    loops = 0
+    ended = False
+    for event in pygame.event.get():
+        if event.type == ON_ANIMATION_LOOP:
+            loops += sum(event.loops) if isinstance(event.loops, list) else event.loops
+        elif event.type == ON_ANIMATION_END:
+            ended = True
+    return loops, ended
+
+@pytest.mark.parametrize("frame_count, loop, loop_count", [(1, True, -1), (5, True, -1), (5, True, 3), (5, True, 0), (4, False, -1)])
+@pytest.mark.parametrize("seed", range(5))
+def test_update_matches_frame_by_frame_stepping(frame_count, loop, loop_count, seed):
+    rng = random.Random(seed)
+    reference = ReferenceAnimation(frame_count, loop, loop_count)
+    animation = create_animation(frame_count, loop, loop_count)
+    for _ in range(60):
+        dt = rng.choice(DTS)
+        expected_events = reference.update(dt)
+        animation.update(dt)
+        assert animation.current_frame == reference.frame
+        assert animation._running == reference.running
+        assert get_events() == expected_events
+        if reference.running:
+            assert animation.timer == reference.timer
+            assert animation.curr_loop_count == reference.loops_left
+
+@pytest.mark.parametrize("seed", range(3))
+def test_system_matches_animation_update(seed):
+    rng = random.Random(seed)
+    settings = [(5, True, -1), (5, True, 2), (3, False, -1), (1, True, -1)]
+    animations = [create_animation(*setting) for setting in settings]
+    registered = [create_animation(*setting) for setting in settings]
+    system = AnimationSystem()
+    for animation in registered:
+        system.register(animation)
+    for _ in range(60):
+        dt = rng.choice(DTS)
+        for animation in animations:
+            animation.update(dt)
+        system.update(dt)
+        assert [animation.current_frame for animation in registered] == [animation.current_frame for animation in animations]
+        assert [animation._running for animation in registered] == [animation._running for animation in animations]
+
+def test_multi_animation_children_follow_empty_system():
+    #An empty AnimationSystem has len() 0, children added later must still be registered
+    system = AnimationSystem()
+    multi = MultiAnimation({})
+    system.register(multi)
+    walk = create_animation(4, True, -1)
+    idle = create_animation(4, True, -1)
+    multi.add_animation("walk", walk)
+    multi.add_animation("idle", idle)
+    assert walk._system is system and idle._system is system
+
+    multi.switch_animation("walk")
+    assert system.enabled[walk._index] and not system.enabled[idle._index]
+    system.update(1 / FRAMERATE)
+    assert walk.current_frame == 1 and idle.current_frame == 0
+
+    multi.switch_animation("idle")
+    assert not system.enabled[walk._index] and system.enabled[idle._index]
+    multi.remove_animation("walk")
+    assert walk._system is None
@@ -0,0 +1,92 @@
+import gc
+
+import pygame
+import pytest
+
+from better_pygame import AssetCache
+
+@pytest.fixture
+def image_path(tmp_path):
+    surface = pygame.Surface((20, 10), pygame.SRCALPHA)
+    surface.fill((255, 0, 0, 255))
+    surface.fill((0, 0, 0, 0), (10, 0, 10, 10))
+    path = str(tmp_path / "image.png")
+    pygame.image.save(surface, path)
+    return path
+
+@pytest.fixture
+def image_loads(monkeypatch):
+    loads = []
+    load = pygame.image.load
+    def counting_load(path, *args):
+        loads.append(path)
+        return load(path, *args)
+    monkeypatch.setattr(pygame.image, "load", counting_load)
+    return loads
+
+def test_images_are_shared_by_path_size_and_convert(image_path, image_loads):
+    cache = AssetCache()
+    image = cache.get_image(image_path)
+    assert cache.get_image(image_path) is image
+    assert image.get_size() == (20, 10)
+    assert len(image_loads) == 1
+
+    scaled = cache.get_image(image_path, (40, 20))
+    assert scaled is not image and scaled.get_size() == (40, 20)
+    assert cache.get_image(image_path, (40.0, 20.0)) is scaled
+    unconverted = cache.get_image(image_path, convert=False)
+    assert unconverted is not image
+    assert cache.has_image(image_path, (40, 20)) and not cache.has_image(image_path, (10, 10))
+
+def test_converted_images_keep_alpha(image_path):
+    image = AssetCache().get_image(image_path)
+    assert image.get_flags() & pygame.SRCALPHA
+    assert image.get_at((0, 0)) == (255, 0, 0, 255) and image.get_at((15, 0)).a == 0
+
+def test_scaled_images_are_scaled_from_the_cached_source(image_path, image_loads):
+    cache = AssetCache()
+    cache.get_image(image_path, convert=False)
+    cache.get_image(image_path, (5, 5))
+    cache.get_image(image_path, (6, 6))
+    assert len(image_loads) == 1
+
+def test_put_image_and_evict(image_path, image_loads):
+    cache = AssetCache()
+    surface = pygame.Surface((4, 4))
+    cache.put_image(image_path, surface, (4, 4))
+    assert cache.get_image(image_path, (4, 4)).get_size() == (4, 4)
+    assert not image_loads
+    cache.evict(image_path, (4, 4))
+    assert not cache.has_image(image_path, (4, 4))
+
+def test_pinned_images_are_kept_over_budget(image_path):
+    #Room for one 40x20 image
+    cache = AssetCache(max_bytes=40 * 20 * 4)
+    pinned = cache.get_image(image_path, (40, 20), pin=True)
+    cache.get_image(image_path, (20, 40))
+    assert cache.get_image(image_path, (40, 20)) is pinned
+    cache.unpin(image_path, (40, 20))
+    cache.get_image(image_path, (20, 40))
+    assert not cache.has_image(image_path, (40, 20))
+
+def test_masks_are_built_once_per_surface_and_threshold(image_path):
+    cache = AssetCache()
+    image = cache.get_image(image_path)
+    mask = cache.get_mask(image)
+    assert cache.get_mask(image) is mask
+    assert mask.count() == 100
+    assert cache.get_mask(image, 0) is not mask
+    #Masks are dropped with their Surface
+    surface = pygame.Surface((2, 2))
+    cache.get_mask(surface)
+    assert len(cache.masks) == 2
+    del surface
+    gc.collect()
+    assert len(cache.masks) == 1
+
+def test_clear(image_path):
+    cache = AssetCache()
+    cache.get_image(image_path)
+    cache.put_font_file("font.ttf", b"")
+    cache.clear()
+    assert not cache.has_image(image_path) and not cache.has_font("font.ttf")
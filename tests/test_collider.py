@@ -0,0 +1,118 @@
+import random
+
+import numpy as np
+import pygame
+import pytest
+
+from better_pygame import SpatialHash, RectCollider, CircleCollider, collide_masks
+from better_pygame.collider import Collider
+
+LAYERS = [(1, -1), (1, 2), (2, 1), (4, 4), (8, 0)]
+
+def create_colliders(seed:int, count:int = 300) -> list[Collider]:
+    '''Random rects and circles, some spanning many cells, some outside the positive quadrant'''
+    rng = random.Random(seed)
+    colliders = []
+    for _ in range(count):
+        layer, mask = rng.choice(LAYERS)
+        size = rng.choice((2, 10, 30, 200))
+        position = (rng.uniform(-300, 700), rng.uniform(-300, 700))
+        if rng.random() < 0.5:
+            colliders.append(RectCollider((*position, rng.uniform(1, size), rng.uniform(1, size)), layer=layer, mask=mask))
+        else:
+            colliders.append(CircleCollider(position, rng.uniform(0.5, size / 2), layer=layer, mask=mask))
+    return colliders
+
+def layers_collide(a:Collider, b:Collider) -> bool:
+    return bool(a.layer & b.mask) or bool(b.layer & a.mask)
+
+def bounds_overlap(a:Collider, b:Collider) -> bool:
+    left_a, top_a, right_a, bottom_a = a.get_bounds()
+    left_b, top_b, right_b, bottom_b = b.get_bounds()
+    return left_a < right_b and left_b < right_a and top_a < bottom_b and top_b < bottom_a
+
+def shapes_overlap(a:Collider, b:Collider) -> bool:
+    if isinstance(a, RectCollider) and isinstance(b, RectCollider):
+        return bounds_overlap(a, b)
+    if isinstance(a, CircleCollider) and isinstance(b, CircleCollider):
+        return (a.x - b.x) ** 2 + (a.y - b.y) ** 2 < (a.radius + b.radius) ** 2
+    circle, rect = (a, b) if isinstance(a, CircleCollider) else (b, a)
+    nearest_x = min(max(circle.x, rect.x), rect.x + rect.width)
+    nearest_y = min(max(circle.y, rect.y), rect.y + rect.height)
+    return (circle.x - nearest_x) ** 2 + (circle.y - nearest_y) ** 2 < circle.radius ** 2
+
+def brute_force_pairs(world:SpatialHash, test) -> set[tuple[int, int]]:
+    colliders = [collider for collider in world.colliders if collider is not None]
+    pairs = set()
+    for i, a in enumerate(colliders):
+        for b in colliders[i + 1:]:
+            if layers_collide(a, b) and bounds_overlap(a, b) and test(a, b):
+                pairs.add((min(a._index, b._index), max(a._index, b._index)))
+    return pairs
+
+def as_set(pairs:np.ndarray) -> set[tuple[int, int]]:
+    result = {tuple(pair) for pair in pairs.tolist()}
+    #Every pair is reported once, lowest index first
+    assert len(result) == len(pairs)
+    assert all(a < b for a, b in result)
+    return result
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("cell_size", [16, 64])
+def test_pairs_match_brute_force(seed, cell_size):
+    world = SpatialHash(cell_size, 16)
+    for collider in create_colliders(seed):
+        world.add(collider)
+    assert as_set(world.query_pairs()) == brute_force_pairs(world, bounds_overlap)
+    assert as_set(world.collide_pairs()) == brute_force_pairs(world, shapes_overlap)
+
+@pytest.mark.parametrize("seed", range(3))
+def test_pairs_match_brute_force_after_moves_and_removals(seed):
+    rng = np.random.default_rng(seed)
+    world = SpatialHash(32, 16)
+    colliders = create_colliders(seed)
+    for collider in colliders:
+        world.add(collider)
+    world.query_pairs()
+
+    #Move some through the descriptors, some in one vectorised call, and remove a few
+    for collider in colliders[:50]:
+        collider.move(*rng.uniform(-100, 100, 2))
+    indices = np.array([collider._index for collider in colliders[50:150]])
+    world.set_positions(indices, rng.uniform(-300, 700, (len(indices), 2)))
+    for collider in colliders[150:170]:
+        world.remove(collider)
+    for collider in colliders[150:160]:
+        world.add(collider)
+
+    assert as_set(world.query_pairs()) == brute_force_pairs(world, bounds_overlap)
+    assert as_set(world.collide_pairs()) == brute_force_pairs(world, shapes_overlap)
+
+@pytest.mark.parametrize("rect", [(0, 0, 100, 100), (-250, 300, 40, 500), (600, -300, 1, 1)])
+def test_query_rect_matches_brute_force(rect):
+    world = SpatialHash(32)
+    colliders = create_colliders(0)
+    for collider in colliders:
+        world.add(collider)
+    x, y, width, height = rect
+    expected = set()
+    for collider in colliders:
+        left, top, right, bottom = collider.get_bounds()
+        if left < x + width and x < right and top < y + height and y < bottom:
+            expected.add(collider._index)
+    assert set(world.query_rect(rect).tolist()) == expected
+
+def test_collider_base_is_abstract():
+    with pytest.raises(TypeError):
+        Collider((0, 0), (1, 1))
+
+    class IncompleteCollider(Collider):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteCollider((0, 0), (1, 1))
+
+def test_collide_masks():
+    mask = pygame.mask.Mask((10, 10), fill=True)
+    assert collide_masks((0, 0), mask, (5, 5), mask) == (5, 5)
+    assert collide_masks((0, 0), mask, (10, 0), mask) is None
@@ -0,0 +1,101 @@
+import numpy as np
+import pygame
+import pytest
+
+from better_pygame import Transform, Vec2
+from better_pygame.coordinates import transform_points
+
+def test_vec2_is_a_coordinate_pair():
+    vec = Vec2(3, 4)
+    assert tuple(vec) == (3, 4) and len(vec) == 2 and vec[1] == 4
+    assert vec == (3, 4) and vec != (3, 5) and vec == Vec2(3, 4)
+    assert pygame.Rect(vec, (1, 1)).topleft == (3, 4)
+    surface = pygame.Surface((10, 10))
+    assert surface.blit(pygame.Surface((1, 1)), Vec2(2.7, 5)).topleft == (2, 5)
+    assert vec.length() == 5 and vec.dot((1, 2)) == 11
+    assert Vec2(1.5, -2.5).rounded() == (2, -2)
+
+def test_vec2_operators():
+    vec = Vec2(1, 2)
+    assert vec + (1, 1) == (2, 3) and (1, 1) + vec == (2, 3)
+    assert vec - (1, 1) == (0, 1) and (5, 5) - vec == (4, 3)
+    assert vec * 2 == (2, 4) and 2 * vec == (2, 4) and vec * (2, 3) == (2, 6)
+    assert vec / 2 == (0.5, 1) and vec / (1, 4) == (1, 0.5)
+    assert -vec == (-1, -2)
+    assert vec == (1, 2)
+
+def test_vec2_in_place_operators_keep_the_object():
+    vec = Vec2(1, 2)
+    same = vec
+    vec += (1, 1)
+    vec -= Vec2(0, 1)
+    vec *= 2
+    vec *= (1, 3)
+    vec /= 2
+    vec /= (1, 2)
+    assert vec is same and vec == (2, 3)
+    assert vec.set(5, 6) is same and vec == (5, 6)
+    assert vec.lerp_from((0, 0), Vec2(10, 20), 0.25) is same and vec == (2.5, 5)
+    copy = vec.copy()
+    copy.x = 0
+    assert vec.x == 2.5
+
+def test_rotation_matches_pygame_direction():
+    #90 degrees counterclockwise on screen, right turns into up (negative y)
+    x, y = Transform.rotation(90).apply(1, 0)
+    assert (x, y) == pytest.approx((0, -1))
+    #The origin stays in place
+    assert Transform.rotation(37, (5, 7)).apply(5, 7) == pytest.approx((5, 7))
+
+def test_rotated_surface_corners():
+    '''pygame.transform.rotate() turns the corners of a Surface to where Transform.rotation() puts them'''
+    surface = pygame.Surface((20, 10))
+    rotated = pygame.transform.rotate(surface, 30)
+    corners = np.array([(0, 0), (20, 0), (0, 10), (20, 10)])
+    points = Transform.rotation(30).apply_points(corners)
+    size = points.max(axis=0) - points.min(axis=0)
+    assert np.abs(size - rotated.get_size()).max() <= 1
+
+def test_scaling_and_camera():
+    assert Transform.scaling(2, origin=(10, 10)).apply(10, 10) == (10, 10)
+    assert Transform.scaling(2, 3).apply(1, 1) == (2, 3)
+    camera = Transform.camera((100, 50), 2, (320, 240))
+    assert camera.apply(100, 50) == (160, 120)
+    assert camera.apply(110, 50) == (180, 120)
+
+def test_composition_order():
+    move = Transform.translation(10, 0)
+    scale = Transform.scaling(2)
+    #then() applies self first
+    assert move.then(scale).apply(1, 1) == (22, 2)
+    assert scale.then(move).apply(1, 1) == (12, 2)
+    assert (scale @ move).apply(1, 1) == move.then(scale).apply(1, 1)
+
+def test_inverse():
+    transform = Transform.rotation(33, (4, 5)).then(Transform.scaling(2, 0.5)).then(Transform.translation(-7, 3))
+    inverse = transform.inverse()
+    points = np.random.default_rng(0).uniform(-100, 100, (20, 2))
+    np.testing.assert_allclose(inverse.apply_points(transform.apply_points(points)), points, atol=1e-9)
+    identity = transform.then(inverse)
+    np.testing.assert_allclose(identity.get_matrix(), Transform.identity().get_matrix(), atol=1e-12)
+    with pytest.raises(ValueError):
+        Transform.scaling(0).inverse()
+
+def test_point_arrays_match_single_points():
+    transform = Transform.rotation(20).then(Transform.translation(3, 4))
+    points = np.array([(1.0, 2.0), (-3.0, 5.0), (0.0, 0.0)])
+    expected = np.array([transform.apply(x, y) for x, y in points])
+    np.testing.assert_allclose(transform.apply_points(points), expected)
+    vec = Vec2(1, 2)
+    assert transform.apply_vec(vec, vec) is vec
+    assert tuple(vec) == pytest.approx(tuple(expected[0]))
+    #In place into the input array
+    transform.apply_points(points, out=points)
+    np.testing.assert_allclose(points, expected)
+
+def test_transform_points():
+    points = np.array([(1.0, 2.0), (3.0, 4.0)])
+    np.testing.assert_allclose(transform_points(points, (10, 20), 2), [(12, 24), (16, 28)])
+    np.testing.assert_allclose(transform_points(points, scale=(1, -1)), [(1, -2), (3, -4)])
+    out = transform_points(points, (1, 1), out=points)
+    assert out is points
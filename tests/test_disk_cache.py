@@ -0,0 +1,91 @@
+import os
+
+import pygame
+import pytest
+
+from better_pygame import DiskSurfaceCache
+
+def save_image(path:str, color:tuple, alpha:bool = False, size:tuple[int, int] = (16, 12)) -> str:
+    surface = pygame.Surface(size, pygame.SRCALPHA if alpha else 0)
+    surface.fill(color)
+    #A gradient, so scaling and storing errors change pixels
+    for x in range(size[0]):
+        surface.set_at((x, 0), (x * 15 % 256, 0, 0, 255))
+    pygame.image.save(surface, path)
+    return path
+
+def get_pixels(surface:pygame.Surface) -> bytes:
+    return pygame.image.tobytes(surface, "RGBA")
+
+def get_raw_files(directory:str) -> list[str]:
+    return sorted(file for file in os.listdir(directory) if file.endswith(".raw"))
+
+@pytest.mark.parametrize("alpha", [False, True])
+def test_round_trip_is_pixel_identical(tmp_path, alpha):
+    source = save_image(str(tmp_path / "image.png"), (10, 200, 30, 128), alpha)
+    cache = DiskSurfaceCache(str(tmp_path / "cache"))
+    expected = pygame.transform.scale(pygame.image.load(source), (40, 30))
+
+    first = cache.load(source, (40, 30))
+    assert cache.misses == 1 and cache.hits == 0
+    second = cache.load(source, (40, 30))
+    assert cache.hits == 1
+    assert second.get_size() == (40, 30)
+    assert get_pixels(first) == get_pixels(expected) == get_pixels(second)
+
+    #A new cache on the same directory reads the index and the stored entry
+    reopened = DiskSurfaceCache(str(tmp_path / "cache"))
+    assert get_pixels(reopened.load(source, (40, 30))) == get_pixels(expected)
+    assert reopened.hits == 1
+
+def test_drawing_on_a_cached_surface_does_not_change_the_cache(tmp_path):
+    source = save_image(str(tmp_path / "image.png"), (10, 200, 30))
+    cache = DiskSurfaceCache(str(tmp_path / "cache"))
+    expected = get_pixels(cache.load(source, (20, 20)))
+    cache.get(source, (20, 20)).fill((255, 0, 255))
+    assert get_pixels(cache.get(source, (20, 20))) == expected
+
+def test_changed_source_invalidates_its_entries(tmp_path):
+    source = save_image(str(tmp_path / "image.png"), (10, 200, 30))
+    cache = DiskSurfaceCache(str(tmp_path / "cache"))
+    cache.load(source, (20, 20))
+    cache.load(source, (8, 8))
+    old_files = get_raw_files(cache.directory)
+    assert len(old_files) == 2
+
+    save_image(source, (250, 20, 30), size=(16, 13))
+    assert cache.get(source, (20, 20)) is None
+    assert get_raw_files(cache.directory) == []
+    reloaded = cache.load(source, (20, 20))
+    assert get_pixels(reloaded) == get_pixels(pygame.transform.scale(pygame.image.load(source), (20, 20)))
+
+def test_entries_shared_by_identical_sources_survive_one_changing(tmp_path):
+    first = save_image(str(tmp_path / "first.png"), (10, 200, 30))
+    second = save_image(str(tmp_path / "second.png"), (10, 200, 30))
+    cache = DiskSurfaceCache(str(tmp_path / "cache"))
+    cache.load(first, (20, 20))
+    assert cache.get(second, (20, 20)) is not None
+
+    save_image(first, (250, 20, 30), size=(16, 13))
+    cache.get_source_hash(first)
+    assert cache.get(second, (20, 20)) is not None
+
+def test_truncated_file_is_a_miss(tmp_path):
+    source = save_image(str(tmp_path / "image.png"), (10, 200, 30))
+    cache = DiskSurfaceCache(str(tmp_path / "cache"))
+    cache.load(source, (20, 20))
+    file = os.path.join(cache.directory, get_raw_files(cache.directory)[0])
+    with open(file, "r+b") as data:
+        data.truncate(100)
+    assert cache.get(source, (20, 20)) is None
+
+def test_prune_removes_entries_of_deleted_sources(tmp_path):
+    kept = save_image(str(tmp_path / "kept.png"), (10, 200, 30))
+    deleted = save_image(str(tmp_path / "deleted.png"), (250, 20, 30))
+    cache = DiskSurfaceCache(str(tmp_path / "cache"))
+    cache.load(kept, (20, 20))
+    cache.load(deleted, (20, 20))
+    os.remove(deleted)
+    cache.prune()
+    files = get_raw_files(cache.directory)
+    assert len(files) == 1 and files[0].startswith(cache.get_source_hash(kept))
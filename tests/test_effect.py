@@ -0,0 +1,83 @@
+import numpy as np
+import pygame
+import pytest
+
+from better_pygame import Effect, Emitter
+from better_pygame._constants import ON_EFECT_END
+
+def get_end_events(effect:Effect) -> list[pygame.Event]:
+    return [event for event in pygame.event.get(ON_EFECT_END) if event.element is effect]
+
+def test_rate_emitter_spawns_until_stopped():
+    effect = Effect([Emitter(rate=1000, lifetime=(0.5, 0.5))], seed=0)
+    effect.start()
+    effect.update(0.1)
+    assert len(effect) == 100
+    for _ in range(20):
+        effect.update(0.1)
+    #Particles older than their lifetime expire while new ones spawn
+    assert len(effect) == 400
+    assert not get_end_events(effect)
+
+    effect.stop()
+    effect.update(0.1)
+    assert len(effect) == 300 and effect.running
+    for _ in range(5):
+        effect.update(0.1)
+    assert len(effect) == 0 and not effect.running
+    assert len(get_end_events(effect)) == 1
+    #Updates after the end do not post the event again
+    effect.update(0.1)
+    assert not get_end_events(effect)
+
+def test_fractional_spawns_are_carried():
+    effect = Effect([Emitter(rate=10, lifetime=(5, 5))])
+    effect.start()
+    for _ in range(64):
+        effect.update(1 / 64)
+    assert len(effect) == 10
+
+def test_duration_limits_emission():
+    effect = Effect([Emitter(rate=100, duration=0.5, lifetime=(1, 1))])
+    effect.start()
+    #Spawning stops part way through the update
+    effect.update(0.375)
+    effect.update(0.375)
+    assert len(effect) == 50
+    assert not get_end_events(effect)
+    effect.update(0.375)
+    assert len(effect) and effect.running
+    effect.update(0.375)
+    assert len(effect) == 0
+    assert len(get_end_events(effect)) == 1
+
+def test_burst_expires_and_ends_once():
+    effect = Effect([Emitter(burst=50, lifetime=(0.2, 0.4), speed=(10, 10), gravity=(0, 100), drag=0.5)], position=(100, 100), seed=1)
+    effect.start()
+    assert len(effect) == 50
+    lifetimes = effect.lifetimes[:50].copy()
+    effect.update(0.3)
+    assert len(effect) == np.count_nonzero(lifetimes > 0.3)
+    assert np.all(effect.ages[:len(effect)] == pytest.approx(0.3))
+    assert not get_end_events(effect)
+    effect.update(0.2)
+    assert len(effect) == 0 and not effect.running
+    assert len(get_end_events(effect)) == 1
+
+def test_seeded_effects_spawn_the_same_particles():
+    emitter = Emitter(burst=20, radius=10)
+    first, second = Effect([emitter], seed=5), Effect([emitter], seed=5)
+    first.start()
+    second.start()
+    first.update(0.1)
+    second.update(0.1)
+    np.testing.assert_array_equal(first.positions[:20], second.positions[:20])
+
+def test_draw_blits_every_particle():
+    effect = Effect([Emitter(burst=3, speed=(0, 0), start_size=4, end_size=4, start_color=(255, 0, 0), end_color=(255, 0, 0))], position=(10, 10))
+    effect.start()
+    screen = pygame.Surface((20, 20))
+    effect.draw(screen)
+    assert screen.get_at((10, 10)) == (255, 0, 0)
+    sprites, top_left = effect.get_blits((5, 0))
+    assert len(sprites) == 3 and top_left.tolist() == [[13, 8]] * 3
@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+from better_pygame import EntityStore
+
+@pytest.mark.parametrize("grow", [True, False])
+def test_spawn_many_without_positions(grow):
+    store = EntityStore(4, grow=grow)
+    store.spawn_many(np.empty((0, 2)))
+    #Also when the store is full
+    store.spawn_many(np.zeros((4, 2)))
+    indices = store.spawn_many(np.empty((0, 2)), np.empty((0, 2)), np.empty(0), np.empty(0, np.int64))
+    assert indices.dtype == np.int64 and len(indices) == 0
+    assert len(store) == 4
+    assert store.get_alive().tolist() == [0, 1, 2, 3]
+
+def test_spawn_many_fills_from_the_front_and_reuses_slots():
+    store = EntityStore(2)
+    assert store.spawn_many([(0, 0), (1, 1), (2, 2)]).tolist() == [0, 1, 2]
+    store.despawn_many([2, 0])
+    assert store.spawn_many([(3, 3)]).tolist() == [0]
+    assert store.get_alive().tolist() == [0, 1]
+    assert store.positions[0].tolist() == [3, 3]
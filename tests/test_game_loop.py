@@ -0,0 +1,76 @@
+import pygame
+import pytest
+
+from better_pygame import GameLoop, Scene, SceneManager
+
+#Update steps of 1/64 s are exact in floating point
+UPDATE_RATE = 64
+STEP = 1 / UPDATE_RATE
+
+class CountingScene(Scene):
+    def __init__(self) -> None:
+        self.dts = []
+        self.draws = 0
+
+    def handle_event(self, event:pygame.Event):
+        pass
+
+    def update(self, dt:float):
+        self.dts.append(dt)
+
+    def draw(self, screen:pygame.Surface):
+        self.draws += 1
+
+@pytest.fixture
+def scene():
+    return CountingScene()
+
+def create_loop(scene:CountingScene, **kwargs) -> GameLoop:
+    scene_manager = SceneManager(pygame.display.get_surface().get_size(), {"scene": scene})
+    return GameLoop(scene_manager, pygame.display.get_surface(), update_rate=UPDATE_RATE, **kwargs)
+
+def test_fixed_steps_and_interpolation(scene):
+    game_loop = create_loop(scene)
+    assert game_loop.advance(STEP * 0.5)
+    assert scene.dts == [] and scene.draws == 1
+    assert game_loop.scene_manager.interpolation_alpha == 0.5
+    assert game_loop.advance(STEP * 1.75)
+    assert scene.dts == [STEP, STEP]
+    assert game_loop.scene_manager.interpolation_alpha == 0.25
+    assert (game_loop.updates, game_loop.frames) == (2, 2)
+
+def test_catch_up_is_capped_and_draws_are_skipped(scene):
+    game_loop = create_loop(scene, max_updates_per_frame=3, max_draw_skip=2)
+    assert not game_loop.advance(STEP * 10.5)
+    assert len(scene.dts) == 3
+    #The time that cannot be caught up with is dropped, the fraction of a step is kept
+    assert game_loop.dropped_time == STEP * 7
+    assert game_loop.scene_manager.interpolation_alpha == 0.5
+    assert not game_loop.advance(STEP * 10)
+    #At most max_draw_skip frames in a row are skipped
+    assert game_loop.advance(STEP * 10)
+    assert scene.draws == 1 and game_loop.frames == 1
+    assert game_loop.advance(STEP)
+    assert len(scene.dts) == 10 and scene.draws == 2
+
+def test_headless_loop_only_updates(scene):
+    scene_manager = SceneManager((320, 240), {"scene": scene})
+    with pytest.raises(ValueError):
+        GameLoop(scene_manager)
+    with pytest.raises(ValueError):
+        GameLoop(scene_manager, headless=True, update_rate=0)
+    game_loop = GameLoop(scene_manager, headless=True, update_rate=UPDATE_RATE)
+    assert not game_loop.advance(STEP * 2)
+    assert len(scene.dts) == 2 and scene.draws == 0
+
+def test_run_stops_after_max_updates(scene):
+    game_loop = create_loop(scene, headless=True)
+    game_loop.run(max_updates=100)
+    assert scene.dts == [STEP] * 100
+    assert not game_loop.running
+
+def test_quit_event_stops_run(scene):
+    game_loop = create_loop(scene, headless=True)
+    pygame.event.post(pygame.Event(pygame.QUIT))
+    game_loop.run(max_updates=100)
+    assert scene.dts == []
@@ -0,0 +1,107 @@
+import pygame
+import pytest
+
+from better_pygame import AssetCache, AssetPrefetcher, Scene, SceneManager, asset_cache, load_image
+
+SCREEN_SIZE = (320, 240)
+
+@pytest.fixture
+def image_paths(tmp_path):
+    paths = []
+    for i, color in enumerate([(255, 0, 0), (0, 255, 0), (0, 0, 255)]):
+        surface = pygame.Surface((16, 8))
+        surface.fill(color)
+        path = str(tmp_path / f"image{i}.png")
+        pygame.image.save(surface, path)
+        paths.append(path)
+    return paths
+
+@pytest.fixture
+def image_loads(monkeypatch):
+    '''Paths passed to pygame.image.load, on any thread'''
+    loads = []
+    load = pygame.image.load
+    def counting_load(path, *args):
+        loads.append(path)
+        return load(path, *args)
+    monkeypatch.setattr(pygame.image, "load", counting_load)
+    return loads
+
+@pytest.fixture
+def prefetcher():
+    prefetcher = AssetPrefetcher(AssetCache())
+    yield prefetcher
+    prefetcher.shutdown()
+
+def test_prefetch_loads_into_the_cache(prefetcher, image_paths, image_loads):
+    manifest = {"images": [(image_paths[0], None), (image_paths[1], (32, 32))], "fonts": []}
+    prefetcher.prefetch(manifest)
+    #Already loading, nothing is submitted again
+    prefetcher.prefetch(manifest)
+    prefetcher.wait(manifest)
+    assert prefetcher.is_ready(manifest)
+    cache = prefetcher.cache
+    assert cache.has_image(image_paths[0]) and cache.has_image(image_paths[1], (32, 32))
+    assert cache.get_image(image_paths[1], (32, 32)).get_size() == (32, 32)
+    assert cache.get_image(image_paths[0]).get_at((0, 0)) == (255, 0, 0)
+    #Cached, nothing is submitted again
+    prefetcher.prefetch(manifest)
+    assert prefetcher.is_ready(manifest)
+    assert sorted(image_loads) == sorted(image_paths[:2])
+
+def test_prefetch_fonts(prefetcher):
+    path = "fonts/Helvetica-Font/Helvetica.ttf"
+    manifest = {"images": [], "fonts": [(path, 20)]}
+    prefetcher.prefetch(manifest)
+    prefetcher.wait(manifest)
+    assert prefetcher.cache.has_font(path)
+    assert prefetcher.cache.get_font(path, 20).get_height() > 0
+
+def test_failed_loads_are_dropped(prefetcher, tmp_path):
+    path = str(tmp_path / "missing.png")
+    manifest = {"images": [(path, None)], "fonts": []}
+    prefetcher.prefetch(manifest)
+    prefetcher.wait(manifest)
+    assert prefetcher.is_ready(manifest)
+    assert not prefetcher.cache.has_image(path)
+    #The error is raised when the image is loaded on the main thread
+    with pytest.raises(FileNotFoundError):
+        prefetcher.cache.get_image(path)
+
+
+class ImageScene(Scene):
+    paths:list[str] = []
+
+    def __init__(self) -> None:
+        self.images = [load_image(path, (32, 32)) for path in self.paths]
+
+    @classmethod
+    def get_asset_manifest(cls, screen_size:tuple[int, int]) -> dict[str, list]:
+        return {"images": [(path, (32, 32)) for path in cls.paths], "fonts": []}
+
+    def handle_event(self, event:pygame.Event):
+        pass
+
+    def update(self, dt:float):
+        pass
+
+    def draw(self, screen:pygame.Surface):
+        pass
+
+class StartScene(ImageScene):
+    pass
+
+def test_cold_scene_change_decodes_every_image_once(monkeypatch, image_paths, image_loads):
+    monkeypatch.setattr(ImageScene, "paths", image_paths)
+    monkeypatch.setattr(StartScene, "paths", [])
+    asset_cache.clear()
+    scene_manager = SceneManager(SCREEN_SIZE, {"start": StartScene, "images": ImageScene}, "start", prefetch=True)
+    try:
+        scene_manager.change_scene("images")
+        scene = scene_manager.curr_scene
+        assert all(image.get_size() == (32, 32) for image in scene.images)
+        scene_manager.prefetcher.wait(scene_manager.get_asset_manifest("images"))
+        assert sorted(image_loads) == sorted(image_paths)
+    finally:
+        scene_manager.shutdown()
+        asset_cache.clear()
@@ -0,0 +1,33 @@
+import numpy as np
+import pygame
+import pytest
+
+from better_pygame import Animation, MultiAnimation, RenderBatch
+
+@pytest.fixture
+def animations():
+    frame = pygame.Surface((10, 10))
+    frame.fill((255, 0, 0))
+    #A MultiAnimation without animations has no frame
+    return [Animation([frame], 1), MultiAnimation({}), Animation([frame], 1), MultiAnimation({})]
+
+@pytest.mark.parametrize("view", [None, (0, 0, 100, 100)])
+def test_submit_animations_skips_animations_without_frame(animations, view):
+    batch = RenderBatch(view)
+    positions = np.array([(0, 0), (20, 20), (200, 200), (40, 40)])
+    batch.submit_animations(animations, positions)
+    screen = pygame.Surface((100, 100))
+    if view is None:
+        assert batch.submitted == 2
+        assert batch.flush(screen) == 2
+    else:
+        assert batch.submitted == 1 and batch.culled == 1
+        assert batch.flush(screen) == 1
+    assert screen.get_at((5, 5)) == (255, 0, 0)
+    assert screen.get_at((25, 25)) == (0, 0, 0)
+
+def test_submit_animations_without_any_frame():
+    batch = RenderBatch((0, 0, 100, 100))
+    batch.submit_animations([MultiAnimation({})], [(0, 0)])
+    assert batch.submitted == 0 and batch.culled == 0
+    assert batch.flush(pygame.Surface((100, 100))) == 0
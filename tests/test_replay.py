@@ -0,0 +1,115 @@
+import pygame
+import pytest
+
+from better_pygame import GameLoop, InputRecorder, InputReplayer, Scene, SceneManager
+from better_pygame.replay import _HEADER, _MAGIC, _decode_value, _encode_value
+
+UPDATE_RATE = 64
+
+@pytest.mark.parametrize("value", [
+    None, True, False, 0, -1, 2 ** 62, 1.5, -0.25, "", "héllo", (), (1, 2), (1, (2.5, "a"), None, True)
+])
+def test_values_round_trip(value):
+    out = bytearray()
+    assert _encode_value(value, out)
+    decoded, offset = _decode_value(bytes(out), 0)
+    assert decoded == value and type(decoded) is type(value)
+    assert offset == len(out)
+
+def test_lists_are_decoded_as_tuples():
+    out = bytearray()
+    assert _encode_value([1, [2]], out)
+    assert _decode_value(bytes(out), 0)[0] == (1, (2,))
+
+@pytest.mark.parametrize("value", [object(), {"a": 1}, (1, object())])
+def test_unsupported_values_are_not_written(value):
+    out = bytearray(b"x")
+    assert not _encode_value(value, out)
+    assert out == b"x"
+
+def test_invalid_tag():
+    with pytest.raises(ValueError):
+        _decode_value(b"?", 0)
+
+def test_recorded_frames_read_back(tmp_path):
+    path = str(tmp_path / "session.bin")
+    recorder = InputRecorder(path, UPDATE_RATE)
+    recorder.record_event(pygame.Event(pygame.KEYDOWN, key=pygame.K_a, mod=0, unicode="a", scancode=4))
+    recorder.record_event(pygame.Event(pygame.MOUSEBUTTONDOWN, pos=(10, 20), button=1, window=object()))
+    #Custom events follow from the input and are not recorded
+    recorder.record_event(pygame.Event(pygame.USEREVENT, value=1))
+    recorder.end_frame(0.25)
+    recorder.end_frame(0.5)
+    recorder.close()
+    assert recorder.frames == 2
+
+    replayer = InputReplayer(path)
+    assert replayer.update_rate == UPDATE_RATE
+    frames = list(replayer.get_frames())
+    assert [frame_time for frame_time, _, _ in frames] == [0.25, 0.5]
+    events = frames[0][2]
+    assert [event.type for event in events] == [pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN]
+    assert events[0].dict == {"key": pygame.K_a, "mod": 0, "unicode": "a", "scancode": 4}
+    #Attributes of unsupported types are left out
+    assert events[1].dict == {"pos": (10, 20), "button": 1}
+    assert frames[1][2] == []
+
+@pytest.mark.parametrize("data", [b"", b"BP", _HEADER.pack(b"XXXX", 1, 60)])
+def test_files_that_are_not_logs(tmp_path, data):
+    path = tmp_path / "log.bin"
+    path.write_bytes(data)
+    with pytest.raises(ValueError, match="not an input log"):
+        InputReplayer(str(path))
+
+def test_unsupported_version(tmp_path):
+    path = tmp_path / "log.bin"
+    path.write_bytes(_HEADER.pack(_MAGIC, 99, 60))
+    with pytest.raises(ValueError, match="version"):
+        InputReplayer(str(path))
+
+
+class KeyScene(Scene):
+    '''Moves by the keys pressed, the state depends on the input and the updates'''
+    def __init__(self) -> None:
+        self.keys = []
+        self.position = 0.0
+        self.speed = 0.0
+
+    def handle_event(self, event:pygame.Event):
+        if event.type == pygame.KEYDOWN:
+            self.keys.append(event.key)
+            self.speed += 1
+
+    def update(self, dt:float):
+        self.position += self.speed * dt
+
+    def draw(self, screen:pygame.Surface):
+        pass
+
+def create_loop(scene:KeyScene, **kwargs) -> GameLoop:
+    return GameLoop(SceneManager((320, 240), {"scene": scene}), update_rate=UPDATE_RATE, headless=True, **kwargs)
+
+def test_replay_reproduces_a_session(tmp_path):
+    path = str(tmp_path / "session.bin")
+    scene = KeyScene()
+    game_loop = create_loop(scene, recorder=InputRecorder(path))
+    for key in (pygame.K_a, pygame.K_b):
+        pygame.event.post(pygame.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0))
+    game_loop.run(max_updates=10)
+
+    replayed = KeyScene()
+    replayer = InputReplayer(path)
+    assert replayer.run(create_loop(replayed)) == 10
+    assert replayed.keys == scene.keys == [pygame.K_a, pygame.K_b]
+    assert replayed.position == scene.position
+
+def test_replay_checks_the_loop(tmp_path):
+    path = str(tmp_path / "session.bin")
+    recorder = InputRecorder(path, UPDATE_RATE)
+    recorder.end_frame(1 / UPDATE_RATE)
+    recorder.close()
+    replayer = InputReplayer(path)
+    with pytest.raises(ValueError):
+        replayer.run(GameLoop(SceneManager((320, 240), {"scene": KeyScene()}), update_rate=60, headless=True))
+    with pytest.raises(ValueError):
+        replayer.run(create_loop(KeyScene()), draw=True)
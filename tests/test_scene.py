@@ -0,0 +1,128 @@
+import pygame
+import pytest
+
+from better_pygame import FrameProfiler, Scene, SceneManager
+from better_pygame.transition import LinearFadeIn, LinearFadeOut
+
+SCREEN_SIZE = (320, 240)
+
+class ColorScene(Scene):
+    def __init__(self, color:tuple[int, int, int] = (0, 0, 0), transitions:bool = True) -> None:
+        self.color = color
+        self.unloaded = False
+        self.updates = 0
+        self.draws = 0
+        if transitions:
+            self.set_enter_transition(LinearFadeIn(1))
+            self.set_exit_transition(LinearFadeOut(1))
+
+    def handle_event(self, event:pygame.Event):
+        pass
+
+    def update(self, dt:float):
+        self.updates += 1
+
+    def draw(self, screen:pygame.Surface):
+        self.draws += 1
+        screen.fill(self.color)
+
+    def on_unload(self):
+        self.unloaded = True
+
+    def get_memory_usage(self) -> int:
+        return 100
+
+def test_memory_budget_keeps_scenes_of_running_transitions():
+    built = {}
+    def factory(key):
+        def build():
+            built[key] = ColorScene()
+            return built[key]
+        return build
+    scene_manager = SceneManager(SCREEN_SIZE, {key: factory(key) for key in "abc"}, "a", memory_budget=100)
+    scene_manager.change_scene("b")
+    scene_manager.change_scene("c")
+    #The exit transition of a is still running, it must not be unloaded under it
+    assert built["a"] in scene_manager.get_transitioning_scenes()
+    assert not built["a"].unloaded
+    assert scene_manager.is_loaded("a")
+    with pytest.raises(ValueError):
+        scene_manager.unload_scene("a")
+
+    for _ in range(70):
+        for event in pygame.event.get():
+            scene_manager.handle_event(event)
+        scene_manager.update(1 / 60)
+    for event in pygame.event.get():
+        scene_manager.handle_event(event)
+    assert not scene_manager.get_transitioning_scenes()
+    scene_manager.unload_scene("a")
+    assert built["a"].unloaded
+
+def run_frames(scene_manager:SceneManager, screen:pygame.Surface, frames:int):
+    for _ in range(frames):
+        for event in pygame.event.get():
+            scene_manager.handle_event(event)
+        scene_manager.update(1 / 60)
+        scene_manager.draw(screen)
+
+def test_profiler_times_scenes_and_transitions():
+    profiler = FrameProfiler()
+    scene_manager = SceneManager(SCREEN_SIZE, {"a": ColorScene((255, 0, 0)), "b": ColorScene((0, 255, 0))}, "a", profiler=profiler)
+    screen = pygame.Surface(SCREEN_SIZE)
+    scene_manager.change_scene("b")
+    run_frames(scene_manager, screen, 70)
+    scene_manager.handle_event(pygame.Event(pygame.KEYDOWN, key=pygame.K_a))
+    assert set(profiler.get_stats()) >= {
+        "transition:LinearFadeIn.update", "transition:LinearFadeIn.draw",
+        "transition:LinearFadeOut.update", "transition:LinearFadeOut.draw",
+        "scene:b.update", "scene:b.draw", "scene:b.handle_event"
+    }
+
+    #A disabled profiler records nothing, the scenes still run
+    profiler.enabled = False
+    stats = profiler.get_stats()
+    draws = scene_manager.curr_scene.draws
+    run_frames(scene_manager, screen, 5)
+    assert scene_manager.curr_scene.draws == draws + 5
+    assert profiler.get_stats() == stats
+
+def test_scenes_below_are_drawn_while_an_opaque_scene_enters():
+    below = ColorScene((255, 0, 0), transitions=False)
+    pushed = ColorScene((0, 255, 0))
+    scene_manager = SceneManager(SCREEN_SIZE, {"below": below, "pushed": pushed}, "below")
+    screen = pygame.Surface(SCREEN_SIZE)
+    scene_manager.push_scene("pushed")
+    run_frames(scene_manager, screen, 1)
+    #The pushed scene fades in over the scene below
+    red, green, blue, _ = screen.get_at((10, 10))
+    assert red > 200 and 0 < green < 50 and blue == 0
+
+    run_frames(scene_manager, screen, 30)
+    red, green, blue, _ = screen.get_at((10, 10))
+    assert 50 < red < 200 and 50 < green < 200 and blue == 0
+
+    #Once the transition has ended the scene below is occluded and not drawn anymore
+    run_frames(scene_manager, screen, 40)
+    assert not scene_manager.get_transitioning_scenes()
+    draws = below.draws
+    run_frames(scene_manager, screen, 5)
+    assert below.draws == draws
+    assert screen.get_at((10, 10)) == (0, 255, 0)
+
+@pytest.mark.parametrize("profiler", [None, FrameProfiler()])
+def test_disabled_profiler_does_not_resolve_names(monkeypatch, profiler):
+    if profiler is not None:
+        profiler.enabled = False
+    def fail(*args):
+        raise AssertionError("profiler names resolved without an enabled profiler")
+    monkeypatch.setattr(SceneManager, "_get_scene_key", fail)
+    monkeypatch.setattr(SceneManager, "_get_transition_name", fail)
+    scenes = {"a": ColorScene((255, 0, 0)), "b": ColorScene((0, 255, 0))}
+    for scene in scenes.values():
+        scene.set_transition_require_update(True)
+    scene_manager = SceneManager(SCREEN_SIZE, scenes, "a", profiler=profiler)
+    scene_manager.change_scene("b")
+    run_frames(scene_manager, pygame.Surface(SCREEN_SIZE), 70)
+    assert scenes["b"].updates == 70
+    assert profiler is None or not profiler.get_stats()
@@ -0,0 +1,98 @@
+import pygame
+
+from better_pygame import SurfacePool, SurfaceCache
+
+def test_pool_reuses_given_back_surfaces():
+    pool = SurfacePool()
+    surface = pool.borrow((10.7, 20.2))
+    assert surface.get_size() == (10, 20) and surface.get_flags() & pygame.SRCALPHA
+    pool.give_back(surface)
+    assert pool.borrow((10, 20)) is surface
+    #Other sizes and flags are separate keys
+    assert pool.borrow((10, 20)) is not surface
+    opaque = pool.borrow((10, 20), 0)
+    assert not opaque.get_flags() & pygame.SRCALPHA
+    assert pool.get_stats() == {"allocations": 3, "borrows": 4, "free": 0}
+
+def test_pool_keeps_at_most_max_free_per_key():
+    pool = SurfacePool(max_free_per_key=2)
+    surfaces = [pool.borrow((4, 4)) for _ in range(3)]
+    for surface in surfaces:
+        pool.give_back(surface)
+    assert pool.get_stats()["free"] == 2
+    pool.clear()
+    assert pool.get_stats()["free"] == 0
+
+def test_borrow_area_cuts_out_of_the_container():
+    pool = SurfacePool()
+    area = pool.borrow_area((30.5, 20), (100, 80))
+    assert area.get_size() == (30, 20)
+    container = area.get_parent()
+    assert container.get_size() == (100, 80)
+    #Giving back the area returns its container to the pool
+    pool.give_back(area)
+    assert pool.borrow((100, 80)) is container
+    pool.give_back(container)
+    assert pool.borrow_area((100, 80), (100, 80)) is container
+    #Areas bigger than the container are separate Surfaces
+    assert pool.borrow_area((120, 10), (100, 80)).get_size() == (120, 10)
+    assert pool.get_stats()["allocations"] == 2
+
+def create_surface(width:int) -> pygame.Surface:
+    '''Surface of width * 4 bytes'''
+    return pygame.Surface((width, 1), pygame.SRCALPHA)
+
+def test_cache_evicts_least_recently_used():
+    cache = SurfaceCache(100)
+    for key in "abc":
+        assert cache.put(key, create_surface(8))
+    assert cache.bytes == 96
+    cache.get("a")
+    assert cache.put("d", create_surface(8))
+    assert "b" not in cache and {"a", "c", "d"} <= set(cache._entries)
+    assert cache.bytes == 96
+    assert cache.get("b") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_cache_replaces_entries():
+    cache = SurfaceCache(100)
+    cache.put("a", create_surface(10))
+    cache.put("b", create_surface(10))
+    replacement = create_surface(15)
+    assert cache.put("a", replacement)
+    assert cache.get("a") is replacement and cache.bytes == 100 and len(cache) == 2
+
+def test_cache_without_evict_only_puts_what_fits():
+    cache = SurfaceCache(100)
+    original = create_surface(20)
+    cache.put("a", original)
+    assert not cache.put("b", create_surface(10), evict=False)
+    assert not cache.put("a", create_surface(30), evict=False)
+    #The existing Surface is kept
+    assert cache.get("a") is original and cache.bytes == 80
+    assert cache.put("a", create_surface(25), evict=False)
+    assert cache.bytes == 100
+
+def test_pinned_surfaces_are_not_evicted():
+    cache = SurfaceCache(100)
+    cache.pin("a")
+    cache.put("a", create_surface(15))
+    cache.put("b", create_surface(10))
+    assert cache.put("c", create_surface(10))
+    assert "a" in cache and "b" not in cache
+    #Does not fit next to the pinned Surface, nothing is evicted
+    assert not cache.put("d", create_surface(15))
+    assert "c" in cache
+    cache.unpin("a")
+    assert cache.put("d", create_surface(15))
+    assert "a" not in cache and not cache.is_pinned("a")
+
+def test_cache_clear_and_remove():
+    cache = SurfaceCache(100)
+    cache.put("a", create_surface(5))
+    cache.put("b", create_surface(5))
+    cache.remove("a")
+    cache.remove("missing")
+    assert cache.bytes == 20 and len(cache) == 1
+    cache.clear()
+    assert cache.bytes == 0 and len(cache) == 0
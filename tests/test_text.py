@@ -0,0 +1,59 @@
+import pygame
+import pytest
+
+from better_pygame import AssetCache, FontRegistry, GlyphAtlas, TextCache
+
+FONT_PATH = "fonts/Helvetica-Font/Helvetica.ttf"
+
+@pytest.fixture
+def font():
+    return pygame.font.Font(FONT_PATH, 24)
+
+def test_registry_shares_fonts():
+    registry = FontRegistry(AssetCache())
+    registry.register("regular", FONT_PATH)
+    font = registry.get("regular", 20)
+    assert registry.get("regular", 20) is font
+    assert registry.get("regular", 30) is not font
+    assert registry.get_manifest([("regular", 20)]) == {"images": [], "fonts": [(FONT_PATH, 20)]}
+    with pytest.raises(KeyError):
+        registry.get("bold", 20)
+
+def test_text_cache_renders_once_per_text_and_style(font):
+    cache = TextCache()
+    surface = cache.render(font, "Score", True, (255, 255, 255))
+    assert cache.render(font, "Score", True, "white") is surface
+    assert cache.render(font, "Score", True, (255, 0, 0)) is not surface
+    assert cache.render(font, "Score", True, (255, 255, 255), (0, 0, 0)) is not surface
+    assert cache.render(font, "Score", False, (255, 255, 255)) is not surface
+    expected = font.render("Score", True, (255, 255, 255))
+    assert pygame.image.tobytes(surface, "RGBA") == pygame.image.tobytes(expected, "RGBA")
+    cache.clear()
+    assert cache.render(font, "Score", True, (255, 255, 255)) is not surface
+
+def test_atlas_adds_missing_characters(font):
+    atlas = GlyphAtlas(font, (255, 255, 255), characters="0123")
+    assert set(atlas.glyphs) == set("0123")
+    width = atlas.atlas.get_width()
+    atlas.add_characters("0123")
+    assert atlas.atlas.get_width() == width
+    atlas.get_size("x4")
+    assert set(atlas.glyphs) == set("01234x")
+    assert atlas.atlas.get_width() == width + font.size("x")[0] + font.size("4")[0]
+
+def test_atlas_size_is_the_sum_of_advances(font):
+    atlas = GlyphAtlas(font, (255, 255, 255))
+    assert atlas.get_size("12:30") == (sum(font.size(character)[0] for character in "12:30"), font.get_height())
+
+def test_atlas_draws_the_characters(font):
+    atlas = GlyphAtlas(font, (255, 255, 255), antialias=False)
+    surface = pygame.Surface((200, 50))
+    rect = atlas.draw(surface, "1-1", (10, 5))
+    assert rect == pygame.Rect((10, 5), atlas.get_size("1-1"))
+    #Every character is drawn at its advance, like rendering the characters one by one
+    expected = pygame.Surface((200, 50))
+    x = 10
+    for character in "1-1":
+        expected.blit(font.render(character, False, (255, 255, 255)), (x, 5))
+        x += font.size(character)[0]
+    assert pygame.image.tobytes(surface, "RGB") == pygame.image.tobytes(expected, "RGB")
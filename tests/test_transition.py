@@ -0,0 +1,83 @@
+import pygame
+import pytest
+
+from better_pygame import Transition
+from better_pygame._constants import ON_SECTION_START, ON_SECTION_END, ON_TRANSITION_END
+from better_pygame.section import Section
+
+SCENE_SIZE = (320, 240)
+
+class StaticScene:
+    def draw(self, screen:pygame.Surface):
+        screen.fill((40, 80, 120))
+
+def create_transition() -> Transition:
+    return Transition([
+        Section(0.5, start_position=(320, 0), end_position=(0, 0), start_transparency=0, end_transparency=255),
+        Section(0.25, end_angle=90),
+        Section(0.75, end_size=(0, 0), end_position=(160, 120), end_angle=360)
+    ])
+
+def get_state(transition:Transition) -> tuple:
+    return (
+        transition.curr_section_index,
+        *transition._curr_position,
+        *transition._curr_size,
+        transition._curr_angle,
+        transition._curr_transparency
+    )
+
+@pytest.mark.parametrize("time", [0, 0.1, 0.5, 0.6, 0.75, 1.2, 1.5])
+def test_seek_matches_stepping(time):
+    stepped = create_transition()
+    stepped.start(StaticScene(), SCENE_SIZE)
+    steps = round(time / 0.05)
+    for _ in range(steps):
+        stepped.update(0.05)
+
+    sought = create_transition()
+    sought.start(StaticScene(), SCENE_SIZE)
+    sought.seek(stepped.elapsed)
+
+    assert get_state(sought) == pytest.approx(get_state(stepped))
+
+def test_seek_is_clamped_and_ends_on_update():
+    transition = create_transition()
+    transition.start(StaticScene(), SCENE_SIZE)
+    transition.seek(10)
+    assert transition.elapsed == transition.duration
+    assert tuple(transition._curr_size) == (0, 0)
+    assert tuple(transition._curr_position) == (160, 120)
+    transition.update(0)
+    assert not transition._running
+    assert any(event.type == ON_TRANSITION_END for event in pygame.event.get())
+
+def test_large_step_triggers_every_section_event_in_order():
+    transition = create_transition()
+    transition.start(StaticScene(), SCENE_SIZE)
+    pygame.event.clear()
+    transition.update(0.8)
+    sections = [keyframe.section for keyframe in transition.keyframes]
+    events = [(event.type, event.element) for event in pygame.event.get() if event.type in (ON_SECTION_START, ON_SECTION_END)]
+    assert events == [
+        (ON_SECTION_END, sections[0]), (ON_SECTION_START, sections[1]),
+        (ON_SECTION_END, sections[1]), (ON_SECTION_START, sections[2])
+    ]
+
+def test_terminate_resets_current_values():
+    transition = create_transition()
+    transition.start(StaticScene(), SCENE_SIZE)
+    transition.seek(1.4)
+    assert tuple(transition._curr_size) != SCENE_SIZE
+    transition.terminate()
+    assert not transition._running
+    assert tuple(transition._curr_position) == (0, 0)
+    assert tuple(transition._curr_size) == SCENE_SIZE
+    assert transition._curr_angle == 0
+    assert transition._curr_transparency == 255
+
+    transition.start(StaticScene(), SCENE_SIZE)
+    restarted_state = get_state(transition)
+    fresh = create_transition()
+    fresh.start(StaticScene(), SCENE_SIZE)
+    assert restarted_state == get_state(fresh)
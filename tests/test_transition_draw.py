@@ -0,0 +1,82 @@
+import pygame
+import pytest
+
+from better_pygame import SurfacePool
+from better_pygame import transition as transitions
+from better_pygame.utils import tup_divide, tup_multiply, tup_round, tup_subtract, transparent_surface
+
+SCENE_SIZE = (320, 240)
+TIMES = [0.1, 0.37, 0.5, 0.81, 0.95]
+
+class PatternScene:
+    '''Checkered scene, shifting it by a pixel changes many pixels'''
+    def __init__(self, require_update:bool = False) -> None:
+        self._transition_require_update = require_update
+
+    def draw(self, screen:pygame.Surface):
+        for x in range(0, SCENE_SIZE[0], 8):
+            for y in range(0, SCENE_SIZE[1], 8):
+                pygame.draw.rect(screen, ((x * 7) % 256, (y * 5) % 256, ((x + y) * 3) % 256), (x, y, 8, 8))
+        pygame.draw.line(screen, (255, 255, 255), (0, 0), (SCENE_SIZE[0] - 1, SCENE_SIZE[1] - 1), 3)
+
+DIRECTIONS = ("up", "down", "left", "right")
+FAST_PATH_TRANSITIONS = {
+    **{f"slide_enter_{direction}": lambda direction=direction: transitions.LinearSlideEnter(1, direction, SCENE_SIZE) for direction in DIRECTIONS},
+    **{f"slide_exit_{direction}": lambda direction=direction: transitions.LinearSlideExit(1, direction, SCENE_SIZE) for direction in DIRECTIONS},
+    "fade_in": lambda: transitions.LinearFadeIn(1),
+    "fade_out": lambda: transitions.LinearFadeOut(1)
+}
+TRANSFORM_TRANSITIONS = {
+    **{f"spin_enter_{direction}": lambda direction=direction: transitions.SpinEnter(1, direction, SCENE_SIZE) for direction in DIRECTIONS},
+    **{f"spin_exit_{direction}": lambda direction=direction: transitions.SpinExit(1, direction, SCENE_SIZE) for direction in DIRECTIONS},
+    "spin_shrink_exit": lambda: transitions.SpinShrinkExit(1, SCENE_SIZE)
+}
+
+def start(name:str, time:float, require_update:bool = False) -> transitions.Transition:
+    factories = FAST_PATH_TRANSITIONS | TRANSFORM_TRANSITIONS
+    transition = factories[name]()
+    transition.start(PatternScene(require_update), SCENE_SIZE, SurfacePool())
+    transition.seek(time)
+    return transition
+
+def render(draw) -> bytes:
+    screen = pygame.Surface(SCENE_SIZE)
+    screen.fill((0, 0, 40))
+    draw(screen)
+    return pygame.image.tobytes(screen, "RGB")
+
+def reference_draw(transition:transitions.Transition, screen:pygame.Surface):
+    '''The scale, rotate and shift pipeline Transition.draw() used before the fast paths and Vec2'''
+    size = tuple(transition._curr_size)
+    surf = transparent_surface(transition.scene_size)
+    transition.scene.draw(surf)
+    surf = pygame.transform.scale(surf, size)
+    surf = pygame.transform.rotate(surf, transition._curr_angle % 360)
+    rotation_origin = transition.keyframes[transition.curr_section_index].rotation_origin
+    if rotation_origin is None:
+        rotation_origin = tup_divide(size, (2, 2))
+    origin_to_size_ratio = tup_divide(rotation_origin, transition.scene_size)
+    rotated_size = surf.get_size()
+    if rotated_size != size:
+        position_shift = tup_round(tup_multiply(tup_subtract(rotated_size, size), origin_to_size_ratio))
+    else:
+        position_shift = (0, 0)
+    surf.set_alpha(int(transition._curr_transparency))
+    screen.blit(surf, tup_subtract(tuple(transition._curr_position), position_shift))
+
+@pytest.mark.parametrize("require_update", [False, True])
+@pytest.mark.parametrize("time", TIMES)
+@pytest.mark.parametrize("name", FAST_PATH_TRANSITIONS)
+def test_fast_paths_match_transform_pipeline(name, time, require_update):
+    transition = start(name, time, require_update)
+    assert transition._draw_path in ("offset", "fade")
+    fast = render(transition.draw)
+    assert fast == render(transition._draw_transformed)
+    assert fast == render(lambda screen: reference_draw(transition, screen))
+
+@pytest.mark.parametrize("time", TIMES)
+@pytest.mark.parametrize("name", TRANSFORM_TRANSITIONS)
+def test_transform_path_matches_reference_pipeline(name, time):
+    transition = start(name, time)
+    assert transition._draw_path == "transform"
+    assert render(transition.draw) == render(lambda screen: reference_draw(transition, screen))
@@ -0,0 +1,77 @@
+import pygame
+import pygame_gui
+import pytest
+
+from better_pygame import CachedUILayer
+
+SIZE = (320, 240)
+
+@pytest.fixture
+def ui():
+    ui_manager = pygame_gui.UIManager(SIZE)
+    button = pygame_gui.elements.UIButton(pygame.Rect(10, 10, 100, 40), "Start", ui_manager)
+    layer = CachedUILayer(ui_manager, SIZE, background_color=(0, 0, 80))
+    draws = []
+    draw_ui = ui_manager.draw_ui
+    def counting_draw_ui(surface):
+        draws.append(surface)
+        draw_ui(surface)
+    ui_manager.draw_ui = counting_draw_ui
+    return layer, button, draws
+
+def settle(layer:CachedUILayer, screen:pygame.Surface):
+    '''Update and draw until the layer has nothing left to redraw'''
+    for _ in range(3):
+        layer.update(1 / 60)
+        layer.draw(screen)
+
+def test_unchanged_ui_is_drawn_from_the_cache(ui):
+    layer, button, draws = ui
+    screen = pygame.Surface(SIZE)
+    settle(layer, screen)
+    count = len(draws)
+    for _ in range(10):
+        assert not layer.update(1 / 60)
+        layer.draw(screen)
+    assert len(draws) == count
+    assert screen.get_at((300, 200)) == (0, 0, 80)
+    assert screen.get_at((60, 30)) != (0, 0, 80)
+
+@pytest.mark.parametrize("change", [
+    lambda button: button.set_text("Stop"),
+    lambda button: button.set_position((50, 50)),
+    lambda button: button.hide()
+])
+def test_element_changes_redraw_the_layer(ui, change):
+    layer, button, draws = ui
+    screen = pygame.Surface(SIZE)
+    settle(layer, screen)
+    count = len(draws)
+    change(button)
+    assert layer.update(1 / 60)
+    layer.draw(screen)
+    assert len(draws) == count + 1
+    assert not layer.dirty
+
+def test_consumed_events_and_invalidate_redraw_the_layer(ui):
+    layer, button, draws = ui
+    screen = pygame.Surface(SIZE)
+    settle(layer, screen)
+    assert not layer.process_events(pygame.Event(pygame.MOUSEBUTTONDOWN, pos=(300, 200), button=1))
+    assert not layer.dirty
+    assert layer.process_events(pygame.Event(pygame.MOUSEBUTTONDOWN, pos=(60, 30), button=1))
+    assert layer.dirty
+    settle(layer, screen)
+    layer.invalidate()
+    count = len(draws)
+    layer.draw(screen)
+    assert len(draws) == count + 1
+
+def test_background_is_drawn_below_the_ui(ui):
+    layer, button, draws = ui
+    background = pygame.Surface(SIZE)
+    background.fill((0, 120, 0))
+    layer.set_background(background)
+    screen = pygame.Surface(SIZE)
+    settle(layer, screen)
+    assert screen.get_at((300, 200)) == (0, 120, 0)